@@ -1,4 +1,18 @@
-from .algebra_solver import solve as solve_algebra
-from .calculus_solver import solve_calculus
+# Solvers are imported on first access so that importing the package (e.g. for
+# geometry or statistics) does not pull in SymPy.
+import importlib
+
+_EXPORTS = {
+    'solve_algebra': '.algebra_solver',
+    'solve_calculus': '.calculus_solver',
+}
 
 __all__ = ['solve_algebra', 'solve_calculus']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,23 @@
-from sympy import symbols, Eq, solve, simplify, sympify
-from sympy.parsing.sympy_parser import parse_expr
-import re
+from sympy import symbols, simplify, expand, factor
+
+from .equation_solver import solve_equations, split_equations
+from .expression_parser import parse_expression
+
+# operation → (SymPy function, answer label, rule description)
+REWRITES = {
+    "simplify": (simplify, "Simplified", "simplification"),
+    "expand": (expand, "Expanded", "expansion"),
+    "factor": (factor, "Factored", "factoring"),
+}
+
 
 def solve_algebra(expr_str, step_by_step=False, solve_for=None):
     """
-    Solves an algebraic equation, supports multiple variables.
+    Solves an algebraic equation or a system, supports multiple variables.
 
     Args:
-        expr_str (str): A string like '2*x + y = 5'
+        expr_str (str): A string like '2*x + y = 5', or several equations
+            separated by newlines, ';' or commas ('x + y = 3, x - y = 1')
         step_by_step (bool): If True, return explanation steps
         solve_for (str or None): variable name to solve for, e.g. 'x' or 'y'
 
@@ -18,29 +28,25 @@ def solve_algebra(expr_str, step_by_step=False, solve_for=None):
         if '=' not in expr_str:
             return "Equation must include '='"
 
-        left, right = expr_str.split('=')
-        left_expr = parse_expr(left.strip())
-        right_expr = parse_expr(right.strip())
-        equation = Eq(left_expr, right_expr)
+        sides = split_equations(expr_str)
 
-        # Get all symbols (variables) in the equation
-        variables = list(equation.free_symbols)
+        # Get all symbols (variables) in the equations
+        variables = sorted(set().union(*((left - right).free_symbols for left, right in sides)), key=str)
         if not variables:
             return "No variables found to solve for."
 
         if solve_for:
-            solve_var = symbols(solve_for)
+            solve_var = [symbols(solve_for)]
         else:
             solve_var = variables
 
-        solutions = solve(equation, solve_var)
+        solutions, _ = solve_equations(sides, solve_var)
 
         if step_by_step:
             steps = []
-            steps.append(f"Step 1: Original equation: {left_expr} = {right_expr}")
-            simplified_left = simplify(left_expr)
-            simplified_right = simplify(right_expr)
-            steps.append(f"Step 2: Simplify both sides: {simplified_left} = {simplified_right}")
+            steps.append(f"Step 1: Original equation: {', '.join(f'{l} = {r}' for l, r in sides)}")
+            simplified = ", ".join(f"{simplify(l)} = {simplify(r)}" for l, r in sides)
+            steps.append(f"Step 2: Simplify both sides: {simplified}")
             steps.append(f"Step 3: Solving for variable(s): {solve_var}")
             steps.append(f"Solution: {solutions}")
             return steps
@@ -49,3 +55,73 @@ def solve_algebra(expr_str, step_by_step=False, solve_for=None):
 
     except Exception as e:
         return f"Error solving equation: {str(e)}"
+
+
+def _sides(expression):
+    """(left, right) SymPy expressions; an expression without '=' is set equal to 0."""
+    if expression.count("=") > 1:
+        raise ValueError("expected at most one '='")
+    left, _, right = expression.partition("=")
+    return parse_expression(left), parse_expression(right) if right.strip() else 0
+
+
+# how each equation_solver path is described in step-by-step answers
+METHODS = {
+    "polynomial": "polynomial roots",
+    "rational": "clear the denominators, then polynomial roots",
+    "linear_system": "linear system in matrix form",
+    "general": "general symbolic solver",
+}
+
+
+def solve_equation(problem):
+    """
+    Handler for ("algebra", "solve"): solve the equation or system in
+    problem.expression ("2*x + 5 = 13", "x + y = 3, x - y = 1"; "x**2 - 4"
+    means "x**2 - 4 = 0").
+    """
+    try:
+        sides = split_equations(problem.expression)
+        variables = sorted(set().union(*((left - right).free_symbols for left, right in sides)), key=str)
+        if not variables:
+            return "No variables found to solve for."
+        solutions, path = solve_equations(sides, variables)
+
+        if not problem.step_by_step:
+            return f"Solution: {solutions}"
+        original = ", ".join(f"{left} = {right}" for left, right in sides)
+        simplified = ", ".join(f"{simplify(left)} = {simplify(right)}" for left, right in sides)
+        return "\n".join([
+            f"Step 1: Original equation: {original}",
+            f"Step 2: Simplify both sides: {simplified}",
+            f"Step 3: Solving for variable(s): {variables[0] if len(variables) == 1 else variables}"
+            f" ({METHODS[path]})",
+            f"Solution: {solutions}",
+        ])
+
+    except Exception as e:
+        return f"Error solving equation: {str(e)}"
+
+
+def rewrite_expression(problem):
+    """Handler for ("algebra", "simplify" / "expand" / "factor")."""
+    rewrite, label, rule = REWRITES[problem.operation]
+    try:
+        if "=" in problem.expression:
+            left_expr, right_expr = _sides(problem.expression)
+            original = f"{left_expr} = {right_expr}"
+            result = f"{rewrite(left_expr)} = {rewrite(right_expr)}"
+        else:
+            original = problem.expr
+            result = rewrite(original)
+
+        if not problem.step_by_step:
+            return f"{label}: {result}"
+        return "\n".join([
+            f"Original expression: {original}",
+            f"Applying {rule} rules...",
+            f"Result: {result}",
+        ])
+
+    except Exception as e:
+        return f"Error while solving: {e}"
@@ -1,80 +1,218 @@
-from sympy import symbols, diff, integrate, sympify, Function
+import re
+
+from sympy import S, symbols, integrate, Function
 from sympy.core.mul import Mul
 from sympy.core.add import Add
 from sympy.core.power import Pow
 
-x = symbols('x')
-
+from .derivatives import (
+    SERIES_ORDER, derivative, derivatives, partial_derivative, taylor_coefficients, taylor_series,
+)
+from .expression_parser import parse_expression
+from .problem import Problem
 
-def solve_calculus(expression_str, step_by_step=False):
-    steps = []
+x = symbols('x')
 
+# Operation words are matched on the raw text; only the math after them is parsed.
+_OPERATION_WORDS = re.compile(r"\b(?:differentiate|derivative|integrate|antiderivative)\b(?:\s+of\b)?", re.IGNORECASE)
+
+
+def _calculus_operation(expression_str):
+    if "differentiate" in expression_str or "derivative" in expression_str:
+        return "differentiate"
+    if "integrate" in expression_str or "antiderivative" in expression_str:
+        return "integrate"
+    return None
+
+
+def _problem(expression_str, step_by_step=False) -> Problem:
+    """Problem for free text such as "differentiate x**2 + 3*x"."""
+    return Problem("calculus", _calculus_operation(expression_str),
+                   _OPERATION_WORDS.sub(" ", expression_str).strip(), step_by_step)
+
+
+def iter_calculus_steps(expression_str, integrator=integrate):
+    """iter_problem_steps for free text that still names its operation ("integrate x**2")."""
+    return iter_problem_steps(_problem(expression_str), integrator)
+
+
+def iter_problem_steps(problem, integrator=integrate):
+    """
+    Yield the step-by-step explanation one line at a time, as each part is
+    computed. Per-term and per-factor results are reused to build the final
+    answer, so nothing is differentiated or integrated twice.
+
+    Parameters:
+        problem (Problem): operation "differentiate" or "integrate", expression e.g. "x**2 + 3*x".
+        integrator (callable): (expr, x) -> antiderivative; lets the caller
+            run integration under a time budget.
+
+    Raises whatever parsing or SymPy raises; the handlers turn that into a message.
+    """
+    operation = problem.operation
+    if operation not in ("differentiate", "integrate"):
+        yield "Unrecognized calculus operation."
+        return
+    expr, x = problem.expr, problem.variable
+
+    if operation == "differentiate":
+        yield f"Expression: {expr}"
+        yield "Applying differentiation rules..."
+        result = None
+
+        if isinstance(expr, Pow):
+            base, exponent = expr.args
+            if base == x:
+                yield "Detected a power function."
+                yield f"Using Power Rule: d/dx[x^{exponent}] = {exponent}*x^{exponent - 1}"
+
+        elif expr.is_Number:
+            yield "This is a constant. Derivative of a constant is 0."
+
+        elif expr.has(Function):
+            yield "Composite function detected. Apply Chain Rule if needed."
+
+        elif isinstance(expr, Mul):
+            u, v = expr.args[0], Mul(*expr.args[1:])
+            yield "Product Rule: d/dx[u*v] = u'*v + u*v'"
+            du = derivative(u, x)
+            yield f"u = {u}, u' = {du}"
+            dv = derivative(v, x)
+            yield f"v = {v}, v' = {dv}"
+            yield f"Result: {du}*{v} + {u}*{dv}"
+            result = du * v + u * dv
+
+        elif isinstance(expr, Add):
+            yield "Sum Rule: d/dx[f + g] = f' + g'"
+            dterms = []
+            for i, term in enumerate(expr.args):
+                dterms.append(derivative(term, x))
+                yield f"Term {i+1}: d/dx({term}) = {dterms[-1]}"
+            result = Add(*dterms)
+
+        else:
+            yield "General differentiation applied."
+
+        if result is None:
+            result = derivative(expr, x)
+        yield f"Final Derivative: {result}"
+        return
+
+    yield f"Expression: {expr}"
+    yield "Applying integration rules..."
+    integral = None
+
+    if isinstance(expr, Pow) and expr.args[0] == x:
+        yield "Power Rule for Integration: ∫x^n dx = x^(n+1)/(n+1) + C"
+
+    elif expr.is_Number:
+        yield "Constant Rule: ∫c dx = c*x + C"
+
+    elif isinstance(expr, Add):
+        yield "Sum Rule: ∫(f + g) dx = ∫f dx + ∫g dx"
+        iterms = []
+        for i, term in enumerate(expr.args):
+            iterms.append(integrator(term, x))
+            yield f"Term {i+1}: ∫({term}) dx = {iterms[-1]}"
+        integral = Add(*iterms)
+
+    if integral is None:
+        integral = integrator(expr, x)
+    yield f"Final Integral: {integral} + C"
+
+
+def solve_derivative(problem):
     try:
-        expr = sympify(expression_str)
-
-        if "differentiate" in expression_str or "derivative" in expression_str:
-            derivative = diff(expr, x)
-
-            if not step_by_step:
-                return f"Derivative: {derivative}"
-
-            steps.append(f"Expression: {expr}")
-            steps.append("Applying differentiation rules...")
-
-            if isinstance(expr, Pow):
-                base, exponent = expr.args
-                if base == x:
-                    steps.append("Detected a power function.")
-                    steps.append(f"Using Power Rule: d/dx[x^{exponent}] = {exponent}*x^{exponent - 1}")
+        if problem.step_by_step:
+            return "\n".join(iter_problem_steps(problem))
+        return f"Derivative: {derivative(problem.expr, problem.variable)}"
+    except Exception as e:
+        return f"Error during calculus solving: {e}"
 
-            elif expr.is_Number:
-                steps.append("This is a constant. Derivative of a constant is 0.")
 
-            elif expr.has(Function):
-                steps.append("Composite function detected. Apply Chain Rule if needed.")
+def solve_integral(problem):
+    try:
+        if problem.step_by_step:
+            return "\n".join(iter_problem_steps(problem))
+        return f"Integral: {integrate(problem.expr, problem.variable)} + C"
+    except Exception as e:
+        return f"Error during calculus solving: {e}"
 
-            elif isinstance(expr, Mul):
-                u, v = expr.args
-                du = diff(u, x)
-                dv = diff(v, x)
-                steps.append(f"Product Rule: d/dx[u*v] = u'*v + u*v'")
-                steps.append(f"u = {u}, u' = {du}")
-                steps.append(f"v = {v}, v' = {dv}")
-                steps.append(f"Result: {du}*{v} + {u}*{dv}")
 
-            elif isinstance(expr, Add):
-                terms = expr.args
-                steps.append("Sum Rule: d/dx[f + g] = f' + g'")
-                for i, term in enumerate(terms):
-                    dterm = diff(term, x)
-                    steps.append(f"Term {i+1}: d/dx({term}) = {dterm}")
+def _prime(order: int) -> str:
+    return "'" * order if order <= 3 else f"^({order})"
 
-            else:
-                steps.append("General differentiation applied.")
 
-            steps.append(f"Final Derivative: {derivative}")
-            return "\n".join(steps)
+def solve_nth_derivative(problem):
+    """Handler for "second derivative of ...", "differentiate ... 4 times"."""
+    try:
+        expr, x, order = problem.expr, problem.variable, problem.order or 1
+        chain = derivatives(expr, x, order)
+    except Exception as e:
+        return f"Error during calculus solving: {e}"
+    if not problem.step_by_step:
+        return f"Derivative (order {order}): {chain[-1]}"
+    lines = [f"Expression: f({x}) = {expr}",
+             "Each derivative is taken from the one before it."]
+    lines += [f"f{_prime(k)}({x}) = {d}" for k, d in enumerate(chain[1:], start=1)]
+    lines.append(f"Final Derivative (order {order}): {chain[-1]}")
+    return "\n".join(lines)
 
-        elif "integrate" in expression_str or "antiderivative" in expression_str:
-            integral = integrate(expr, x)
 
-            if not step_by_step:
-                return f"Integral: {integral} + C"
+def solve_partial_derivative(problem):
+    """Handler for "partial derivative of x**2*y with respect to y" and mixed partials."""
+    try:
+        expr = problem.expr
+        variables = [symbols(v) for v in (problem.wrt or (str(problem.variable),))]
+        if problem.order and len(variables) == 1:
+            variables *= problem.order
+        steps, current = [], expr
+        for var in variables:
+            current = partial_derivative(current, [var])
+            steps.append((var, current))
+    except Exception as e:
+        return f"Error during calculus solving: {e}"
+    label = ", ".join(str(v) for v in variables)
+    if not problem.step_by_step:
+        return f"Partial derivative with respect to {label}: {current}"
+    lines = [f"Expression: {expr}",
+             "Differentiate with respect to one variable at a time, holding the others constant."]
+    lines += [f"∂/∂{var}: {value}" for var, value in steps]
+    lines.append(f"Final Partial Derivative with respect to {label}: {current}")
+    return "\n".join(lines)
+
+
+def solve_series(problem):
+    """Handler for Taylor/Maclaurin series; problem.point defaults to 0."""
+    try:
+        expr, x = problem.expr, problem.variable
+        point = parse_expression(problem.point) if problem.point else S.Zero
+        order = SERIES_ORDER if problem.order is None else problem.order
+        series = taylor_series(expr, x, point, order)
+    except Exception as e:
+        return f"Error during calculus solving: {e}"
+    answer = f"Taylor series of {expr} about {x} = {point}: {series}"
+    if not problem.step_by_step:
+        return answer
+    lines = [f"Expression: f({x}) = {expr}",
+             f"Taylor series: Σ f^(k)({point})/k! * ({x} - {point})^k for k = 0..{order}"]
+    coefficients = taylor_coefficients(expr, x, point, order) if point.is_finite else None
+    if coefficients is None:
+        lines.append(f"The derivatives are undefined at {x} = {point}; expanded with SymPy's series().")
+    else:
+        lines += [f"k = {k}: coefficient {c}" for k, c in enumerate(coefficients)]
+    lines.append(answer)
+    return "\n".join(lines)
 
-            steps.append(f"Expression: {expr}")
-            steps.append("Applying integration rules...")
 
-            if isinstance(expr, Pow) and expr.args[0] == x:
-                n = expr.args[1]
-                steps.append("Power Rule for Integration: ∫x^n dx = x^(n+1)/(n+1) + C")
+def unknown_operation(problem):
+    return "Unrecognized calculus operation."
 
-            elif expr.is_Number:
-                steps.append(f"Constant Rule: ∫c dx = c*x + C")
 
-            steps.append(f"Final Integral: {integral} + C")
-            return "\n".join(steps)
+_HANDLERS = {"differentiate": solve_derivative, "integrate": solve_integral}
 
-        return "Unrecognized calculus operation."
 
-    except Exception as e:
-        return f"Error during calculus solving: {e}"
+def solve_calculus(expression_str, step_by_step=False):
+    """Solve free text that names its operation, e.g. "differentiate x**2 + 3*x"."""
+    problem = _problem(expression_str, step_by_step)
+    return _HANDLERS.get(problem.operation, unknown_operation)(problem)
@@ -0,0 +1,161 @@
+"""
+combinatorics.py
+----------------
+Exact big-integer combinatorics: nCr, nPr and n!.
+
+Each query picks the cheapest exact method:
+  * small n: memoized Pascal rows, so repeated small queries are table lookups
+  * small k: multiplicative nCr with GCD reduction, so every step divides
+    small numbers instead of dividing a growing big integer
+  * everything else: prime factorisation (Legendre's formula), then a balanced
+    product tree of prime powers
+
+These run inline in the request thread, so sizes are capped up front (a
+ValueError explains which limit was hit): answers may have at most
+MAX_RESULT_DIGITS digits, estimated with lgamma before any work is done,
+and the prime sieve is only built up to MAX_SIEVE_N.
+"""
+
+from bisect import bisect_right
+from fractions import Fraction
+import math
+
+PASCAL_MAX_N = 128          # rows 0..PASCAL_MAX_N are memoized
+MULTIPLICATIVE_MAX_K = 64   # nCr with k at most this uses the multiplicative form
+MAX_RESULT_DIGITS = 300_000  # about a quarter of a second to compute
+MAX_SIEVE_N = 1_000_000     # largest n for the prime-factorisation path
+
+_pascal_rows = [(1,)]
+_sieve = bytearray(b"\x00\x00")
+_primes = []
+
+
+def _pascal_row(n: int) -> tuple:
+    while len(_pascal_rows) <= n:
+        prev = _pascal_rows[-1]
+        _pascal_rows.append((1,) + tuple(a + b for a, b in zip(prev, prev[1:])) + (1,))
+    return _pascal_rows[n]
+
+
+def _primes_up_to(n: int) -> list:
+    """Primes ≤ n from a sieve that grows as needed and is kept between calls."""
+    global _sieve, _primes
+    if n >= len(_sieve):
+        size = max(n + 1, 2 * len(_sieve))
+        sieve = bytearray([1]) * size
+        sieve[0:2] = b"\x00\x00"
+        for p in range(2, math.isqrt(size - 1) + 1):
+            if sieve[p]:
+                sieve[p * p::p] = bytes(len(range(p * p, size, p)))
+        _sieve = sieve
+        _primes = [i for i in range(size) if sieve[i]]
+    return _primes[:bisect_right(_primes, n)]
+
+
+def _legendre(n: int, p: int) -> int:
+    """Exponent of prime p in n!."""
+    e = 0
+    while n:
+        n //= p
+        e += n
+    return e
+
+
+def _product(values: list, lo: int = 0, hi: int = None) -> int:
+    """Balanced product tree: keeps the big multiplications between similar sizes."""
+    if hi is None:
+        hi = len(values)
+    n = hi - lo
+    if n == 0:
+        return 1
+    if n <= 8:
+        result = 1
+        for v in values[lo:hi]:
+            result *= v
+        return result
+    mid = (lo + hi) // 2
+    return _product(values, lo, mid) * _product(values, mid, hi)
+
+
+def _from_exponents(primes: list, exponents) -> int:
+    return _product([p ** e if e > 1 else p for p, e in zip(primes, exponents) if e])
+
+
+def _check(n: int, k: int) -> None:
+    if n < 0 or k < 0:
+        raise ValueError("n and k must be non-negative integers")
+
+
+def _log10_factorial(n: int) -> float:
+    return math.lgamma(n + 1) / math.log(10)
+
+
+def _check_size(digits: float, n: int, sieve: bool) -> None:
+    """Refuse answers too big to compute inline (see the module docstring)."""
+    if digits > MAX_RESULT_DIGITS:
+        raise ValueError(f"the answer would have about {int(digits) + 1} digits; "
+                         f"the limit is {MAX_RESULT_DIGITS}")
+    if sieve and n > MAX_SIEVE_N:
+        raise ValueError(f"n = {n} is too large for this k; n can be at most {MAX_SIEVE_N}")
+
+
+def factorial(n: int) -> int:
+    """n! from its prime factorisation."""
+    _check(n, 0)
+    _check_size(_log10_factorial(n), n, sieve=True)
+    primes = _primes_up_to(n)
+    return _from_exponents(primes, (_legendre(n, p) for p in primes))
+
+
+def comb(n: int, k: int) -> int:
+    """Number of ways to choose k of n items (nCr)."""
+    _check(n, k)
+    if k > n:
+        return 0
+    k = min(k, n - k)
+    _check_size(_log10_factorial(n) - _log10_factorial(k) - _log10_factorial(n - k), n,
+                sieve=n > PASCAL_MAX_N and k > MULTIPLICATIVE_MAX_K)
+    if n <= PASCAL_MAX_N:
+        return _pascal_row(n)[k]
+    if k <= MULTIPLICATIVE_MAX_K:
+        result = 1
+        for i in range(1, k + 1):
+            # result * (n-k+i) is divisible by i; cancel the common part first
+            g = math.gcd(result, i)
+            result = (result // g) * ((n - k + i) // (i // g))
+        return result
+    primes = _primes_up_to(n)
+    return _from_exponents(
+        primes, (_legendre(n, p) - _legendre(k, p) - _legendre(n - k, p) for p in primes)
+    )
+
+
+def perm(n: int, k: int) -> int:
+    """Number of ordered arrangements of k of n items (nPr)."""
+    _check(n, k)
+    if k > n:
+        return 0
+    _check_size(_log10_factorial(n) - _log10_factorial(n - k), n, sieve=k > MULTIPLICATIVE_MAX_K)
+    if k <= MULTIPLICATIVE_MAX_K:
+        return _product(list(range(n - k + 1, n + 1)))
+    primes = _primes_up_to(n)
+    return _from_exponents(primes, (_legendre(n, p) - _legendre(n - k, p) for p in primes))
+
+
+def binomial_probability(n: int, k: int, p: Fraction) -> Fraction:
+    """P(exactly k successes in n independent trials with success probability p)."""
+    _check(n, k)
+    if k <= n:
+        # the exact fraction's denominator grows like denominator(p)**n
+        _check_size(n * math.log10(p.denominator), n, sieve=False)
+    return comb(n, k) * p ** k * (1 - p) ** (n - k)
+
+
+def format_big(value: int, max_digits: int = 60) -> str:
+    """Digits for small values; scientific notation plus digit count for huge ones."""
+    if value < 10 ** max_digits:
+        return str(value)
+    log = math.log10(value)
+    exponent = int(log)
+    mantissa = 10 ** (log - exponent)
+    return f"{mantissa:.6f}e+{exponent} ({exponent + 1} digits)"
@@ -0,0 +1,155 @@
+"""
+derivatives.py
+--------------
+Higher-order and partial derivatives and Taylor series on top of a shared,
+LRU-cached derivative table.
+
+The cache stores single differentiation steps: (expr, var) → d(expr)/d(var).
+The k-th derivative of f is the (k-1)-th derivative's entry, so asking for
+the 10th derivative after the 7th only differentiates three more times, and
+"differentiate ... then differentiate", mixed partials and series all walk
+(and extend) the same chain of entries. SymPy expressions are immutable and
+hash by structure, so they work as keys directly.
+"""
+
+import threading
+from collections import OrderedDict
+
+from sympy import Order, diff, factorial, nan, oo, zoo
+
+DEFAULT_MAX_SIZE = 2048
+MAX_ORDER = 100
+SERIES_ORDER = 5  # highest power in a series when none was asked for
+
+
+class DerivativeCache:
+    """
+    Bounded LRU cache of first derivatives keyed on (expression, variable),
+    with hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def derivative(self, expr, var):
+        """d(expr)/d(var), differentiating only on a cache miss."""
+        key = (expr, var)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Differentiate outside the lock; errors propagate and are never cached.
+        result = diff(expr, var)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = DerivativeCache()
+
+
+def _check_order(order: int) -> None:
+    if not 0 <= order <= MAX_ORDER:
+        raise ValueError(f"order must be between 0 and {MAX_ORDER}")
+
+
+def derivative(expr, var):
+    """First derivative through the shared cache."""
+    return _cache.derivative(expr, var)
+
+
+def derivatives(expr, var, order: int) -> list:
+    """[expr, expr', expr'', ...] up to the given order, each from the one before."""
+    _check_order(order)
+    out = [expr]
+    for _ in range(order):
+        out.append(_cache.derivative(out[-1], var))
+    return out
+
+
+def nth_derivative(expr, var, order: int):
+    """The order-th derivative of expr with respect to var."""
+    return derivatives(expr, var, order)[-1]
+
+
+def partial_derivative(expr, variables):
+    """
+    Mixed partial derivative, differentiating in the order given:
+    partial_derivative(f, [x, y]) is d/dy(d/dx f).
+    """
+    _check_order(len(variables))
+    for var in variables:
+        expr = _cache.derivative(expr, var)
+    return expr
+
+
+def taylor_coefficients(expr, var, point, order: int) -> list:
+    """
+    Coefficients f^(k)(point)/k! for k = 0..order from the cached derivatives.
+    None when one of them is undefined at the point (e.g. sin(x)/x at 0).
+    """
+    coefficients = []
+    for k, d in enumerate(derivatives(expr, var, order)):
+        value = d.subs(var, point)
+        if value.has(nan, zoo, oo, -oo):
+            return None
+        coefficients.append(value / factorial(k))
+    return coefficients
+
+
+def taylor_series(expr, var, point=0, order: int = SERIES_ORDER):
+    """
+    Taylor polynomial of expr about point up to (var - point)**order, plus its
+    O() remainder. Built from taylor_coefficients; falls back to SymPy's
+    series() where those are undefined or the point is infinite.
+    """
+    _check_order(order)
+    if point in (oo, -oo):
+        return expr.series(var, point, order + 1)
+    coefficients = taylor_coefficients(expr, var, point, order)
+    if coefficients is None:
+        return expr.series(var, point, order + 1)
+    polynomial = sum(c * (var - point)**k for k, c in enumerate(coefficients))
+    return polynomial + Order((var - point)**(order + 1), (var, point))
+
+
+def derivative_cache_stats() -> dict:
+    """Hit/miss/eviction counters and current size of the shared cache."""
+    return _cache.stats()
+
+
+def clear_derivative_cache() -> None:
+    _cache.clear()
@@ -0,0 +1,155 @@
+"""
+equation_solver.py
+------------------
+Fast paths for the equations students ask about most, with sympy.solve kept
+as the last resort.
+
+classify() puts a list of equations (SymPy expressions equal to zero) into
+one of these classes:
+  polynomial     one polynomial equation in one unknown: Poly + roots, or
+                 numeric nroots when roots cannot find every root in
+                 radicals (irreducible quintics and beyond)
+  rational       one equation that is polynomial once both sides are over a
+                 common denominator: the numerator goes through the
+                 polynomial path, then roots of the denominator are dropped
+  linear_system  several equations, all linear in the unknowns: matrix form
+                 (linear_eq_to_matrix) solved with linsolve
+  general        anything else: sympy.solve
+
+Answers have the shape sympy.solve gives them: a list of roots for one
+unknown, a dict for a system, [] when there is no solution.
+"""
+
+import re
+
+from sympy import (
+    Eq, Poly, fraction, linear_eq_to_matrix, linsolve, nroots, roots, solve, together,
+)
+
+from .expression_parser import parse_expression
+
+PATHS = ("polynomial", "rational", "linear_system", "general")
+NROOTS_DIGITS = 15
+
+# equations may be separated by newlines, ";", "and" (which the preprocessor
+# leaves as "a*nd") or commas outside brackets
+_SEPARATOR_RE = re.compile(r"\n|;|\s+a\*?nd\s+")
+
+
+def _split_top_level_commas(text: str) -> list:
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def split_equations(text: str) -> list:
+    """
+    Parse text into a list of (left, right) SymPy pairs, one per equation.
+    An expression without "=" means "expression = 0".
+    """
+    pieces = [p.strip() for chunk in _SEPARATOR_RE.split(text) for p in _split_top_level_commas(chunk)]
+    pieces = [p for p in pieces if p]
+    if len(pieces) > 1 and not all("=" in p for p in pieces):
+        pieces = [text.strip()]  # the commas belong to one equation, e.g. log(x, 2) = 3
+    equations = []
+    for piece in pieces:
+        if piece.count("=") > 1:
+            raise ValueError("expected one '=' per equation")
+        left, _, right = piece.partition("=")
+        equations.append((parse_expression(left), parse_expression(right) if right.strip() else 0))
+    return equations
+
+
+def _as_zero(equation):
+    """lhs - rhs for an Eq or (lhs, rhs) pair; a plain expression as is."""
+    if isinstance(equation, tuple):
+        return equation[0] - equation[1]
+    if isinstance(equation, Eq):
+        return equation.lhs - equation.rhs
+    return equation
+
+
+def _is_polynomial(expr, var) -> bool:
+    return expr.is_polynomial(var) and not (expr.free_symbols - {var})
+
+
+def classify(expressions: list, variables: list) -> str:
+    """Class of equations given as expressions equal to zero (see the module docstring)."""
+    if len(expressions) == 1 and len(variables) == 1:
+        expr, var = expressions[0], variables[0]
+        if _is_polynomial(expr, var):
+            return "polynomial"
+        numerator, denominator = fraction(together(expr))
+        if denominator.has(var) and _is_polynomial(numerator, var) and _is_polynomial(denominator, var):
+            return "rational"
+        return "general"
+    if len(expressions) > 1 and all(
+        e.is_polynomial(*variables) and Poly(e, *variables).total_degree() <= 1 for e in expressions
+    ):
+        return "linear_system"
+    return "general"
+
+
+def _root_key(value):
+    z = complex(value.evalf())
+    return (z.imag != 0, z.real, z.imag)
+
+
+def polynomial_roots(expr, var) -> list:
+    """Distinct roots of a polynomial, exact when roots() finds them all, numeric otherwise."""
+    poly = Poly(expr, var)
+    if poly.degree() <= 0:
+        return []  # constant: no roots to report
+    found = roots(poly)
+    if sum(found.values()) < poly.degree():
+        found = dict.fromkeys(nroots(poly, n=NROOTS_DIGITS))
+    return sorted(found, key=_root_key)
+
+
+def _rational_roots(expr, var) -> list:
+    numerator, denominator = fraction(together(expr))
+    return [r for r in polynomial_roots(numerator, var) if denominator.subs(var, r) != 0]
+
+
+def _linear_system(expressions: list, variables: list):
+    matrix, vector = linear_eq_to_matrix(expressions, variables)
+    solutions = linsolve((matrix, vector), variables)
+    if not solutions:
+        return []
+    (solution,) = solutions
+    return {var: value for var, value in zip(variables, solution) if value != var}
+
+
+def solve_equations(equations: list, variables: list = None):
+    """
+    Solve one equation or a system, taking the fastest path that applies.
+
+    Parameters:
+        equations (list): Eq objects, (left, right) pairs, or expressions equal to zero.
+        variables (list or None): Unknowns; all free symbols (sorted by name) if None.
+
+    Returns:
+        tuple: (solutions, path), path being one of PATHS.
+    """
+    expressions = [_as_zero(e) for e in equations]
+    if variables is None:
+        variables = sorted(set().union(*(e.free_symbols for e in expressions)), key=str)
+    path = classify(expressions, variables)
+
+    if path == "polynomial":
+        return polynomial_roots(expressions[0], variables[0]), path
+    if path == "rational":
+        return _rational_roots(expressions[0], variables[0]), path
+    if path == "linear_system":
+        return _linear_system(expressions, variables), path
+    target = expressions[0] if len(expressions) == 1 else expressions
+    unknowns = variables[0] if len(variables) == 1 else variables
+    return solve(target, unknowns), path
@@ -0,0 +1,230 @@
+"""
+expression_parser.py
+--------------------
+Shared, LRU-cached parsing of expression strings into SymPy objects.
+
+Every solver parses through parse_expression(), so a repeated homework
+expression only reaches SymPy's parser once. SymPy expressions are
+immutable, which makes it safe to hand the same cached object to any caller.
+
+Parsing also evaluates ("7**12345678", "factorial(3000000)"), even with
+evaluate=False for function calls. Callers that parse outside a time
+budget first run check_bounded() on the text (or on the code SymPy's
+stringify_expr produced from it).
+"""
+
+import ast
+import math
+import threading
+from collections import OrderedDict
+
+from sympy import sympify
+
+DEFAULT_MAX_SIZE = 1024
+
+# limits check_bounded() enforces
+MAX_NODES = 1000
+MAX_DEPTH = 40
+MAX_DIGITS = 4000  # decimal digits of any constant subexpression
+MAX_CALL_ARGUMENT = 1000  # constant arguments of functions such as factorial()
+
+# names of SymPy number constructors and constants in stringified code
+_NUMBER_CALLS = {"Integer", "Float", "Rational"}
+_CONSTANT_NAMES = {"E", "pi", "I", "oo", "zoo", "nan", "EulerGamma", "GoldenRatio", "Catalan"}
+_ADD_DIGITS = math.log10(2)
+
+
+class UnboundedExpression(ValueError):
+    """The expression is too large to parse and evaluate safely."""
+
+
+def _is_symbol(node) -> bool:
+    if isinstance(node, ast.Name):
+        return node.id not in _CONSTANT_NAMES
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "Symbol"
+
+
+def _has_symbol(node) -> bool:
+    """True if a symbol (not a called function's name or a constant) appears under node."""
+    functions = {id(n.func) for n in ast.walk(node) if isinstance(n, ast.Call)}
+    return any(_is_symbol(n) and id(n) not in functions for n in ast.walk(node))
+
+
+def _number_digits(value) -> float:
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            raise UnboundedExpression("not a number")
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise UnboundedExpression("not a number")
+    return math.log10(abs(value) + 1)
+
+
+def _digits(node, depth: int = 0) -> float:
+    """
+    Upper bound on the decimal digits of a syntax-tree node's value; symbols
+    count as 1. Raises UnboundedExpression when the node is too big, too
+    deep, or of a kind that is not plain arithmetic.
+    """
+    if depth > MAX_DEPTH:
+        raise UnboundedExpression("too deep")
+    if isinstance(node, ast.Constant):
+        return _number_digits(node.value)
+    if isinstance(node, ast.Name):
+        return 0.0
+    if isinstance(node, ast.UnaryOp):
+        return _digits(node.operand, depth + 1)
+    if isinstance(node, ast.BinOp):
+        left, right = _digits(node.left, depth + 1), _digits(node.right, depth + 1)
+        if isinstance(node.op, (ast.Add, ast.Sub)):
+            result = max(left, right) + _ADD_DIGITS
+        elif isinstance(node.op, ast.Pow):
+            if right > math.log10(MAX_DIGITS):
+                raise UnboundedExpression("exponent too large")
+            result = left * 10 ** right
+        else:
+            result = left + right
+    elif isinstance(node, ast.Call) and not node.keywords:
+        func = node.func
+        if isinstance(func, ast.Name) and func.id in _NUMBER_CALLS:
+            result = sum(_number_digits(a.value) if isinstance(a, ast.Constant) else _digits(a, depth + 1)
+                         for a in node.args)
+        elif isinstance(func, ast.Name) and func.id == "Symbol":
+            result = 0.0
+        elif isinstance(func, (ast.Name, ast.Call)):
+            if isinstance(func, ast.Call):
+                _digits(func, depth + 1)  # Function('f')(x)
+            result = 0.0
+            for arg in node.args:
+                digits = _digits(arg, depth + 1)
+                if not _has_symbol(arg):
+                    # constant argument: bound the work, e.g. factorial(n) has ~n*log10(n) digits
+                    if digits > math.log10(MAX_CALL_ARGUMENT + 1) or any(
+                            isinstance(n, ast.Call) and not (isinstance(n.func, ast.Name) and n.func.id in _NUMBER_CALLS)
+                            for n in ast.walk(arg)):
+                        raise UnboundedExpression("function argument too large")
+                    value = 10 ** digits
+                    result = max(result, value * math.log10(value + 1))
+        else:
+            raise UnboundedExpression("unsupported call")
+    else:
+        raise UnboundedExpression(f"unsupported syntax {type(node).__name__}")
+    if result > MAX_DIGITS:
+        raise UnboundedExpression("number too large")
+    return result
+
+
+def check_bounded(code: str) -> None:
+    """
+    Raise UnboundedExpression unless code (Python syntax, "^" read as "**")
+    is plain arithmetic on symbols, numbers and function calls whose values
+    are provably small: at most MAX_NODES nodes, MAX_DEPTH deep, no constant
+    subexpression over MAX_DIGITS digits and no constant function argument
+    over MAX_CALL_ARGUMENT. Cheap: nothing is evaluated.
+    """
+    try:
+        tree = ast.parse(code.replace("^", "**").strip(), mode="eval")
+    except SyntaxError as e:
+        raise UnboundedExpression(f"not an expression: {e.msg}")
+    if sum(1 for _ in ast.walk(tree)) > MAX_NODES:
+        raise UnboundedExpression("too many nodes")
+    _digits(tree.body)
+
+
+def normalize_expression_key(expr_str: str) -> str:
+    """Cache key for an expression string: trimmed, with whitespace runs collapsed."""
+    return " ".join(expr_str.split())
+
+
+class ExpressionCache:
+    """
+    Bounded LRU cache from normalized expression strings to parsed SymPy
+    expressions, with hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def resize(self, max_size: int) -> None:
+        """Change the capacity, evicting the least recently used entries if needed."""
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    def parse(self, expr_str: str):
+        """Return the SymPy expression for expr_str, parsing it only on a cache miss."""
+        key = normalize_expression_key(expr_str)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Parse outside the lock; errors propagate and are never cached.
+        expr = sympify(key)
+
+        with self._lock:
+            self._entries[key] = expr
+            self._entries.move_to_end(key)
+            self._evict()
+        return expr
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+_cache = ExpressionCache()
+
+
+def parse_expression(expr_str: str):
+    """Parse an expression string with the shared cache."""
+    return _cache.parse(expr_str)
+
+
+def parse_cache_stats() -> dict:
+    """Hit/miss/eviction counters and current size of the shared cache."""
+    return _cache.stats()
+
+
+def set_parse_cache_size(max_size: int) -> None:
+    """Configure the maximum number of cached expressions."""
+    _cache.resize(max_size)
+
+
+def clear_parse_cache() -> None:
+    _cache.clear()
@@ -2,9 +2,212 @@
 geometry_solver.py
 ------------------
 Handles geometry-related math problems like area, perimeter, and volume.
+
+Formulas live in one registry keyed by (shape, quantity), so answering a
+question is a single dictionary lookup once the shape and quantity words are
+found. Every formula is written with plain arithmetic, which means the same
+function works on floats and on NumPy arrays. evaluate_batch uses that to
+compute a formula over whole arrays of dimensions in one call.
 """
 
+from collections import namedtuple
 import math
+import re
+
+PI = math.pi
+
+# label: answer prefix; params: dimension names in positional order;
+# formula: shown in step mode; calculation: params substituted in step mode
+Formula = namedtuple("Formula", "label params fn formula calculation")
+
+FORMULAS = {
+    ("circle", "area"): Formula(
+        "Area of the circle", ("r",), lambda r: PI * r**2,
+        "Area = π * r²", "π * {r}²"),
+    ("circle", "perimeter"): Formula(
+        "Circumference of the circle", ("r",), lambda r: 2 * PI * r,
+        "Circumference = 2 * π * r", "2 * π * {r}"),
+    ("circle", "diameter"): Formula(
+        "Diameter of the circle", ("r",), lambda r: 2 * r,
+        "Diameter = 2 * r", "2 * {r}"),
+    ("square", "area"): Formula(
+        "Area of the square", ("s",), lambda s: s**2,
+        "Area = s²", "{s}²"),
+    ("square", "perimeter"): Formula(
+        "Perimeter of the square", ("s",), lambda s: 4 * s,
+        "Perimeter = 4 * s", "4 * {s}"),
+    ("square", "diagonal"): Formula(
+        "Diagonal of the square", ("s",), lambda s: s * 2**0.5,
+        "Diagonal = s * √2", "{s} * √2"),
+    ("rectangle", "area"): Formula(
+        "Area of the rectangle", ("l", "w"), lambda l, w: l * w,
+        "Area = l * w", "{l} * {w}"),
+    ("rectangle", "perimeter"): Formula(
+        "Perimeter of the rectangle", ("l", "w"), lambda l, w: 2 * (l + w),
+        "Perimeter = 2 * (l + w)", "2 * ({l} + {w})"),
+    ("rectangle", "diagonal"): Formula(
+        "Diagonal of the rectangle", ("l", "w"), lambda l, w: (l**2 + w**2) ** 0.5,
+        "Diagonal = √(l² + w²)", "√({l}² + {w}²)"),
+    ("triangle", "area"): Formula(
+        "Area of the triangle", ("b", "h"), lambda b, h: 0.5 * b * h,
+        "Area = 1/2 * b * h", "1/2 * {b} * {h}"),
+    ("triangle", "perimeter"): Formula(
+        "Perimeter of the triangle", ("a", "b", "c"), lambda a, b, c: a + b + c,
+        "Perimeter = a + b + c", "{a} + {b} + {c}"),
+    ("triangle", "hypotenuse"): Formula(
+        "Hypotenuse of the right triangle", ("a", "b"), lambda a, b: (a**2 + b**2) ** 0.5,
+        "Hypotenuse = √(a² + b²)", "√({a}² + {b}²)"),
+    ("parallelogram", "area"): Formula(
+        "Area of the parallelogram", ("b", "h"), lambda b, h: b * h,
+        "Area = b * h", "{b} * {h}"),
+    ("trapezoid", "area"): Formula(
+        "Area of the trapezoid", ("a", "b", "h"), lambda a, b, h: 0.5 * (a + b) * h,
+        "Area = 1/2 * (a + b) * h", "1/2 * ({a} + {b}) * {h}"),
+    ("cube", "volume"): Formula(
+        "Volume of the cube", ("s",), lambda s: s**3,
+        "Volume = s³", "{s}³"),
+    ("cube", "surface_area"): Formula(
+        "Surface area of the cube", ("s",), lambda s: 6 * s**2,
+        "Surface area = 6 * s²", "6 * {s}²"),
+    ("cuboid", "volume"): Formula(
+        "Volume of the cuboid", ("l", "w", "h"), lambda l, w, h: l * w * h,
+        "Volume = l * w * h", "{l} * {w} * {h}"),
+    ("cuboid", "surface_area"): Formula(
+        "Surface area of the cuboid", ("l", "w", "h"), lambda l, w, h: 2 * (l * w + l * h + w * h),
+        "Surface area = 2 * (lw + lh + wh)", "2 * ({l}*{w} + {l}*{h} + {w}*{h})"),
+    ("sphere", "volume"): Formula(
+        "Volume of the sphere", ("r",), lambda r: (4/3) * PI * r**3,
+        "Volume = 4/3 * π * r³", "4/3 * π * {r}³"),
+    ("sphere", "surface_area"): Formula(
+        "Surface area of the sphere", ("r",), lambda r: 4 * PI * r**2,
+        "Surface area = 4 * π * r²", "4 * π * {r}²"),
+    ("hemisphere", "volume"): Formula(
+        "Volume of the hemisphere", ("r",), lambda r: (2/3) * PI * r**3,
+        "Volume = 2/3 * π * r³", "2/3 * π * {r}³"),
+    ("cylinder", "volume"): Formula(
+        "Volume of the cylinder", ("r", "h"), lambda r, h: PI * r**2 * h,
+        "Volume = π * r² * h", "π * {r}² * {h}"),
+    ("cylinder", "surface_area"): Formula(
+        "Surface area of the cylinder", ("r", "h"), lambda r, h: 2 * PI * r * (r + h),
+        "Surface area = 2 * π * r * (r + h)", "2 * π * {r} * ({r} + {h})"),
+    ("cone", "volume"): Formula(
+        "Volume of the cone", ("r", "h"), lambda r, h: PI * r**2 * h / 3,
+        "Volume = 1/3 * π * r² * h", "1/3 * π * {r}² * {h}"),
+    ("cone", "surface_area"): Formula(
+        "Surface area of the cone", ("r", "h"), lambda r, h: PI * r * (r + (r**2 + h**2) ** 0.5),
+        "Surface area = π * r * (r + √(r² + h²))", "π * {r} * ({r} + √({r}² + {h}²))"),
+    ("pyramid", "volume"): Formula(
+        "Volume of the square pyramid", ("s", "h"), lambda s, h: s**2 * h / 3,
+        "Volume = 1/3 * s² * h", "1/3 * {s}² * {h}"),
+}
+
+SHAPE_ALIASES = {
+    "circle": "circle", "square": "square", "rectangle": "rectangle",
+    "triangle": "triangle", "parallelogram": "parallelogram",
+    "trapezoid": "trapezoid", "trapezium": "trapezoid",
+    "cube": "cube", "cuboid": "cuboid", "rectangular prism": "cuboid", "box": "cuboid",
+    "sphere": "sphere", "ball": "sphere", "hemisphere": "hemisphere",
+    "cylinder": "cylinder", "cone": "cone", "pyramid": "pyramid",
+}
+
+QUANTITY_ALIASES = {
+    "surface area": "surface_area", "area": "area",
+    "perimeter": "perimeter", "circumference": "perimeter",
+    "volume": "volume", "diagonal": "diagonal", "diameter": "diameter",
+    "hypotenuse": "hypotenuse",
+}
+
+_KNOWN_QUANTITIES = frozenset(QUANTITY_ALIASES.values())
+
+# "area" of a solid means its surface area
+_QUANTITY_FALLBACK = {"area": "surface_area"}
+# words that name their shape on their own ("circumference of 3")
+_IMPLIED_SHAPES = {"circumference": "circle", "hypotenuse": "triangle"}
+
+PARAM_WORDS = {
+    "radius": "r", "r": "r", "height": "h", "h": "h",
+    "length": "l", "l": "l", "width": "w", "breadth": "w", "w": "w",
+    "side": "s", "edge": "s", "s": "s", "base": "b",
+}
+PARAM_NAMES = {"r": "radius", "h": "height", "l": "length", "w": "width",
+               "s": "side", "b": "base", "a": "side", "c": "side"}
+
+
+def _alternation(words) -> str:
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+_SHAPE_RE = re.compile(rf"\b({_alternation(SHAPE_ALIASES)})s?\b")
+_QUANTITY_RE = re.compile(rf"\b({_alternation(QUANTITY_ALIASES)})\b")
+_NUMBER = r"(\d+(?:\.\d+)?|\.\d+)"
+_NAMED_RE = re.compile(rf"\b({_alternation(PARAM_WORDS)}|diameter)\s*(?:=|is|of)?\s*{_NUMBER}")
+_NUMBER_RE = re.compile(_NUMBER)
+
+
+def lookup(shape: str, quantity: str):
+    """Formula for (shape, quantity), or None."""
+    formula = FORMULAS.get((shape, quantity))
+    if formula is None and quantity in _QUANTITY_FALLBACK:
+        formula = FORMULAS.get((shape, _QUANTITY_FALLBACK[quantity]))
+    return formula
+
+
+def evaluate(shape: str, quantity: str, **dims) -> float:
+    """Scalar formula value, e.g. evaluate("cylinder", "volume", r=3, h=5)."""
+    formula = lookup(shape, quantity)
+    if formula is None:
+        raise KeyError(f"no formula for the {quantity} of a {shape}")
+    return formula.fn(*(dims[p] for p in formula.params))
+
+
+def evaluate_batch(shape: str, quantity: str, *columns, **dims):
+    """
+    Evaluate one formula over arrays of dimensions in a single vectorized call.
+
+    Parameters:
+        shape, quantity (str): Registry key, e.g. ("circle", "area").
+        *columns: Dimension arrays in the formula's parameter order, or
+        **dims: Dimension arrays by parameter name (r=..., h=...).
+            Arrays broadcast, so a scalar can be mixed with an array.
+
+    Returns:
+        numpy.ndarray: One value per row of dimensions.
+    """
+    import numpy as np
+
+    formula = lookup(shape, quantity)
+    if formula is None:
+        raise KeyError(f"no formula for the {quantity} of a {shape}")
+    if columns:
+        if len(columns) != len(formula.params):
+            raise ValueError(f"{formula.label} needs {len(formula.params)} dimension arrays")
+        arrays = columns
+    else:
+        missing = [p for p in formula.params if p not in dims]
+        if missing:
+            raise ValueError(f"missing dimensions: {', '.join(missing)}")
+        arrays = [dims[p] for p in formula.params]
+    return formula.fn(*(np.asarray(a, dtype=np.float64) for a in arrays))
+
+
+def _dimensions(text: str, params: tuple):
+    """Named dimensions first ("radius 5", "h = 2"), then remaining numbers in order."""
+    values = {}
+    used = set()
+    for m in _NAMED_RE.finditer(text):
+        word, number = m.group(1), float(m.group(2))
+        if word == "diameter":
+            param, number = "r", number / 2
+        else:
+            param = PARAM_WORDS[word]
+        if param in params and param not in values:
+            values[param] = number
+            used.add(m.start(2))
+    positional = [float(m.group()) for m in _NUMBER_RE.finditer(text) if m.start() not in used]
+    for param in params:
+        if param not in values and positional:
+            values[param] = positional.pop(0)
+    return values
 
 
 def solve_geometry(parsed):
@@ -18,52 +221,54 @@ def solve_geometry(parsed):
         str: Answer or step-by-step explanation.
     """
 
-    expr = parsed["expression"]
-    step_mode = parsed.get("step_by_step", False)
-    steps = []
-
-    # Lowercase for easier keyword matching
-    expr_lower = expr.lower()
-
-    # Extract numbers from the expression
-    nums = [float(n) for n in expr_lower.split() if n.replace('.', '', 1).isdigit()]
-
-    # AREA & PERIMETER
-    if "circle" in expr_lower and "area" in expr_lower:
-        if len(nums) < 1:
-            return "Please provide the radius."
-        r = nums[0]
-        area = math.pi * r**2
-        if not step_mode:
-            return f"Area of the circle: {area:.2f}"
-        steps.append(f"Given radius r = {r}")
-        steps.append("Formula: Area = π * r²")
-        steps.append(f"Calculation: π * {r}² = {area:.2f}")
-        return "\n".join(steps)
-
-    elif "circle" in expr_lower and "perimeter" in expr_lower or "circumference" in expr_lower:
-        if len(nums) < 1:
-            return "Please provide the radius."
-        r = nums[0]
-        perimeter = 2 * math.pi * r
-        if not step_mode:
-            return f"Circumference of the circle: {perimeter:.2f}"
-        steps.append(f"Given radius r = {r}")
-        steps.append("Formula: Circumference = 2 * π * r")
-        steps.append(f"Calculation: 2 * π * {r} = {perimeter:.2f}")
-        return "\n".join(steps)
-
-    # VOLUME
-    elif "sphere" in expr_lower and "volume" in expr_lower:
-        if len(nums) < 1:
-            return "Please provide the radius."
-        r = nums[0]
-        volume = (4/3) * math.pi * r**3
-        if not step_mode:
-            return f"Volume of the sphere: {volume:.2f}"
-        steps.append(f"Given radius r = {r}")
-        steps.append("Formula: Volume = 4/3 * π * r³")
-        steps.append(f"Calculation: 4/3 * π * {r}³ = {volume:.2f}")
-        return "\n".join(steps)
-
-    return "Sorry, I don't yet know how to solve that geometry problem."
+    return _solve(parsed["expression"], None, parsed.get("step_by_step", False))
+
+
+def solve_geometry_problem(problem):
+    """
+    Handler for ("geometry", area/perimeter/volume/diameter/hypotenuse/diagonal);
+    the operation names the quantity and the expression is the raw question.
+    """
+    return _solve(problem.expression, problem.operation, problem.step_by_step)
+
+
+def _solve(text: str, quantity, step_mode: bool) -> str:
+    """quantity (from the parser) is used alongside any quantity words left in the text."""
+    expr = text.lower()
+
+    quantity_words = [m.group(1) for m in _QUANTITY_RE.finditer(expr)]
+    quantities = [QUANTITY_ALIASES[w] for w in quantity_words]
+    if quantity in _KNOWN_QUANTITIES and quantity not in quantities:
+        quantities.append(quantity)
+    shape = _SHAPE_RE.search(expr)
+    if shape is not None:
+        shape = SHAPE_ALIASES[shape.group(1)]
+    else:
+        shape = next((_IMPLIED_SHAPES[w] for w in quantity_words if w in _IMPLIED_SHAPES), None)
+    if shape is None or not quantities:
+        return "Sorry, I don't yet know how to solve that geometry problem."
+
+    # "diameter" may name a dimension rather than the quantity asked for
+    formula = None
+    for quantity in sorted(quantities, key=lambda q: q == "diameter"):
+        formula = lookup(shape, quantity)
+        if formula is not None:
+            break
+    if formula is None:
+        return "Sorry, I don't yet know how to solve that geometry problem."
+
+    values = _dimensions(expr, formula.params)
+    missing = [PARAM_NAMES[p] for p in formula.params if p not in values]
+    if missing:
+        return f"Please provide the {' and '.join(missing)}."
+
+    result = formula.fn(*(values[p] for p in formula.params))
+    if not step_mode:
+        return f"{formula.label}: {result:.2f}"
+    given = ", ".join(f"{PARAM_NAMES[p]} {p} = {values[p]}" for p in formula.params)
+    steps = [
+        f"Given {given}",
+        f"Formula: {formula.formula}",
+        f"Calculation: {formula.calculation.format(**values)} = {result:.2f}",
+    ]
+    return "\n".join(steps)
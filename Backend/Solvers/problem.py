@@ -0,0 +1,56 @@
+"""
+problem.py
+----------
+The typed problem object that solver handlers receive.
+
+The parser has already worked out the subject and operation, and the
+expression holds only the math operand (no operation words), so handlers
+never re-detect keywords or strip them before parsing. SymPy is only
+imported once a handler asks for the parsed expression.
+"""
+
+from typing import NamedTuple, Optional
+
+
+class Problem(NamedTuple):
+    subject: str
+    operation: Optional[str]
+    expression: str
+    step_by_step: bool = False
+    source: Optional[str] = None  # data file for statistics
+    points: Optional[tuple] = None  # x values for "evaluate"
+    bounds: Optional[tuple] = None  # (lower, upper) texts for "definite_integral"
+    order: Optional[int] = None  # derivative order / highest series power
+    wrt: Optional[tuple] = None  # variable names for "partial_derivative"
+    point: Optional[str] = None  # expansion point for "series"
+
+    @classmethod
+    def from_step(cls, step: dict, step_by_step: bool = False) -> "Problem":
+        """Build a Problem from a parsed query or pipeline step dict."""
+        return cls(
+            subject=(step.get("subject") or "").lower(),
+            operation=(step.get("operation") or "").lower() or None,
+            expression=step.get("expression", "") or "",
+            step_by_step=step_by_step,
+            source=step.get("source"),
+            points=step.get("points"),
+            bounds=tuple(step["bounds"]) if step.get("bounds") else None,
+            order=step.get("order"),
+            wrt=tuple(step["wrt"]) if step.get("wrt") else None,
+            point=step.get("point"),
+        )
+
+    @property
+    def expr(self):
+        """The expression parsed with SymPy (through the shared parse cache)."""
+        from .expression_parser import parse_expression
+
+        return parse_expression(self.expression)
+
+    @property
+    def variable(self):
+        """The expression's only free symbol, or x."""
+        from sympy import Symbol
+
+        free = self.expr.free_symbols
+        return next(iter(free)) if len(free) == 1 else Symbol("x")
@@ -0,0 +1,216 @@
+"""
+stats_engine.py
+---------------
+NumPy statistics for large data sets.
+
+Numbers are parsed in bulk into float64 arrays and summarized with
+vectorized NumPy calls. Data can also come from a file:
+  * .npy               – NumPy array (memory-mapped)
+  * .f64 / .bin        – raw little-endian float64 values (memory-mapped)
+  * .csv / .txt / ...  – delimited text; every numeric field is used
+
+Files that are too big for memory are processed in chunks.
+  * Mean, variance and std are exact. Each chunk's count/mean/M2 is merged
+    with the parallel form of Welford's update, so only one pass is needed.
+  * Median and mode are approximate. They are computed from a uniform random
+    sample of the stream.
+
+File names typed in chat come from remote users, so they are resolved with
+resolve_data_file() against one data directory (MATH_TUTOR_DATA_DIR, by
+default Backend/data); anything outside it is treated as missing.
+"""
+
+import os
+import re
+
+import numpy as np
+
+CHUNK_SIZE = 1_000_000          # values per streamed chunk
+IN_MEMORY_BYTES = 256 * 2**20   # files up to this size are loaded whole
+SAMPLE_SIZE = 100_000           # sample kept for approximate median/mode
+
+NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+# An inline list: numbers separated by commas, semicolons or spaces, maybe in
+# brackets. Words (which the normalizer splits into "a*nd") are dropped first;
+# anything else left over, such as an operator, means it isn't a list.
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z*']*:?")
+_NUMBER_LIST_RE = re.compile(
+    rf"\s*[\[(]?\s*{NUMBER_RE.pattern}(?:(?:\s*[,;]\s*|\s+){NUMBER_RE.pattern})*\s*[\])]?[\s.?!]*")
+BINARY_EXTENSIONS = (".f64", ".bin")
+
+OPERATIONS = ("mean", "median", "mode", "variance", "std")
+
+DATA_DIR = os.environ.get("MATH_TUTOR_DATA_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def set_data_dir(path: str) -> None:
+    """Directory that data files named in questions are read from."""
+    global DATA_DIR
+    DATA_DIR = path
+
+
+def resolve_data_file(name: str) -> str:
+    """
+    Absolute path of a data file inside DATA_DIR. Raises FileNotFoundError for
+    files that don't exist and, with the same message, for names that resolve
+    outside DATA_DIR (absolute paths, "..", symlinks), so callers can't tell
+    the two apart.
+    """
+    root = os.path.realpath(DATA_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        raise FileNotFoundError(name)
+    return path
+
+
+def is_number_list(text: str) -> bool:
+    """True when text (words aside) is just a list of numbers, not e.g. "7**1234567"."""
+    return _NUMBER_LIST_RE.fullmatch(_WORD_RE.sub(" ", text)) is not None
+
+
+def parse_numbers(text: str) -> np.ndarray:
+    """Every number in text, as one float64 array."""
+    return np.array(NUMBER_RE.findall(text), dtype=np.float64)
+
+
+def _mode(values: np.ndarray) -> float:
+    uniques, counts = np.unique(values, return_counts=True)
+    return float(uniques[np.argmax(counts)])
+
+
+def compute(values: np.ndarray, operation: str) -> float:
+    """Exact statistic over an in-memory array (variance/std use n-1)."""
+    if operation == "mean":
+        return float(np.mean(values))
+    if operation == "median":
+        return float(np.median(values))
+    if operation == "mode":
+        return _mode(values)
+    if operation == "variance":
+        return float(np.var(values, ddof=1))
+    if operation == "std":
+        return float(np.std(values, ddof=1))
+    raise ValueError(f"unsupported statistics operation {operation!r}")
+
+
+class StreamingStats:
+    """
+    One-pass accumulator over chunks of values.
+
+    count/mean/M2 are merged per chunk with Chan et al.'s parallel Welford
+    update, so variance stays numerically stable. A bottom-k random-key
+    sample keeps a uniform sample of the stream for quantile and mode
+    estimates.
+    """
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE, seed: int = 0):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sample_size = sample_size
+        self._rng = np.random.default_rng(seed)
+        self._sample = np.empty(0)
+        self._keys = np.empty(0)
+
+    def update(self, chunk: np.ndarray) -> None:
+        chunk = np.asarray(chunk, dtype=np.float64).ravel()
+        n_b = chunk.size
+        if n_b == 0:
+            return
+        mean_b = float(chunk.mean())
+        m2_b = float(((chunk - mean_b) ** 2).sum())
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.count = n
+        self.min = min(self.min, float(chunk.min()))
+        self.max = max(self.max, float(chunk.max()))
+
+        # keep the values with the sample_size smallest random keys
+        keys = np.concatenate([self._keys, self._rng.random(n_b)])
+        values = np.concatenate([self._sample, chunk])
+        if keys.size > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, values = keys[keep], values[keep]
+        self._keys, self._sample = keys, values
+
+    @property
+    def exact_sample(self) -> bool:
+        """True while the sample still holds every value seen."""
+        return self._sample.size == self.count
+
+    def result(self, operation: str) -> float:
+        if self.count == 0:
+            raise ValueError("no values")
+        if operation == "mean":
+            return self.mean
+        if operation in ("variance", "std"):
+            if self.count < 2:
+                raise ValueError("variance requires at least two data points")
+            var = self.m2 / (self.count - 1)
+            return var if operation == "variance" else var ** 0.5
+        if operation == "median":
+            return float(np.median(self._sample))
+        if operation == "mode":
+            return _mode(self._sample)
+        raise ValueError(f"unsupported statistics operation {operation!r}")
+
+    def is_approximate(self, operation: str) -> bool:
+        return operation in ("median", "mode") and not self.exact_sample
+
+
+def _iter_text_chunks(path: str, chunk_size: int):
+    pending = []
+    size = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            pending.append(line)
+            size += line.count(",") + line.count(" ") + 1
+            if size >= chunk_size:
+                yield parse_numbers("".join(pending))
+                pending, size = [], 0
+    if pending:
+        yield parse_numbers("".join(pending))
+
+
+def iter_file_chunks(path: str, chunk_size: int = CHUNK_SIZE):
+    """Stream a data file as float64 chunks."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        data = np.load(path, mmap_mode="r").ravel()
+    elif ext in BINARY_EXTENSIONS:
+        data = np.memmap(path, dtype="<f8", mode="r")
+    else:
+        yield from _iter_text_chunks(path, chunk_size)
+        return
+    for start in range(0, data.size, chunk_size):
+        yield np.asarray(data[start:start + chunk_size], dtype=np.float64)
+
+
+def summarize_file(path: str, operation: str, chunk_size: int = CHUNK_SIZE,
+                   in_memory_bytes: int = IN_MEMORY_BYTES) -> dict:
+    """
+    Statistic over a data file. Files up to in_memory_bytes are loaded whole and
+    answered exactly; larger ones are streamed.
+
+    Returns:
+        dict: {"value", "count", "approximate", "streamed"}
+    """
+    if os.path.getsize(path) <= in_memory_bytes:
+        chunks = list(iter_file_chunks(path, chunk_size))
+        values = np.concatenate(chunks) if chunks else np.empty(0)
+        if values.size == 0:
+            raise ValueError("no numbers found in the file")
+        return {"value": compute(values, operation), "count": int(values.size),
+                "approximate": False, "streamed": False}
+
+    acc = StreamingStats()
+    for chunk in iter_file_chunks(path, chunk_size):
+        acc.update(chunk)
+    return {"value": acc.result(operation), "count": acc.count,
+            "approximate": acc.is_approximate(operation), "streamed": True}
@@ -1,11 +1,187 @@
 """
 stats_solver.py
 ---------------
-Handles statistics problems like mean, median, mode, and standard deviation.
+Handles statistics problems like mean, median, mode, variance and standard deviation,
+plus counting and probability (combinations, permutations, binomial probability).
+
+Short inline lists use the pure-Python statistics module. Large inline lists
+and data files ("source") go to the NumPy engine in stats_engine. Both read
+numbers with stats_engine.NUMBER_RE, so signs and exponents are kept, after
+stats_engine.is_number_list has checked the operand really is a list.
+Counting answers are exact big integers from combinatorics.
 """
 
+from fractions import Fraction
+import re
 import statistics
 
+from . import combinatorics, stats_engine
+
+# Inline expressions longer than this are parsed and summarized with NumPy.
+LARGE_INPUT_CHARS = 10_000
+
+_LABELS = {"mean": "Mean", "median": "Median", "mode": "Mode",
+           "variance": "Variance", "std": "Standard Deviation"}
+
+
+def _requested_operation(expr_lower: str):
+    if "mean" in expr_lower or "average" in expr_lower:
+        return "mean"
+    if "median" in expr_lower:
+        return "median"
+    if "mode" in expr_lower:
+        return "mode"
+    if "variance" in expr_lower:
+        return "variance"
+    if "standard deviation" in expr_lower or "std" in expr_lower:
+        return "std"
+    return None
+
+
+_COUNTING_KEYWORDS = (
+    ("combination", "combination"), ("ncr", "combination"), ("choose", "combination"),
+    ("permutation", "permutation"), ("npr", "permutation"),
+    ("probability", "probability"),
+)
+
+# "3 from 10", "3 out of 10": k is given before n. The parser may have split
+# the words into letter products ("f*ro*m"), so "*" is dropped before matching.
+_K_FROM_N_RE = re.compile(r"(\d+)\s+(?:from|out\s+of)\s+(\d+)", re.IGNORECASE)
+
+# integers, decimals and simple fractions such as 1/6
+_QUANTITY_RE = re.compile(r"(\d+(?:\.\d+)?|\.\d+)(?:\s*/\s*(\d+(?:\.\d+)?))?")
+
+
+def _counting_operation(expr_lower: str):
+    for keyword, operation in _COUNTING_KEYWORDS:
+        if keyword in expr_lower:
+            return operation
+    return None
+
+
+def _quantities(expr: str) -> list:
+    values = []
+    for numerator, denominator in _QUANTITY_RE.findall(expr):
+        value = Fraction(numerator)
+        if denominator:
+            value /= Fraction(denominator)
+        values.append(value)
+    return values
+
+
+def _solve_counting(operation: str, expr: str, step_mode: bool) -> str:
+    """nCr, nPr and probability questions, answered exactly."""
+    values = _quantities(expr)
+
+    if operation == "probability":
+        return _solve_probability(values, step_mode)
+
+    if len(values) < 2 or any(v.denominator != 1 for v in values[:2]):
+        return "Please give two whole numbers, n and k (e.g. '10 choose 3')."
+    # n first, as in "10 choose 3", unless the wording puts k first
+    n, k = int(values[0]), int(values[1])
+    m = _K_FROM_N_RE.search(expr.replace("*", ""))
+    if m:
+        k, n = int(m.group(1)), int(m.group(2))
+    try:
+        if operation == "combination":
+            value = combinatorics.comb(n, k)
+            label, formula = "Combinations", "C(n, k) = n! / (k! (n-k)!)"
+        else:
+            value = combinatorics.perm(n, k)
+            label, formula = "Permutations", "P(n, k) = n! / (n-k)!"
+    except ValueError as e:
+        return f"Sorry, that is too large to count exactly: {e}."
+    result = combinatorics.format_big(value)
+    if not step_mode:
+        return f"{label}: {result}"
+    symbol = "C" if operation == "combination" else "P"
+    return "\n".join([
+        f"n = {n}, k = {k}",
+        f"Formula: {formula}",
+        f"{symbol}({n}, {k}) = {result}",
+    ])
+
+
+def _solve_probability(values: list, step_mode: bool) -> str:
+    """
+    Two numbers: favorable outcomes out of total outcomes.
+    Three numbers: exactly k successes in n trials with success probability p.
+    """
+    if len(values) == 2:
+        favorable, total = values
+        if total == 0 or favorable > total:
+            return "Favorable outcomes must be between 0 and the total number of outcomes."
+        prob = favorable / total
+        answer = f"Probability: {prob} ≈ {float(prob):.4f}"
+        if not step_mode:
+            return answer
+        return "\n".join([
+            f"Favorable outcomes: {favorable}, total outcomes: {total}",
+            "Formula: P = favorable / total",
+            answer,
+        ])
+
+    if len(values) == 3:
+        p_candidates = [v for v in values if v <= 1 and (v.denominator != 1 or v in (0, 1))]
+        if not p_candidates:
+            return "The success probability p must be between 0 and 1."
+        p = p_candidates[-1]
+        rest = list(values)
+        rest.remove(p)
+        if any(v.denominator != 1 for v in rest):
+            return "The number of trials and successes must be whole numbers."
+        n, k = int(max(rest)), int(min(rest))
+        try:
+            prob = combinatorics.binomial_probability(n, k, p)
+        except ValueError as e:
+            return f"Sorry, that is too large to compute exactly: {e}."
+        answer = f"Probability: {float(prob):.6g}"
+        if not step_mode:
+            return answer
+        return "\n".join([
+            f"Trials n = {n}, successes k = {k}, p = {p}",
+            "Formula: P(X = k) = C(n, k) p^k (1-p)^(n-k)",
+            f"C({n}, {k}) = {combinatorics.format_big(combinatorics.comb(n, k))}",
+            answer,
+        ])
+
+    return ("Please give favorable and total outcomes (e.g. '3 out of 10'), "
+            "or successes, trials and p (e.g. '3 successes in 10 trials with p = 0.5').")
+
+
+def _format_value(operation: str, value: float) -> str:
+    return f"{value:.2f}" if operation in ("mean", "variance", "std") else f"{value}"
+
+
+def _solve_bulk(expr: str, source, operation: str, step_mode: bool):
+    """Answer with the NumPy engine."""
+    try:
+        if source:
+            summary = stats_engine.summarize_file(stats_engine.resolve_data_file(source), operation)
+        else:
+            values = stats_engine.parse_numbers(expr)
+            if values.size == 0:
+                return "Please provide a set of numbers."
+            summary = {"value": stats_engine.compute(values, operation), "count": int(values.size),
+                       "approximate": False, "streamed": False}
+    except OSError:
+        return f"Could not find the data file: {source}"
+    except ValueError as e:
+        return f"Could not compute the {_LABELS[operation].lower()}: {e}"
+
+    label = _LABELS[operation]
+    value = _format_value(operation, summary["value"])
+    note = " (approximate, estimated from a random sample)" if summary["approximate"] else ""
+    if not step_mode:
+        return f"{label}: {value}{note}"
+    steps = [f"Data: {summary['count']} values" + (f" from {source}" if source else "")]
+    if summary["streamed"]:
+        steps.append("The data was processed in chunks in a single pass "
+                     "(running mean and variance, sampled median and mode).")
+    steps.append(f"{label} = {value}{note}")
+    return "\n".join(steps)
+
 
 def solve_statistics(parsed):
     """
@@ -20,17 +196,45 @@ def solve_statistics(parsed):
 
     expr = parsed["expression"]
     step_mode = parsed.get("step_by_step", False)
+    source = parsed.get("source")
+
+    counting = _counting_operation(expr.lower())
+    if counting is not None and not source:
+        return _solve_counting(counting, expr, step_mode)
+    return _solve(expr, _requested_operation(expr.lower()), step_mode, source)
+
+
+def solve_statistics_problem(problem):
+    """Handler for ("statistics", mean/median/mode/variance/std)."""
+    operation = problem.operation if problem.operation in _LABELS else _requested_operation(problem.expression.lower())
+    return _solve(problem.expression, operation, problem.step_by_step, problem.source)
+
+
+def solve_counting_problem(problem):
+    """Handler for ("statistics", probability/combination/permutation)."""
+    return _solve_counting(problem.operation, problem.expression, problem.step_by_step)
+
+
+def _solve(expr: str, operation, step_mode: bool, source=None) -> str:
+    """Summary statistic of inline numbers or a data file; operation is a key of _LABELS."""
     steps = []
 
+    # "mean of 7**1234567" is not the list 7, 1234567
+    if not source and stats_engine.NUMBER_RE.search(expr) and not stats_engine.is_number_list(expr):
+        return "Please provide the numbers as a list, like 2, 4, 9."
+
+    if source or len(expr) > LARGE_INPUT_CHARS:
+        if operation is None:
+            return "Sorry, I can't solve that statistics problem yet."
+        return _solve_bulk(expr, source, operation, step_mode)
+
     # Extract numbers from the expression
-    nums = [float(n) for n in expr.replace(",", " ").split() if n.replace('.', '', 1).isdigit()]
+    nums = [float(n) for n in stats_engine.NUMBER_RE.findall(expr)]
 
     if len(nums) == 0:
         return "Please provide a set of numbers."
 
-    expr_lower = expr.lower()
-
-    if "mean" in expr_lower or "average" in expr_lower:
+    if operation == "mean":
         mean_val = statistics.mean(nums)
         if not step_mode:
             return f"Mean: {mean_val:.2f}"
@@ -39,7 +243,7 @@ def solve_statistics(parsed):
         steps.append(f"Calculation: {sum(nums)} / {len(nums)} = {mean_val:.2f}")
         return "\n".join(steps)
 
-    elif "median" in expr_lower:
+    elif operation == "median":
         median_val = statistics.median(nums)
         if not step_mode:
             return f"Median: {median_val}"
@@ -49,7 +253,7 @@ def solve_statistics(parsed):
         steps.append(f"Median = {median_val}")
         return "\n".join(steps)
 
-    elif "mode" in expr_lower:
+    elif operation == "mode":
         try:
             mode_val = statistics.mode(nums)
         except statistics.StatisticsError:
@@ -61,7 +265,20 @@ def solve_statistics(parsed):
         steps.append(f"Mode = {mode_val}")
         return "\n".join(steps)
 
-    elif "standard deviation" in expr_lower:
+    elif operation == "variance":
+        if len(nums) < 2:
+            return "Variance needs at least two numbers."
+        variance_val = statistics.variance(nums)
+        if not step_mode:
+            return f"Variance: {variance_val:.2f}"
+        steps.append(f"Numbers: {nums}")
+        steps.append("Formula: sum((x - mean)²) / (n-1)")
+        steps.append(f"Variance = {variance_val:.2f}")
+        return "\n".join(steps)
+
+    elif operation == "std":
+        if len(nums) < 2:
+            return "Standard deviation needs at least two numbers."
         stdev_val = statistics.stdev(nums)
         if not step_mode:
             return f"Standard Deviation: {stdev_val:.2f}"
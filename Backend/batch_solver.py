@@ -0,0 +1,98 @@
+"""
+batch_solver.py
+---------------
+Solve many queries at once across a pool of worker processes.
+
+SymPy work is CPU-bound and holds the GIL, so batches are spread over a
+ProcessPoolExecutor rather than threads. Queries are parsed in the parent,
+identical problems are solved once, and answers come back in input order.
+A failing item yields an error string in its slot instead of aborting the
+batch.
+
+The pool uses the same start method as time_budget (forkserver or spawn),
+never fork: a forked child would inherit the parent's budget workers and
+share their pipes with its siblings.
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import time_budget
+from nlp_parser import parse_user_input
+from math_engine import route_math_problem
+
+
+def _solve_one(parsed: dict) -> str:
+    try:
+        return route_math_problem(parsed)
+    except Exception as e:
+        return f"Error while solving: {e}"
+
+
+def _solve_chunk(problems: list) -> list:
+    """Worker entry point: solve a chunk of parsed problems in order."""
+    return [_solve_one(p) for p in problems]
+
+
+def _parse(query):
+    """Accept raw question strings or already-parsed problem dicts."""
+    return query if isinstance(query, dict) else parse_user_input(query)
+
+
+def solve_batch(queries, workers: int = None, chunksize: int = None) -> list:
+    """
+    Solve a list of queries and return the answers in input order.
+
+    Parameters:
+        queries (list): Raw question strings and/or parsed problem dicts.
+        workers (int or None): Number of worker processes; defaults to the CPU
+            count. With workers=1 the batch runs in the calling process.
+        chunksize (int or None): Problems sent to a worker per task; by default
+            the batch is split into about four chunks per worker.
+
+    Returns:
+        list: One answer string per query.
+    """
+    queries = list(queries)
+    if not queries:
+        return []
+
+    # Parse in the parent and solve each distinct problem only once.
+    slots = []
+    unique = []
+    index_of = {}
+    for query in queries:
+        try:
+            parsed = _parse(query)
+        except Exception as e:
+            slots.append(f"Error while parsing: {e}")
+            continue
+        key = json.dumps(parsed, sort_keys=True, default=str)
+        if key not in index_of:
+            index_of[key] = len(unique)
+            unique.append(parsed)
+        slots.append(index_of[key])
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(unique) or 1))
+
+    if workers == 1:
+        answers = _solve_chunk(unique)
+    else:
+        chunksize = chunksize or max(1, len(unique) // (workers * 4))
+        chunks = [unique[i:i + chunksize] for i in range(0, len(unique), chunksize)]
+        answers = []
+        context = multiprocessing.get_context(time_budget.START_METHOD)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(_solve_chunk, chunk) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    answers.extend(future.result())
+                except Exception as e:
+                    # The worker itself died (e.g. BrokenProcessPool); only this
+                    # chunk is lost.
+                    answers.extend([f"Error while solving: {e}"] * len(chunk))
+
+    return [answers[slot] if isinstance(slot, int) else slot for slot in slots]
@@ -0,0 +1,64 @@
+"""
+bench_batch.py
+--------------
+Throughput of batch_solver.solve_batch as the worker count grows.
+
+Solves a batch of distinct, CPU-heavy calculus problems with 1..N worker
+processes and reports problems/s and speedup over a single worker.
+
+Run from the Backend directory:
+    python benchmarks/bench_batch.py [--problems 200] [--max-workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_solver import solve_batch  # noqa: E402
+from result_cache import get_result_cache  # noqa: E402
+from Solvers.expression_parser import clear_parse_cache  # noqa: E402
+
+
+def make_problems(n: int) -> list:
+    """Distinct integrate/differentiate problems, pre-parsed so only solving is timed."""
+    problems = []
+    for k in range(n):
+        if k % 2:
+            expression = f"x**{k % 6 + 2}*sin({k % 5 + 1}*x) + {k}*x*exp(x)"
+            operation = "integrate"
+        else:
+            expression = f"(x**{k % 9 + 1} + {k})*cos(x**2)/(1 + x**{k % 4 + 1})"
+            operation = "differentiate"
+        problems.append({"subject": "calculus", "operation": operation,
+                         "expression": expression, "step_by_step": False})
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--problems", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    problems = make_problems(args.problems)
+    counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < args.max_workers], args.max_workers})
+
+    baseline = None
+    for workers in counts:
+        # Forked workers inherit the parent's caches; start every run cold.
+        get_result_cache().clear()
+        clear_parse_cache()
+        start = time.perf_counter()
+        answers = solve_batch(problems, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert len(answers) == len(problems)
+        baseline = baseline or elapsed
+        print(f"workers={workers:>3}: {elapsed:7.2f}s  {len(problems) / elapsed:8.1f} problems/s"
+              f"  speedup {baseline / elapsed:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+bench_combinatorics.py
+----------------------
+Exact nCr / nPr: the combinatorics engine against the naive factorial formula.
+
+The naive formula builds n!, k! and (n-k)! with a plain loop and divides.
+Every result is checked against math.comb / math.perm.
+
+Run from the Backend directory:
+    python benchmarks/bench_combinatorics.py
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Solvers import combinatorics  # noqa: E402
+
+CASES = [
+    ("comb", 52, 5),        # Pascal row
+    ("comb", 1000, 10),     # multiplicative
+    ("comb", 5000, 2500),   # prime factorisation
+    ("comb", 50000, 25000),
+    ("perm", 52, 5),
+    ("perm", 20000, 10000),
+]
+
+
+def _loop_factorial(n: int) -> int:
+    result = 1
+    for i in range(2, n + 1):
+        result *= i
+    return result
+
+
+def naive(kind: str, n: int, k: int) -> int:
+    if kind == "comb":
+        return _loop_factorial(n) // (_loop_factorial(k) * _loop_factorial(n - k))
+    return _loop_factorial(n) // _loop_factorial(n - k)
+
+
+def _time(fn, *args, min_time: float = 0.2) -> float:
+    """Seconds per call, averaged over enough calls to fill min_time."""
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn(*args)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def main():
+    reference = {"comb": math.comb, "perm": math.perm}
+    engine = {"comb": combinatorics.comb, "perm": combinatorics.perm}
+    print(f"{'case':>20} {'naive':>12} {'engine':>12} {'speedup':>8}")
+    for kind, n, k in CASES:
+        expected = reference[kind](n, k)
+        assert engine[kind](n, k) == expected, (kind, n, k)
+        assert naive(kind, n, k) == expected, (kind, n, k)
+        t_naive = _time(naive, kind, n, k)
+        t_engine = _time(engine[kind], n, k)
+        print(f"{kind}({n}, {k}):".rjust(20)
+              + f" {t_naive * 1000:9.3f} ms {t_engine * 1000:9.3f} ms {t_naive / t_engine:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+bench_definite_integral.py
+--------------------------
+Latency of definite integrals: the symbolic/numeric race in integration.py
+against symbolic integration alone.
+
+Both run under the same deadline in a time_budget worker, which is replaced
+by a fresh (warmed-up) one before every timed call so that SymPy's cache
+inside the worker doesn't favour whichever runs second. Integrands are
+elementary ones SymPy integrates quickly and non-elementary ones where it
+struggles or gives up (exp(-x**2) * log(1 + x), x**x, ...). For each one
+the report gives both times, which side won the race, and the error
+estimate of a numeric answer.
+
+Run from the Backend directory:
+    python benchmarks/bench_definite_integral.py [--deadline 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import Symbol, exp, log, oo, pi, sin, sqrt  # noqa: E402
+
+from integration import _exact, definite_integral  # noqa: E402
+from time_budget import TimedOutResult, _runner, run_with_budget  # noqa: E402
+
+x = Symbol("x")
+
+CASES = [
+    ("elementary", x**2, 0, 3),
+    ("elementary", sin(x)**2, 0, pi),
+    ("elementary", x * exp(-x), 0, oo),
+    ("elementary", 1 / (1 + x**2), -1, 1),
+    ("non-elementary", exp(-x**2), 0, 1),
+    ("non-elementary", sin(x) / x, 0, 1),
+    ("non-elementary", x**x, 0, 1),
+    ("non-elementary", exp(-x**2) * log(1 + x), 0, 2),
+    ("non-elementary", sqrt(1 + x**3), 0, 1),
+    ("non-elementary", sin(sin(x)), 0, pi),
+]
+
+
+def _fresh_worker() -> None:
+    _runner.shutdown()
+    run_with_budget(_exact, (x, x, 0, 1), "warm-up", budget=60)
+
+
+def _symbolic_only(expr, lower, upper, deadline):
+    _fresh_worker()
+    start = time.perf_counter()
+    result = run_with_budget(_exact, (expr, x, lower, upper), "definite_integral", budget=deadline)
+    elapsed = time.perf_counter() - start
+    if isinstance(result, TimedOutResult):
+        return elapsed, "timed out"
+    return elapsed, "unevaluated" if result is None else "exact"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--deadline", type=float, default=5.0, help="seconds per integral")
+    args = parser.parse_args()
+
+    definite_integral(x, x, 0, 1)  # imports and lambdify/mpmath set-up in this process
+    totals = {"race": 0.0, "symbolic": 0.0}
+    for kind, expr, lower, upper in CASES:
+        _fresh_worker()
+        start = time.perf_counter()
+        result = definite_integral(expr, x, lower, upper, deadline=args.deadline)
+        race_s = time.perf_counter() - start
+        symbolic_s, outcome = _symbolic_only(expr, lower, upper, args.deadline)
+        totals["race"] += race_s
+        totals["symbolic"] += symbolic_s
+
+        if isinstance(result, TimedOutResult) or result is None:
+            won = "none"
+        else:
+            won = "exact" if result["exact"] else f"numeric (err {result['error']:.0e})"
+        label = f"∫[{lower}, {upper}] {expr}"
+        print(f"{kind:<15} {label:<34} race {1000 * race_s:8.1f} ms  {won:<20} "
+              f"symbolic {1000 * symbolic_s:8.1f} ms  {outcome}")
+    print(f"\ntotal: race {totals['race']:.2f} s, symbolic only {totals['symbolic']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
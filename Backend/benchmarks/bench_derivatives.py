@@ -0,0 +1,91 @@
+"""
+bench_derivatives.py
+--------------------
+Repeated higher-order derivative and series requests with and without the
+shared derivative cache (Solvers/derivatives.py).
+
+For each function the workload is what a student working through it asks:
+the 1st, 2nd, ... --orders-th derivative one after another, then the Taylor
+series to that order. Without the cache every request differentiates from
+scratch (diff(f, x, k), series()); with it each request only differentiates
+the orders not asked for before. Answers are checked against each other.
+
+Run from the Backend directory:
+    python benchmarks/bench_derivatives.py [--orders 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import atan, cos, diff, exp, log, series, simplify, sin, sqrt, symbols, tan  # noqa: E402
+from sympy.core.cache import clear_cache  # noqa: E402
+
+from Solvers.derivatives import (  # noqa: E402
+    clear_derivative_cache, derivative_cache_stats, nth_derivative, taylor_series,
+)
+
+x = symbols("x")
+
+FUNCTIONS = [
+    x**7 - 3 * x**4 + 2 * x,
+    sin(x) * exp(x),
+    exp(-x**2),
+    log(1 + x),
+    atan(x),
+    sqrt(1 + x) * cos(x),
+    tan(x),
+]
+
+
+def _workload(expr, orders: int, nth, taylor) -> list:
+    answers = [nth(expr, k) for k in range(1, orders + 1)]
+    answers.append(taylor(expr, orders).removeO())
+    return answers
+
+
+def _cached(expr, orders):
+    return _workload(expr, orders, lambda e, k: nth_derivative(e, x, k),
+                     lambda e, n: taylor_series(e, x, 0, n))
+
+
+def _from_scratch(expr, orders):
+    return _workload(expr, orders, lambda e, k: diff(e, x, k), lambda e, n: series(e, x, 0, n + 1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=10, help="highest derivative order and series order")
+    args = parser.parse_args()
+
+    totals = [0.0, 0.0]
+    for expr in FUNCTIONS:
+        # start both runs with SymPy's own cache cold
+        clear_cache()
+        clear_derivative_cache()
+        start = time.perf_counter()
+        cached = _cached(expr, args.orders)
+        cached_s = time.perf_counter() - start
+        stats = derivative_cache_stats()
+
+        clear_cache()
+        start = time.perf_counter()
+        scratch = _from_scratch(expr, args.orders)
+        scratch_s = time.perf_counter() - start
+
+        for a, b in zip(cached, scratch):
+            if simplify(a - b) != 0:
+                raise SystemExit(f"{expr}: answers differ: {a} vs {b}")
+        totals[0] += cached_s
+        totals[1] += scratch_s
+        print(f"{str(expr):<28} cached {1000 * cached_s:9.1f} ms ({stats['misses']:3d} diff calls)   "
+              f"from scratch {1000 * scratch_s:9.1f} ms   speedup {scratch_s / cached_s:5.1f}x")
+    print(f"\ntotal: cached {totals[0]:.2f} s, from scratch {totals[1]:.2f} s "
+          f"({totals[1] / totals[0]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
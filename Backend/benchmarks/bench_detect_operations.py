@@ -0,0 +1,62 @@
+"""
+bench_detect_operations.py
+--------------------------
+Micro-benchmark for nlp_parser._detect_operations.
+
+Compares the precompiled single-pass keyword scanner against the previous
+per-keyword ``re.search`` implementation on the shared query corpus, and
+checks that both put the same operation first. The lists themselves can
+differ where keywords overlap: the old scan also reported "taylor" and
+"series" inside "taylor series" (see tests/test_detect_operations.py).
+
+Run from the Backend directory:
+    python benchmarks/bench_detect_operations.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlp_parser import OP_KEYWORDS, _detect_operations  # noqa: E402
+from benchmarks.corpus import QUERIES  # noqa: E402
+
+
+def _detect_operations_legacy(text: str) -> list:
+    """The original implementation: one regex search per keyword, then a re-sort."""
+    ops = []
+    for key in sorted(OP_KEYWORDS.keys(), key=len, reverse=True):
+        if re.search(rf"\b{re.escape(key)}\b", text, flags=re.IGNORECASE):
+            ops.append(key)
+    ordered = []
+    cursor = text.lower()
+    for key in sorted(set(ops), key=lambda k: cursor.find(k)):
+        ordered.append(key)
+    return ordered
+
+
+def _run(fn):
+    for q in QUERIES:
+        fn(q)
+
+
+def main(repeat: int = 5, number: int = 200):
+    for q in QUERIES:
+        legacy, fast = _detect_operations_legacy(q), _detect_operations(q)
+        if legacy[:1] != fast[:1]:
+            raise SystemExit(f"Mismatch on {q!r}: legacy={legacy} fast={fast}")
+
+    n_calls = number * len(QUERIES)
+    results = {}
+    for name, fn in (("legacy", _detect_operations_legacy), ("single-pass", _detect_operations)):
+        best = min(timeit.repeat(lambda: _run(fn), repeat=repeat, number=number))
+        results[name] = best
+        print(f"{name:>12}: {best / n_calls * 1e6:8.2f} µs/query  ({n_calls / best:,.0f} queries/s)")
+
+    print(f"     speedup: {results['legacy'] / results['single-pass']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
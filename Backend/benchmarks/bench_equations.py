@@ -0,0 +1,132 @@
+"""
+bench_equations.py
+------------------
+Per-path benchmark of Solvers.equation_solver against plain sympy.solve.
+
+For every path (polynomial, high-degree polynomial via nroots, rational,
+linear system, general) a batch of random equations of that class is solved
+both ways. Both answers must agree numerically; the report gives the mean
+time per equation and the speedup.
+
+Run from the Backend directory:
+    python benchmarks/bench_equations.py [--equations 40]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import Eq, Rational, solve, symbols  # noqa: E402
+from sympy.core.cache import clear_cache  # noqa: E402
+
+from Solvers.equation_solver import classify, solve_equations  # noqa: E402
+
+x, y, z = symbols("x y z")
+TOLERANCE = 1e-9
+
+
+def _nonzero(rng, low=-9, high=9):
+    return rng.choice([n for n in range(low, high + 1) if n])
+
+
+def polynomial(rng):
+    degree = rng.randint(1, 4)
+    expr = _nonzero(rng, 1, 3)
+    for _ in range(degree):
+        expr *= (x - rng.randint(-6, 6))
+    # mostly integer roots, as in homework; sometimes shifted off them
+    return [Eq(expr.expand() + rng.choice([0, 0, 0, rng.randint(-3, 3)]), 0)], [x]
+
+
+def high_degree(rng):
+    return [Eq(x**rng.randint(5, 7) - rng.randint(1, 4) * x - _nonzero(rng), 0)], [x]
+
+
+def rational(rng):
+    a, b, c = _nonzero(rng), rng.randint(-5, 5), _nonzero(rng)
+    return [Eq(a / (x + b) + Rational(1, 2) * x, c)], [x]
+
+
+def linear_system(rng):
+    unknowns = [x, y, z][: rng.randint(2, 3)]
+    values = [rng.randint(-5, 5) for _ in unknowns]
+    equations = []
+    for _ in unknowns:
+        coefficients = [_nonzero(rng) for _ in unknowns]
+        lhs = sum(c * v for c, v in zip(coefficients, unknowns))
+        equations.append(Eq(lhs, sum(c * v for c, v in zip(coefficients, values))))
+    return equations, unknowns
+
+
+def general(rng):
+    return [rng.choice([Eq(2 * x - 3, rng.randint(1, 9) * x**Rational(1, 2) + 1),
+                        Eq(x * 2**x, rng.randint(1, 9))])], [x]
+
+
+GENERATORS = {
+    "polynomial": polynomial,
+    "polynomial (nroots)": high_degree,
+    "rational": rational,
+    "linear_system": linear_system,
+    "general": general,
+}
+
+
+def _values(solutions, unknowns) -> list:
+    """Solutions as sorted tuples of complex numbers, whatever their shape."""
+    if isinstance(solutions, dict):
+        solutions = [tuple(solutions.get(u, u) for u in unknowns)]
+    out = []
+    for s in solutions:
+        if isinstance(s, dict):
+            s = tuple(s.get(u, u) for u in unknowns)
+        s = s if isinstance(s, tuple) else (s,)
+        out.append(tuple(complex(v.evalf()) for v in s))
+    return sorted(out, key=lambda t: [(v.real, v.imag) for v in t])
+
+
+def _agree(a, b) -> bool:
+    return len(a) == len(b) and all(
+        abs(p - q) <= TOLERANCE * max(1.0, abs(q)) for ta, tb in zip(a, b) for p, q in zip(ta, tb)
+    )
+
+
+def run(name: str, n: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    cases = [GENERATORS[name](rng) for _ in range(n)]
+    paths = {classify([e.lhs - e.rhs for e in eqs], unknowns) for eqs, unknowns in cases}
+
+    # SymPy caches intermediate results; start both runs cold
+    clear_cache()
+    start = time.perf_counter()
+    fast = [solve_equations(eqs, unknowns)[0] for eqs, unknowns in cases]
+    fast_s = time.perf_counter() - start
+
+    clear_cache()
+    start = time.perf_counter()
+    naive = [solve(eqs if len(eqs) > 1 else eqs[0], unknowns if len(unknowns) > 1 else unknowns[0])
+             for eqs, unknowns in cases]
+    naive_s = time.perf_counter() - start
+
+    for (eqs, unknowns), a, b in zip(cases, fast, naive):
+        if not _agree(_values(a, unknowns), _values(b, unknowns)):
+            raise SystemExit(f"{name}: answers differ for {eqs}: {a} vs {b}")
+
+    print(f"{name:<20} path={'/'.join(sorted(paths)):<14} fast {1000 * fast_s / n:8.2f} ms"
+          f"   solve {1000 * naive_s / n:8.2f} ms   speedup {naive_s / fast_s:6.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--equations", type=int, default=40, help="equations per path")
+    args = parser.parse_args()
+    for name in GENERATORS:
+        run(name, args.equations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+bench_evaluate.py
+-----------------
+Grid evaluation: per-point SymPy subs().evalf() against the compiled, cached
+NumPy functions behind math_engine.evaluate_expression.
+
+Timings for the compiled path are shown twice: the first call (parse,
+differentiate, integrate, lambdify) and a repeat call served from the cache.
+
+Run from the Backend directory:
+    python benchmarks/bench_evaluate.py [--points 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from math_engine import evaluate_expression  # noqa: E402
+from numeric_eval import clear_compiled_cache  # noqa: E402
+from Solvers.expression_parser import parse_expression  # noqa: E402
+
+EXPRESSIONS = [
+    "x**3 - 2*x + 1",
+    "sin(x)*exp(-x/5)",
+    "x*cos(x) + 1/(x + 1)",
+]
+
+
+def subs_evalf(expression: str, xs) -> dict:
+    from sympy import Symbol, diff, integrate
+
+    x = Symbol('x')
+    expr = parse_expression(expression)
+    derivative = diff(expr, x)
+    antiderivative = integrate(expr, x)
+    f = [float(expr.subs(x, v).evalf()) for v in xs]
+    d = [float(derivative.subs(x, v).evalf()) for v in xs]
+    start = float(antiderivative.subs(x, xs[0]).evalf())
+    i = [float(antiderivative.subs(x, v).evalf()) - start for v in xs]
+    return {"f": f, "derivative": d, "integral": i}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="subs().evalf() vs compiled grid evaluation.")
+    parser.add_argument("--points", type=int, default=1000)
+    args = parser.parse_args()
+    xs = np.linspace(0.0, 4.0, args.points)
+
+    clear_compiled_cache()
+    print(f"{args.points} points, f, f' and ∫f")
+    for expression in EXPRESSIONS:
+        start = time.perf_counter()
+        slow = subs_evalf(expression, xs)
+        t_subs = time.perf_counter() - start
+
+        start = time.perf_counter()
+        evaluate_expression(expression, xs)
+        t_first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast = evaluate_expression(expression, xs)
+        t_cached = time.perf_counter() - start
+
+        for kind in ("f", "derivative", "integral"):
+            assert np.allclose(fast[kind], slow[kind], rtol=1e-9, atol=1e-9), (expression, kind)
+        print(f"  {expression:<24} subs/evalf {t_subs * 1000:9.1f} ms | "
+              f"compiled first {t_first * 1000:7.1f} ms, cached {t_cached * 1000:6.2f} ms "
+              f"({t_subs / t_cached:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+bench_fingerprint.py
+--------------------
+Replays a history file through the result-cache key function and compares
+hit rates for keys on the whitespace-collapsed expression text (the old key)
+and keys on expression fingerprints (fingerprint.py).
+
+Each saved query is parsed again with the current parser, and every step's
+key is looked up in a simulated LRU of --cache-size entries. Only the keys
+are replayed; no solver runs.
+
+The history can be a history.db store or a JSON-lines history.txt. Without
+--history, a synthetic one is generated: a few hundred homework problems
+with skewed popularity, each asked in randomly chosen but equivalent
+spellings ("3x^2 + 2x", "2*x + 3*x**2", ...). --generate saves it.
+
+Run from the Backend directory:
+    python benchmarks/bench_fingerprint.py --history history.db
+    python benchmarks/bench_fingerprint.py --queries 5000 --generate synthetic_history.txt
+"""
+
+import argparse
+from collections import OrderedDict
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fingerprint import clear_fingerprint_cache, fingerprint, fingerprint_stats  # noqa: E402
+from history_store import HistoryStore  # noqa: E402
+from nlp_parser import parse_user_input  # noqa: E402
+from result_cache import canonical_expression, make_key  # noqa: E402
+
+PHRASES = {
+    "differentiate": ["differentiate {e}", "find the derivative of {e}", "derivative of {e}"],
+    "integrate": ["integrate {e}", "what is the antiderivative of {e}?", "integrate {e} please"],
+    "factor": ["factor {e}", "please factor {e}"],
+    "simplify": ["simplify {e}", "can you simplify {e}"],
+    "solve": ["solve {e} = 0", "solve for x: {e} = 0"],
+}
+
+
+def _term(coefficient: int, power: int, rng) -> str:
+    """One term of a polynomial in a random but equivalent spelling."""
+    if power == 0:
+        return str(coefficient)
+    x = rng.choice(["x", "x"] if power == 1 else [f"x^{power}", f"x**{power}"])
+    if coefficient == 1:
+        return x
+    return rng.choice([f"{coefficient}{x}", f"{coefficient}*{x}", f"{x}*{coefficient}"])
+
+
+def _spelling(coefficients: tuple, rng) -> str:
+    terms = [(c, p) for p, c in enumerate(coefficients) if c]
+    rng.shuffle(terms)
+    text = ""
+    for c, p in terms:
+        piece = _term(abs(c), p, rng)
+        if not text:
+            text = piece if c > 0 else f"-{piece}"
+        else:
+            text += rng.choice([" + ", "+"]) + piece if c > 0 else rng.choice([" - ", "-"]) + piece
+    return text or "0"
+
+
+def synthetic_history(queries: int, problems: int = 300, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    pool = []
+    while len(pool) < problems:
+        coefficients = (rng.randint(-6, 6), rng.randint(-6, 6), rng.randint(1, 4))
+        operation = rng.choice(list(PHRASES))
+        if (coefficients, operation) not in pool:
+            pool.append((coefficients, operation))
+    weights = [1 / (rank + 1) for rank in range(len(pool))]  # a few problems are asked far more often
+    entries = []
+    for coefficients, operation in rng.choices(pool, weights, k=queries):
+        question = rng.choice(PHRASES[operation]).format(e=_spelling(coefficients, rng))
+        entries.append({"raw_input": question})
+    return entries
+
+
+def load_history(path: str) -> list:
+    if path.endswith(".db"):
+        return list(HistoryStore(path).iter_entries())
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _steps(parsed: dict) -> list:
+    if isinstance(parsed.get("pipeline"), list):
+        return [step for step in parsed["pipeline"] if not step.get("chain")]
+    return [parsed]
+
+
+def text_key(subject, operation, expression, step_by_step) -> tuple:
+    return ((subject or "").lower(), (operation or "").lower(), canonical_expression(expression), bool(step_by_step))
+
+
+def replay(keys: list, cache_size: int) -> dict:
+    cache = OrderedDict()
+    hits = 0
+    for key in keys:
+        if key in cache:
+            cache.move_to_end(key)
+            hits += 1
+        else:
+            cache[key] = True
+            if len(cache) > cache_size:
+                cache.popitem(last=False)
+    return {"lookups": len(keys), "hits": hits, "hit_rate": hits / len(keys) if keys else 0.0,
+            "distinct": len(set(keys))}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", help="history.db or JSON-lines history file to replay")
+    parser.add_argument("--queries", type=int, default=5000, help="size of the synthetic history")
+    parser.add_argument("--generate", help="write the synthetic history to this JSON-lines file")
+    parser.add_argument("--cache-size", type=int, default=256, help="simulated LRU capacity")
+    args = parser.parse_args()
+
+    if args.history:
+        entries, source = load_history(args.history), args.history
+    else:
+        entries, source = synthetic_history(args.queries), f"synthetic ({args.queries} queries)"
+        if args.generate:
+            with open(args.generate, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+
+    steps = []
+    for entry in entries:
+        parsed = parse_user_input(entry["raw_input"])
+        for step in _steps(parsed):
+            steps.append((step.get("subject"), step.get("operation"), step.get("expression", ""),
+                          parsed.get("step_by_step", False)))
+
+    old_keys = [text_key(*step) for step in steps]
+    clear_fingerprint_cache()
+    start = time.perf_counter()
+    new_keys = [make_key(*step) for step in steps]
+    elapsed = time.perf_counter() - start
+    stats = fingerprint_stats()
+
+    old, new = replay(old_keys, args.cache_size), replay(new_keys, args.cache_size)
+    print(f"history: {source}, {len(entries)} queries, {len(steps)} solver lookups, LRU of {args.cache_size}")
+    print(f"  text keys:         {old['distinct']:6d} distinct  hit rate {old['hit_rate']:6.1%}")
+    print(f"  fingerprint keys:  {new['distinct']:6d} distinct  hit rate {new['hit_rate']:6.1%}")
+    print(f"  solver calls saved: {new['hits'] - old['hits']} "
+          f"({(new['hits'] - old['hits']) / len(steps) if steps else 0:.1%} of lookups)")
+    print(f"  fingerprinting: {1e6 * elapsed / max(len(steps), 1):.1f} µs per key on average "
+          f"(memo hit rate {stats['hit_rate']:.1%}; a memo hit costs {_memo_hit_cost():.2f} µs)")
+
+
+def _memo_hit_cost(n: int = 20000) -> float:
+    fingerprint("3*x**2 + 2*x + 1")
+    start = time.perf_counter()
+    for _ in range(n):
+        fingerprint("3*x**2 + 2*x + 1")
+    return 1e6 * (time.perf_counter() - start) / n
+
+
+if __name__ == "__main__":
+    main()
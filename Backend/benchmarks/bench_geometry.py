@@ -0,0 +1,53 @@
+"""
+bench_geometry.py
+-----------------
+Geometry formulas: one Python call per shape against one vectorized
+evaluate_batch call over all of them (e.g. 100k circle areas).
+
+Run from the Backend directory:
+    python benchmarks/bench_geometry.py [--n 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Solvers.geometry_solver import evaluate, evaluate_batch  # noqa: E402
+
+CASES = [
+    ("circle", "area", ("r",)),
+    ("cylinder", "volume", ("r", "h")),
+    ("cone", "surface_area", ("r", "h")),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs batch geometry formulas.")
+    parser.add_argument("--n", type=int, default=100_000, help="shapes per formula")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for shape, quantity, params in CASES:
+        dims = {p: rng.uniform(0.5, 10.0, args.n) for p in params}
+
+        start = time.perf_counter()
+        rows = [dict(zip(params, values)) for values in zip(*(dims[p].tolist() for p in params))]
+        scalar = [evaluate(shape, quantity, **row) for row in rows]
+        t_scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = evaluate_batch(shape, quantity, **dims)
+        t_batch = time.perf_counter() - start
+
+        assert np.allclose(batch, scalar)
+        print(f"{shape} {quantity} x{args.n}: loop {t_scalar * 1000:8.1f} ms, "
+              f"batch {t_batch * 1000:6.2f} ms ({t_scalar / t_batch:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+bench_grader.py
+---------------
+Bulk grading: grader.grade_batch against the plain SymPy check
+simplify(parse(student) - parse(expected)) == 0.
+
+Submissions are algebra and calculus questions from the question templates.
+Every question gets one correct answer in a different but equivalent form
+(factored vs expanded, rewritten trig and exponentials) and one wrong answer
+in the same form. The grader must get every grade right; the report also
+shows how many grades simplify() got right.
+
+Run from the Backend directory:
+    python benchmarks/bench_grader.py [--questions 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from grader import _CONSTANT_RE, _parse, grade_batch, grader_stats, reset_grader_stats  # noqa: E402
+from question_bank import live_question  # noqa: E402
+
+
+def _rewrite(expr):
+    """An equivalent form that does not cancel against the original automatically."""
+    from sympy import cos, exp, expand, expand_trig, factor, sin, tan
+
+    if expr.has(sin, cos):
+        return expand_trig(expr.rewrite(tan))
+    if expr.has(exp):
+        return expr.rewrite(cos)
+    factored = factor(expr)
+    return factored if factored != expr else expand(expr)
+
+
+def _student_form(expr, constant: bool) -> str:
+    text = str(expr).replace("**", "^")
+    return f"{text} + C" if constant else text
+
+
+def submissions(n: int, seed: int = 0) -> list:
+    from sympy import Symbol
+
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < 2 * n:
+        expected = live_question(rng.choice(["algebra", "calculus"]), rng)["answer"]
+        if "," in expected:
+            continue
+        constant = bool(_CONSTANT_RE.search(expected))
+        correct = _rewrite(_parse(_CONSTANT_RE.sub("", expected)))
+        pairs.append((_student_form(correct, constant), expected, True))
+        pairs.append((_student_form(correct + Symbol("x"), constant), expected, False))
+    return pairs
+
+
+def naive_grade(student: str, expected: str) -> bool:
+    from sympy import Symbol, simplify
+
+    a = _parse(_CONSTANT_RE.sub("", student))
+    b = _parse(_CONSTANT_RE.sub("", expected))
+    difference = simplify(a - b)
+    if _CONSTANT_RE.search(expected):
+        return Symbol("x") not in difference.free_symbols
+    return difference == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grader throughput vs simplify().")
+    parser.add_argument("--questions", type=int, default=200)
+    args = parser.parse_args()
+
+    pairs = submissions(args.questions)
+    for student, expected, _ in pairs:  # warm the parser for both sides
+        _parse(_CONSTANT_RE.sub("", student))
+        _parse(_CONSTANT_RE.sub("", expected))
+
+    start = time.perf_counter()
+    naive = [naive_grade(s, e) for s, e, _ in pairs]
+    t_naive = time.perf_counter() - start
+
+    reset_grader_stats()
+    start = time.perf_counter()
+    results = grade_batch((s, e) for s, e, _ in pairs)
+    t_fast = time.perf_counter() - start
+
+    truth = [t for _, _, t in pairs]
+    assert [r["correct"] for r in results] == truth, "grader disagreed with the expected grades"
+
+    n = len(pairs)
+    print(f"{n} submissions")
+    agreed = sum(a == t for a, t in zip(naive, truth))
+    print(f"  simplify(): {t_naive:7.2f} s  ({n / t_naive:8.0f} answers/s)  {agreed}/{n} correct grades")
+    print(f"  grader:     {t_fast:7.2f} s  ({n / t_fast:8.0f} answers/s)  {t_naive / t_fast:.1f}x")
+    for path, s in sorted(grader_stats().items()):
+        print(f"  {path:>16}: {s['count']:5d} answers, mean {s['mean_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
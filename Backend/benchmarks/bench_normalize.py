@@ -0,0 +1,89 @@
+"""
+bench_normalize.py
+------------------
+Golden check and micro-benchmark for nlp_preprocessor.normalize_math_text.
+
+The fused two-pass normalizer must reproduce the outputs recorded in
+golden/normalize_math_text.json (captured from the original multi-pass
+implementation, which is kept below for timing comparison).
+
+Run from the Backend directory:
+    python benchmarks/bench_normalize.py
+"""
+
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlp_preprocessor import (  # noqa: E402
+    FILLER, FRACTIONS, NUMBER_WORDS, WORD_TO_SYMBOL,
+    normalize_math_text, normalize_many,
+)
+from benchmarks.corpus import QUERIES  # noqa: E402
+
+GOLDEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "normalize_math_text.json")
+
+
+def normalize_math_text_legacy(user_input: str) -> str:
+    """The original implementation: one re.sub per rule, patterns rebuilt per call."""
+    s = user_input.strip()
+    for w in FILLER:
+        s = re.sub(rf"\b{re.escape(w)}\b", " ", s, flags=re.IGNORECASE)
+    s = re.sub(r"\s+", " ", s).strip()
+    for phrase, val in FRACTIONS.items():
+        s = re.sub(rf"\b{re.escape(phrase)}\b", str(val), s, flags=re.IGNORECASE)
+
+    def repl(match):
+        return str(sum(NUMBER_WORDS[w] for w in match.group(0).split() if w in NUMBER_WORDS))
+
+    words = "|".join(NUMBER_WORDS.keys())
+    s = re.sub(r"\b(" + words + r")(?:\s+(" + words + r"))?\b", repl, s, flags=re.IGNORECASE)
+    s = re.sub(r"\b([a-zA-Z])\s+squared\b", r"\1**2", s)
+    s = re.sub(r"\b([a-zA-Z])\s+cubed\b", r"\1**3", s)
+    for phrase, sym in sorted(WORD_TO_SYMBOL.items(), key=lambda kv: -len(kv[0])):
+        s = re.sub(rf"\b{re.escape(phrase)}\b", f" {sym} ", s, flags=re.IGNORECASE)
+    s = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', s)
+    s = re.sub(r'([a-zA-Z])(\d)', r'\1*\2', s)
+    s = re.sub(r'([a-zA-Z])([a-zA-Z])', r'\1*\2', s)
+    s = re.sub(r'(\d|\w)\s*\(', r'\1*(', s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def check_golden() -> int:
+    with open(GOLDEN_FILE, encoding="utf-8") as f:
+        golden = json.load(f)
+    inputs = [case["input"] for case in golden]
+    expected = [case["output"] for case in golden]
+    for text, want in zip(inputs, expected):
+        for name, fn in (("legacy", normalize_math_text_legacy), ("fused", normalize_math_text)):
+            got = fn(text)
+            if got != want:
+                raise SystemExit(f"{name} mismatch on {text!r}: expected {want!r}, got {got!r}")
+    if normalize_many(inputs) != expected:
+        raise SystemExit("normalize_many does not match the golden outputs")
+    return len(golden)
+
+
+def main(repeat: int = 5, number: int = 100):
+    print(f"golden cases: {check_golden()} ok")
+
+    n_calls = number * len(QUERIES)
+    timings = {
+        "legacy": lambda: [normalize_math_text_legacy(q) for q in QUERIES],
+        "fused": lambda: [normalize_math_text(q) for q in QUERIES],
+        "normalize_many": lambda: normalize_many(QUERIES),
+    }
+    best = {}
+    for name, fn in timings.items():
+        best[name] = min(timeit.repeat(fn, repeat=repeat, number=number))
+        print(f"{name:>15}: {best[name] / n_calls * 1e6:8.2f} µs/text  ({n_calls / best[name]:,.0f} texts/s)")
+
+    print(f"        speedup: {best['legacy'] / best['fused']:.1f}x (batch {best['legacy'] / best['normalize_many']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+bench_startup.py
+----------------
+Cold-start report: time to first answer per subject.
+
+For each subject a fresh interpreter is started with ``-X importtime``. It
+imports the chatbot, answers one question and reports the wall time. The
+report also says whether SymPy was loaded and lists the heaviest imports
+(cumulative microseconds, as printed by ``python -X importtime``).
+
+Run from the Backend directory:
+    python benchmarks/bench_startup.py [--top 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = {
+    "geometry": "area of a circle with radius 5",
+    "statistics": "mean of 1, 2, 3, 4, 5",
+    "algebra": "solve 2*x + 5 = 13",
+    "calculus": "differentiate x**2 + 3*x",
+}
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from chatbot import chatbot_response
+imported = time.perf_counter()
+answer = str(chatbot_response(sys.argv[1]))
+done = time.perf_counter()
+print(json.dumps({"import_s": imported - start, "first_answer_s": done - start,
+                  "sympy_loaded": "sympy" in sys.modules, "answer": answer}))
+"""
+
+
+def _heaviest_imports(importtime_log: str, top: int) -> list:
+    """Top-level imports by cumulative time from ``-X importtime`` output."""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # nesting is shown by extra indentation; one leading space = top level
+        if len(name) - len(name.lstrip()) == 1:
+            rows.append((int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def measure(subject: str, question: str, top: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    with tempfile.TemporaryDirectory() as workdir:  # keep history files out of the tree
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _CHILD, question],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True,
+        )
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    report["subject"] = subject
+    report["heaviest_imports"] = _heaviest_imports(proc.stderr, top)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first answer per subject.")
+    parser.add_argument("--top", type=int, default=5, help="heaviest top-level imports to list")
+    args = parser.parse_args()
+
+    for subject, question in QUESTIONS.items():
+        r = measure(subject, question, args.top)
+        print(f"{subject:>10}: first answer {r['first_answer_s'] * 1000:7.1f} ms "
+              f"(imports {r['import_s'] * 1000:6.1f} ms)  sympy loaded: {r['sympy_loaded']}")
+        for cumulative_us, name in r["heaviest_imports"]:
+            print(f"{'':>12}{cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+corpus.py
+---------
+Representative student queries shared by the benchmark scripts.
+
+QUERIES is the quick list used by the micro-benchmarks. The benchmark suite
+(suite.py) uses the versioned corpus files in corpus/, which also hold direct
+inputs for every solver; results are only compared between runs on the same
+corpus version.
+"""
+
+import json
+import os
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+CORPUS_VERSION = 1
+
+
+def load_corpus(version: int = CORPUS_VERSION) -> dict:
+    """The versioned corpus: {"version", "queries", "solvers": {subject: [{"input", "step_by_step"}]}}."""
+    with open(os.path.join(CORPUS_DIR, f"v{version}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+QUERIES = [
+    "differentiate x^2 + 3x",
+    "Find the derivative of sin(x) * x",
+    "integrate 3x^2 + 2x + 1",
+    "What is the antiderivative of x cubed?",
+    "simplify (x + 2)(x - 2)",
+    "Please expand (x + 1)(x + 3)",
+    "factor x^2 - 9",
+    "Solve 2x + 5 = 13",
+    "solve x squared minus four equals zero, show steps",
+    "area of a circle with radius 5",
+    "What is the perimeter of a circle of radius 3?",
+    "circumference of circle radius 2.5",
+    "volume of a sphere with radius 4",
+    "mean of 1, 2, 3, 4, 5",
+    "average of 10 20 30 40",
+    "median of 3 1 4 1 5 9 2 6",
+    "mode of 1 2 2 3 3 3",
+    "variance of 2 4 4 4 5 5 7 9",
+    "standard deviation of 2 4 4 4 5 5 7 9",
+    "std of 1.5 2.5 3.5",
+    "probability of rolling a six",
+    "combination of 10 and 3",
+    "permutation of 5 and 2",
+    "nCr 52 5",
+    "npr 10 4",
+    "simplify x^2 + 2x + 1 then differentiate",
+    "Differentiate x^3 and then integrate the result",
+    "expand (x + 1)^2, then factor it, after that solve = 0",
+    "Can you explain how to integrate two x plus one?",
+    "compute the mean then the median of 4 8 15 16 23 42",
+]
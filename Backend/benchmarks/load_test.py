@@ -0,0 +1,104 @@
+"""
+load_test.py
+------------
+Load test for chatbot_service over HTTP.
+
+Opens --sessions keep-alive connections that together send --requests
+questions from the shared corpus, then reports requests/s and p50/p95/p99
+latency. Start the service first:
+
+    python chatbot_service.py --port 8000
+    python benchmarks/load_test.py --port 8000 --sessions 50 --requests 2000
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import QUERIES  # noqa: E402
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def _ask(reader, writer, host: str, question: str) -> int:
+    body = json.dumps({"question": question}).encode("utf-8")
+    writer.write(
+        f"POST /ask HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _session(host, port, questions, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for question in questions:
+            start = time.perf_counter()
+            status = await _ask(reader, writer, host, question)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(host: str, port: int, sessions: int, requests: int) -> dict:
+    questions = list(itertools.islice(itertools.cycle(QUERIES), requests))
+    per_session = [questions[i::sessions] for i in range(sessions)]
+    latencies, statuses = [], {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_session(host, port, qs, latencies, statuses) for qs in per_session if qs))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "sessions": sessions,
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the AI Math Tutor HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.host, args.port, args.sessions, args.requests))
+    print(f"{report['requests']} requests over {report['sessions']} sessions in {report['seconds']:.2f}s")
+    print(f"  throughput: {report['rps']:.1f} req/s")
+    print(f"  latency   : p50 {report['p50_ms']:.1f} ms | p95 {report['p95_ms']:.1f} ms | p99 {report['p99_ms']:.1f} ms")
+    print(f"  statuses  : {report['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+suite.py
+--------
+Benchmark suite over the versioned query corpus (corpus/v<N>.json), with a
+regression gate.
+
+Targets:
+    normalize    nlp_preprocessor.normalize_math_text on every corpus query
+    parse        nlp_parser.parse_user_input on every corpus query
+    algebra      Solvers.algebra_solver.solve_algebra on the corpus algebra inputs
+    calculus     Solvers.calculus_solver.solve_calculus on the corpus calculus inputs
+    geometry     Solvers.geometry_solver.solve_geometry on the corpus geometry inputs
+    statistics   Solvers.stats_solver.solve_statistics on the corpus statistics inputs
+    chatbot      chatbot.chatbot_response end to end (single-step and pipelines)
+
+The parse, fingerprint, derivative, result and pipeline caches are cleared
+before every pass, and the time budget workers (which keep SymPy's and the
+parse cache inside them) are replaced by freshly started ones, so each pass
+measures cold solves rather than cache hits. Worker start-up itself is not
+timed.
+Each call is timed on its own; peak memory comes from one extra pass under tracemalloc (kept separate
+because tracing slows everything down).
+
+Run from the Backend directory:
+    python benchmarks/suite.py --save results.json
+    python benchmarks/suite.py --baseline results.json --threshold 0.15
+
+With --baseline, the run exits with status 1 when any target's --metric got
+worse than the baseline by more than --threshold (a fraction). Results are
+only compared when both runs used the same corpus version.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import CORPUS_VERSION, load_corpus  # noqa: E402
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "ops_per_sec")
+HIGHER_IS_BETTER = {"ops_per_sec"}
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def _reset_caches() -> None:
+    from fingerprint import clear_fingerprint_cache
+    from pipeline_executor import clear_memo
+    from result_cache import get_result_cache
+    from Solvers.derivatives import clear_derivative_cache
+    from Solvers.expression_parser import clear_parse_cache
+    from time_budget import restart_workers
+
+    clear_parse_cache()
+    clear_derivative_cache()
+    clear_fingerprint_cache()
+    get_result_cache().clear()
+    clear_memo()
+    restart_workers()
+
+
+# ------------------------------------------------------------------ targets
+# Each builder returns a list of zero-argument callables, one per corpus item.
+
+def _normalize_calls(corpus: dict) -> list:
+    from nlp_preprocessor import normalize_math_text
+    return [lambda q=q: normalize_math_text(q) for q in corpus["queries"]]
+
+
+def _parse_calls(corpus: dict) -> list:
+    from nlp_parser import parse_user_input
+    return [lambda q=q: parse_user_input(q) for q in corpus["queries"]]
+
+
+def _algebra_calls(corpus: dict) -> list:
+    from Solvers.algebra_solver import solve_algebra
+    return [lambda c=c: solve_algebra(c["input"], c.get("step_by_step", False))
+            for c in corpus["solvers"]["algebra"]]
+
+
+def _calculus_calls(corpus: dict) -> list:
+    from Solvers.calculus_solver import solve_calculus
+    return [lambda c=c: solve_calculus(c["input"], c.get("step_by_step", False))
+            for c in corpus["solvers"]["calculus"]]
+
+
+def _dict_solver_calls(solver, cases: list) -> list:
+    return [lambda c=c: solver({"expression": c["input"], "step_by_step": c.get("step_by_step", False)})
+            for c in cases]
+
+
+def _geometry_calls(corpus: dict) -> list:
+    from Solvers.geometry_solver import solve_geometry
+    return _dict_solver_calls(solve_geometry, corpus["solvers"]["geometry"])
+
+
+def _statistics_calls(corpus: dict) -> list:
+    from Solvers.stats_solver import solve_statistics
+    return _dict_solver_calls(solve_statistics, corpus["solvers"]["statistics"])
+
+
+def _chatbot_calls(corpus: dict) -> list:
+    from chatbot import chatbot_response
+    return [lambda q=q: chatbot_response(q) for q in corpus["queries"]]
+
+
+TARGETS = {
+    "normalize": _normalize_calls,
+    "parse": _parse_calls,
+    "algebra": _algebra_calls,
+    "calculus": _calculus_calls,
+    "geometry": _geometry_calls,
+    "statistics": _statistics_calls,
+    "chatbot": _chatbot_calls,
+}
+
+
+def check_coverage(corpus: dict) -> None:
+    """The corpus must exercise every subject in OP_KEYWORDS, solver inputs for each, and pipelines."""
+    from nlp_parser import OP_KEYWORDS, parse_user_input
+
+    # operations any subject can ask for ("evaluate") have no subject of their own
+    subjects = {subject for subject, _ in OP_KEYWORDS.values() if subject}
+    seen, pipelines = set(), 0
+    for query in corpus["queries"]:
+        parsed = parse_user_input(query)
+        if isinstance(parsed.get("pipeline"), list):
+            pipelines += 1
+            seen.update(step.get("subject") for step in parsed["pipeline"])
+        else:
+            seen.add(parsed.get("subject"))
+    missing = sorted(subjects - seen)
+    if missing:
+        raise SystemExit(f"corpus v{corpus['version']} has no queries for: {', '.join(missing)}")
+    missing = sorted(subjects - set(corpus["solvers"]))
+    if missing:
+        raise SystemExit(f"corpus v{corpus['version']} has no solver inputs for: {', '.join(missing)}")
+    if not pipelines:
+        raise SystemExit(f"corpus v{corpus['version']} has no multi-step queries")
+
+
+# ------------------------------------------------------------------ running
+
+def measure(calls: list, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        _reset_caches()
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - start)
+
+    _reset_caches()
+    tracemalloc.start()
+    try:
+        for call in calls:
+            call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        "calls": len(samples),
+        "ops_per_sec": len(samples) / total if total else 0.0,
+        "mean_ms": 1000 * statistics.fmean(samples),
+        "p50_ms": 1000 * percentile(samples, 50),
+        "p95_ms": 1000 * percentile(samples, 95),
+        "p99_ms": 1000 * percentile(samples, 99),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_suite(corpus: dict, targets: list, repeat: int) -> dict:
+    results = {}
+    for name in targets:
+        calls = TARGETS[name](corpus)
+        for call in calls:  # warm-up: imports, compiled regexes, lazily built tables
+            call()
+        results[name] = measure(calls, repeat)
+        r = results[name]
+        print(f"{name:<11} {r['calls']:>5} calls  {r['ops_per_sec']:>10.1f} ops/s  "
+              f"p50 {r['p50_ms']:8.3f} ms  p95 {r['p95_ms']:8.3f} ms  p99 {r['p99_ms']:8.3f} ms  "
+              f"peak {r['peak_kib']:9.1f} KiB")
+    return results
+
+
+def compare(results: dict, baseline: dict, metric: str, threshold: float) -> list:
+    """Names of targets whose metric regressed by more than threshold against the baseline."""
+    regressions = []
+    print(f"\nagainst baseline ({metric}, threshold {threshold:.0%}):")
+    for name, current in results.items():
+        base = baseline["results"].get(name)
+        if not base or not base.get(metric):
+            print(f"  {name:<11} no baseline")
+            continue
+        change = current[metric] / base[metric] - 1
+        worse = -change if metric in HIGHER_IS_BETTER else change
+        flag = "REGRESSION" if worse > threshold else "ok"
+        print(f"  {name:<11} {base[metric]:10.3f} -> {current[metric]:10.3f}  ({change:+.1%})  {flag}")
+        if worse > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=int, default=CORPUS_VERSION, help="corpus version to run")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="comma-separated targets")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per target")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved by an earlier run")
+    parser.add_argument("--metric", choices=METRICS, default="p50_ms", help="metric the gate compares")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed relative slowdown before the gate fails (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = [t for t in targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(unknown)}")
+
+    corpus = load_corpus(args.corpus)
+    check_coverage(corpus)
+    save = os.path.abspath(args.save) if args.save else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("corpus_version") != corpus["version"]:
+            raise SystemExit(f"baseline used corpus v{baseline.get('corpus_version')}, "
+                             f"this run uses v{corpus['version']}; results are not comparable")
+
+    # chatbot_response records history in the working directory; keep it out of the tree
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        results = run_suite(corpus, targets, args.repeat)
+        from user_history import flush_history
+        flush_history()
+
+    report = {
+        "corpus_version": corpus["version"],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if save:
+        with open(save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nresults written to {save}")
+
+    if baseline is not None and compare(results, baseline, args.metric, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
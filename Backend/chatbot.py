@@ -1,7 +1,10 @@
+import asyncio
+
+from instrumentation import labels_for, request, stage
 from nlp_parser import parse_user_input
-from math_engine import route_problem
+from math_engine import route_math_problem, stream_math_problem
 from user_history import save_user_query
-d
+
 
 def chatbot_response(user_input):
     """
@@ -18,14 +21,54 @@ def chatbot_response(user_input):
         The chatbot's answer.
     """
 
-    parsed = parse_user_input(user_input)
+    with request(user_input) as timer:
+        with stage("parse") as parse_timer:
+            parsed = parse_user_input(user_input)
+            labels = labels_for(parsed)
+            parse_timer.labels(*labels)
+        timer.labels(*labels)
 
-    save_user_query(user_input, parsed)
+        with stage("history", *labels):
+            save_user_query(user_input, parsed)
 
-    result = route_problem(parsed)
+        # routing time includes the solver stage recorded inside math_engine
+        with stage("routing", *labels):
+            result = route_math_problem(parsed)
 
     return result
 
+
+def stream_chatbot_response(user_input):
+    """
+    Streaming variant of chatbot_response: yields the answer in pieces
+    (one explanation step or pipeline step at a time) as soon as each is ready.
+    """
+
+    with stage("parse") as parse_timer:
+        parsed = parse_user_input(user_input)
+        labels = labels_for(parsed)
+        parse_timer.labels(*labels)
+
+    with stage("history", *labels):
+        save_user_query(user_input, parsed)
+
+    yield from stream_math_problem(parsed)
+
+
+async def astream_chatbot_response(user_input):
+    """
+    Async iterator over stream_chatbot_response. Each step is computed in a
+    worker thread so the event loop stays free between steps.
+    """
+    loop = asyncio.get_running_loop()
+    steps = stream_chatbot_response(user_input)
+    done = object()
+    while True:
+        step = await loop.run_in_executor(None, next, steps, done)
+        if step is done:
+            break
+        yield step
+
 if __name__ == "__main__":
     print("🤖 AI Math Tutor is ready! Type 'quit' to exit.")
     while True:
@@ -0,0 +1,260 @@
+"""
+chatbot_service.py
+------------------
+Asyncio service that lets many students talk to the tutor at once.
+
+Two transports share one request path:
+  * HTTP/1.1 with keep-alive:  POST /ask {"question": "..."} → {"answer": "..."}
+                               GET /health → service counters
+                               GET /metrics, /metrics.json → stage latencies
+  * a line-based local socket: one question per line in, one JSON line out
+
+Parsing and solving run in a bounded executor pool. When every worker is busy
+and the waiting line is full, new requests are rejected straight away (HTTP
+503 / {"error": "busy"}) instead of queueing without limit. A question that
+makes chatbot_response raise is logged and answered with HTTP 500 /
+{"error": "internal error"}; the session stays open.
+
+Run from the Backend directory:
+    python chatbot_service.py --port 8000
+    python chatbot_service.py --unix /tmp/math_tutor.sock
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from chatbot import chatbot_response
+from instrumentation import configure_profiler, enable_metrics, metrics_snapshot, prometheus_text
+from user_history import start_history
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 64 * 1024
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class ServiceBusy(Exception):
+    """Raised when the waiting line is full."""
+
+
+class ChatbotService:
+    """
+    Bounded-concurrency front end for chatbot_response.
+
+    Parameters:
+        max_concurrency (int): Questions solved at the same time (executor size).
+        max_pending (int): Questions allowed to wait for a free worker; beyond
+            this, requests are rejected as busy.
+        executor (Executor or None): Pool to run chatbot_response in; defaults to
+            a ThreadPoolExecutor of max_concurrency threads. Heavy SymPy
+            operations already run in killable processes (see time_budget).
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_pending: int = 64, executor=None):
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_concurrency,
+                                                        thread_name_prefix="tutor-solve")
+        self._slots = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.served = 0
+        self.rejected = 0
+        self.sessions = 0
+
+    async def answer(self, question: str) -> str:
+        """Solve one question off the event loop, respecting the concurrency bounds."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self._slots.locked() and self.waiting >= self.max_pending:
+            self.rejected += 1
+            raise ServiceBusy()
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, chatbot_response, question)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+        self.served += 1
+        return str(result)
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "waiting": self.waiting, "served": self.served,
+                "rejected": self.rejected, "sessions": self.sessions,
+                "max_concurrency": self.max_concurrency, "max_pending": self.max_pending}
+
+    # ------------------------------------------------------------------ HTTP
+
+    async def _handle_request(self, method: str, path: str, body: bytes):
+        if path in ("/metrics", "/metrics.json"):
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, prometheus_text() if path == "/metrics" else metrics_snapshot()
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, {"status": "ok", **self.stats()}
+        if path != "/ask":
+            return 404, {"error": "not found"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            question = json.loads(body or b"{}").get("question")
+        except (ValueError, AttributeError):
+            question = None
+        if not isinstance(question, str) or not question.strip():
+            return 400, {"error": "expected a JSON body like {\"question\": \"...\"}"}
+        try:
+            return 200, {"answer": await self.answer(question)}
+        except ServiceBusy:
+            return 503, {"error": "busy"}
+        except Exception:
+            logger.exception("chatbot_response failed for %r", question)
+            return 500, {"error": "internal error"}
+
+    async def handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """One HTTP connection (a student session); serves requests until closed."""
+        self.sessions += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._write_http(writer, 400, {"error": "bad request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version.upper() != "HTTP/1.0")
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._write_http(writer, 400, {"error": "bad Content-Length"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._write_http(writer, 413, {"error": "body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self._handle_request(method.upper(), path.split("?")[0], body)
+                extra = {"Retry-After": "1"} if status == 503 else None
+                await self._write_http(writer, status, payload, keep_alive, extra)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    @staticmethod
+    async def _write_http(writer, status, payload, keep_alive, extra_headers=None):
+        if isinstance(payload, str):  # Prometheus text
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        headers = [
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        headers += [f"{k}: {v}" for k, v in (extra_headers or {}).items()]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # ----------------------------------------------------------- line socket
+
+    async def handle_lines(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """One line-protocol session: a question per line, a JSON answer per line."""
+        self.sessions += 1
+        try:
+            async for line in reader:
+                question = line.decode("utf-8").strip()
+                if not question:
+                    continue
+                try:
+                    reply = {"answer": await self.answer(question)}
+                except ServiceBusy:
+                    reply = {"error": "busy"}
+                except Exception:
+                    logger.exception("chatbot_response failed for %r", question)
+                    reply = {"error": "internal error"}
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8000, unix_path: str = None,
+                max_concurrency: int = 4, max_pending: int = 64):
+    service = ChatbotService(max_concurrency=max_concurrency, max_pending=max_pending)
+    start_history()
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle_lines, path=unix_path)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(service.handle_http, host=host, port=port)
+        where = f"http://{host}:{port}"
+    print(f"🤖 AI Math Tutor service listening on {where}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the AI Math Tutor to concurrent sessions.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", dest="unix_path", help="serve the line protocol on this socket path")
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--metrics", action="store_true", help="record per-stage latency histograms")
+    parser.add_argument("--profile-slow", type=float, metavar="SECONDS",
+                        help="dump cProfile stats for requests slower than this")
+    parser.add_argument("--profile-sample", type=float, default=0.1, metavar="RATE",
+                        help="fraction of requests to profile when --profile-slow is set")
+    args = parser.parse_args()
+    if args.metrics:
+        enable_metrics()
+    if args.profile_slow is not None:
+        configure_profiler(args.profile_slow, args.profile_sample)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_path, args.max_concurrency, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
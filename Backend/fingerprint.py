@@ -0,0 +1,80 @@
+"""
+fingerprint.py
+--------------
+Canonical fingerprints of expression strings, used as cache keys.
+
+Students write the same expression many ways ("2x+1", "1 + 2*x", "x*2 + 1").
+All of them parse to the same SymPy expression, because Add and Mul sort
+their arguments into one canonical order, so the srepr of the parse does not
+depend on term order, spacing or how a product was written. The fingerprint
+is a short BLAKE2 digest of that srepr; unlike hash() it is stable across
+processes, so it also works as a key in the SQLite result tier.
+
+Equations are fingerprinted side by side. The parse goes through the shared
+cache in Solvers.expression_parser, so the solver that runs next gets it for
+free. Text that does not parse as an expression falls back to its
+whitespace-collapsed form, which is what cache keys used before.
+
+Parsing evaluates: "7**12345678" or "factorial(3000000)" would take
+seconds to minutes, and key computation runs in the request thread, outside
+any time budget. So a side is only parsed once its Python syntax tree has
+passed a cheap bounds check (Solvers.expression_parser.check_bounded): few
+enough nodes, shallow enough, and every numeric subexpression provably
+small. Anything else is keyed on its text.
+
+Fingerprints are memoized on the input string.
+"""
+
+from functools import lru_cache
+import hashlib
+
+CACHE_SIZE = 4096
+MAX_CHARS = 500
+
+
+def _canonical_form(text: str) -> str:
+    from sympy import srepr
+    from Solvers.expression_parser import check_bounded, parse_expression
+
+    sides = text.split("=")
+    if len(sides) > 2:
+        raise ValueError("more than one '='")
+    for side in sides:
+        if side.strip():
+            check_bounded(side)
+    return " = ".join(srepr(parse_expression(side)) if side.strip() else "" for side in sides)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _fingerprint(text: str) -> str:
+    if len(text) <= MAX_CHARS:
+        from nlp_preprocessor import normalize_operand
+
+        # raw text first; the normalized form covers "2x" and "(x+1)(x-1)"
+        for candidate in (text, normalize_operand(text)):
+            try:
+                form = _canonical_form(candidate)
+            except Exception:
+                continue
+            return "expr:" + hashlib.blake2b(form.encode("utf-8"), digest_size=16).hexdigest()
+    return "text:" + text
+
+
+def fingerprint(expression: str) -> str:
+    """
+    Stable fingerprint of an expression: equal for "2x+1", "1 + 2*x" and
+    "x*2+1". Text that is not an expression gets "text:" plus its
+    whitespace-collapsed self.
+    """
+    return _fingerprint(" ".join((expression or "").split()))
+
+
+def fingerprint_stats() -> dict:
+    info = _fingerprint.cache_info()
+    lookups = info.hits + info.misses
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0}
+
+
+def clear_fingerprint_cache() -> None:
+    _fingerprint.cache_clear()
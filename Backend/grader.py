@@ -0,0 +1,268 @@
+"""
+grader.py
+---------
+Checks whether a student's answer is equivalent to the expected answer
+(e.g. the "answer" of question_generator.generate_question).
+
+Each comparison takes the cheapest path that can decide it:
+  1. exact     – identical text after removing whitespace, expressions that
+                 SymPy's automatic canonical form already makes equal, or a
+                 decimal answer that matches the expected one at its number of
+                 decimal places
+  2. numeric   – both expressions are compiled once with lambdify and
+                 evaluated at a few fixed random complex points
+  3. symbolic  – simplify(a - b) == 0, only when the numeric test is
+                 inconclusive (NaN/inf, or an expression that can't be compiled),
+                 run under the "simplify" time budget
+
+Answers ending in "+ C" are compared up to a constant. Comma-separated answers
+("2, -3") are compared as unordered lists.
+
+Parsing runs in the request thread and SymPy evaluates as it parses, so each
+answer's transformed code must pass Solvers.expression_parser.check_bounded
+first: "9^9^9" or "factorial(10**7)" is reported unparseable rather than
+computed.
+"""
+
+from functools import lru_cache
+import re
+import threading
+import time
+
+from time_budget import TimedOutResult, run_with_budget
+
+SAMPLE_POINTS = 6
+REL_TOL = 1e-8
+ABS_TOL = 1e-10
+
+_CONSTANT_RE = re.compile(r"\+\s*C\s*$")
+_DECIMAL_RE = re.compile(r"^\s*-?\d+\.(\d+)\s*$")
+# parse_expr evaluates its input, so only plain math text gets that far
+_SAFE_RE = re.compile(r"^[\w\s+\-*/^().]*$")
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def _record(path: str, seconds: float) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(path, {"count": 0, "total_s": 0.0})
+        entry["count"] += 1
+        entry["total_s"] += seconds
+
+
+def grader_stats() -> dict:
+    """Per-path counts and timings: {path: {"count", "total_s", "mean_ms"}}."""
+    with _stats_lock:
+        return {path: {**entry, "mean_ms": 1000 * entry["total_s"] / entry["count"]}
+                for path, entry in _stats.items()}
+
+
+def reset_grader_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _compact(text: str) -> str:
+    return "".join(text.split())
+
+
+def _split_answers(text: str) -> list:
+    """Split on commas that are not inside brackets."""
+    parts, depth, current = [], 0, []
+    for ch in text:
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+@lru_cache(maxsize=1)
+def _sympy_namespace() -> dict:
+    namespace = {}
+    exec("from sympy import *", namespace)
+    return namespace
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str):
+    """
+    Student-friendly parsing: 3x, x^2 and 2(x+1) are all accepted. Raises
+    UnboundedExpression for answers too large to evaluate safely.
+    """
+    from sympy.parsing.sympy_parser import (
+        convert_xor, eval_expr, implicit_multiplication_application, standard_transformations, stringify_expr,
+    )
+    from Solvers.expression_parser import check_bounded
+
+    transformations = standard_transformations + (implicit_multiplication_application, convert_xor)
+    namespace = _sympy_namespace()
+    code = stringify_expr(text, {}, namespace, transformations)
+    check_bounded(code)
+    return eval_expr(code, {}, namespace)
+
+
+@lru_cache(maxsize=4096)
+def _compiled(text: str, names: tuple):
+    from sympy import lambdify, symbols
+
+    return lambdify(symbols(names) if names else (), _parse(text), modules="numpy")
+
+
+@lru_cache(maxsize=16)
+def _sample_points(n_vars: int):
+    """Fixed pseudo-random points with positive real part, so log and sqrt stay defined."""
+    import numpy as np
+
+    rng = np.random.default_rng(20240601 + n_vars)
+    radius = rng.uniform(0.5, 2.0, (n_vars, SAMPLE_POINTS))
+    angle = rng.uniform(-0.6, 0.6, (n_vars, SAMPLE_POINTS))
+    return radius * np.exp(1j * angle)
+
+
+def _numeric_equal(a: str, b: str, names: tuple, up_to_constant: bool):
+    """True/False when the sample points decide it, None when inconclusive."""
+    import numpy as np
+
+    try:
+        points = _sample_points(len(names))
+        with np.errstate(all="ignore"):
+            va = np.broadcast_to(np.asarray(_compiled(a, names)(*points), dtype=complex), (SAMPLE_POINTS,))
+            vb = np.broadcast_to(np.asarray(_compiled(b, names)(*points), dtype=complex), (SAMPLE_POINTS,))
+            diff = va - vb
+    except Exception:
+        return None
+    if not np.all(np.isfinite(diff)):
+        return None
+    if up_to_constant:
+        diff = diff - diff[0]
+    scale = np.maximum(np.abs(va), np.abs(vb))
+    return bool(np.all(np.abs(diff) <= ABS_TOL + REL_TOL * scale))
+
+
+def _symbolic_equal(a, b, up_to_constant: bool) -> bool:
+    from sympy import simplify
+
+    difference = simplify(a - b)
+    if up_to_constant:
+        return not difference.free_symbols
+    return difference == 0
+
+
+def _decimal_match(student: str, expected: str):
+    """A decimal expected answer accepts any value that rounds to it."""
+    m = _DECIMAL_RE.match(expected)
+    if not m:
+        return None
+    try:
+        return round(float(student), len(m.group(1))) == float(expected)
+    except ValueError:
+        return None
+
+
+def _equivalent(student: str, expected: str, up_to_constant: bool):
+    """Returns (correct, path) for one pair of single answers."""
+    if _compact(student) == _compact(expected):
+        return True, "exact"
+    decimal = _decimal_match(student, expected)
+    if decimal is not None:
+        return decimal, "exact"
+
+    try:
+        if "__" in student or not _SAFE_RE.match(student):
+            raise ValueError("unsupported characters")
+        a, b = _parse(student), _parse(expected)
+    except Exception:
+        return False, "unparseable"
+    # SymPy's automatic canonical form already settles reordered terms
+    difference = a - b
+    if difference == 0 or (up_to_constant and not difference.free_symbols):
+        return True, "exact"
+    names = tuple(sorted(str(s) for s in a.free_symbols | b.free_symbols))
+
+    numeric = _numeric_equal(student, expected, names, up_to_constant)
+    if numeric is not None:
+        return numeric, "numeric"
+
+    result = run_with_budget(_symbolic_equal, (a, b, up_to_constant), "simplify")
+    if isinstance(result, TimedOutResult):
+        return None, "symbolic_timeout"
+    return result, "symbolic"
+
+
+def grade_answer(student: str, expected: str) -> dict:
+    """
+    Grade one answer.
+
+    Parameters:
+        student (str): The student's answer, e.g. "6x^2 + 2".
+        expected (str): The reference answer, e.g. "6*x**2 + 2".
+
+    Returns:
+        dict: {"correct": True/False, or None if undecided, "path": how it
+        was decided, "seconds": time spent}
+    """
+    start = time.perf_counter()
+    student, expected = (student or "").strip(), (expected or "").strip()
+    up_to_constant = bool(_CONSTANT_RE.search(expected))
+    if up_to_constant:
+        student, expected = _CONSTANT_RE.sub("", student), _CONSTANT_RE.sub("", expected)
+
+    expected_parts, student_parts = _split_answers(expected), _split_answers(student)
+    if not student_parts:
+        correct, path = False, "empty"
+    elif len(expected_parts) > 1 or len(student_parts) > 1:
+        correct, path = _match_lists(student_parts, expected_parts, up_to_constant)
+    else:
+        correct, path = _equivalent(student_parts[0], expected_parts[0], up_to_constant)
+
+    seconds = time.perf_counter() - start
+    _record(path, seconds)
+    return {"correct": correct, "path": path, "seconds": seconds}
+
+
+def _match_lists(student: list, expected: list, up_to_constant: bool):
+    """Unordered list comparison; the slowest path used names the result."""
+    if len(student) != len(expected):
+        return False, "exact"
+    order = ("exact", "numeric", "symbolic", "unparseable", "symbolic_timeout")
+    remaining = list(student)
+    slowest = "exact"
+    for item in expected:
+        for i, candidate in enumerate(remaining):
+            correct, path = _equivalent(candidate, item, up_to_constant)
+            slowest = max(slowest, path, key=order.index)
+            if correct:
+                del remaining[i]
+                break
+        else:
+            return False, slowest
+    return True, slowest
+
+
+def grade_batch(submissions) -> list:
+    """
+    Grade many answers, e.g. a whole class's submissions for a worksheet.
+
+    Parameters:
+        submissions (iterable): (student, expected) pairs or dicts with
+            "answer" and "expected" keys.
+
+    Returns:
+        list: One grade_answer result per submission, in input order.
+    """
+    results = []
+    for item in submissions:
+        if isinstance(item, dict):
+            student, expected = item.get("answer", ""), item.get("expected", "")
+        else:
+            student, expected = item
+        results.append(grade_answer(student, expected))
+    return results
@@ -0,0 +1,237 @@
+"""
+history_store.py
+----------------
+Indexed SQLite storage for user history.
+
+Entries keep the same shape as the JSON lines in history.txt
+({"timestamp", "raw_input", "parsed"}). Subject and operation of every
+step (single problems have one, pipelines several) go into an indexed side
+table. Range, subject and operation queries and "last N" lookups therefore
+never scan the whole history, and results are streamed from a cursor
+instead of being built up as one list.
+
+One-shot migration from the old JSONL file:
+    python history_store.py migrate history.txt [history.db]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import datetime
+
+HISTORY_DB = "history.db"
+
+# HistoryWriter durability policy → SQLite synchronous mode
+_SYNCHRONOUS = {"none": "OFF", "flush": "NORMAL", "fsync": "FULL"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id        INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    raw_input TEXT,
+    parsed    TEXT
+);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp);
+CREATE TABLE IF NOT EXISTS history_ops (
+    entry_id  INTEGER NOT NULL REFERENCES history (id),
+    subject   TEXT,
+    operation TEXT
+);
+CREATE INDEX IF NOT EXISTS history_ops_subject ON history_ops (subject, operation, entry_id);
+CREATE INDEX IF NOT EXISTS history_ops_operation ON history_ops (operation, entry_id);
+CREATE TABLE IF NOT EXISTS migrations (
+    source      TEXT PRIMARY KEY,
+    entries     INTEGER NOT NULL,
+    migrated_at TEXT NOT NULL
+);
+"""
+
+
+def entry_steps(parsed) -> list:
+    """(subject, operation) pairs for a parsed query, one per pipeline step."""
+    if not isinstance(parsed, dict):
+        return []
+    steps = parsed["pipeline"] if isinstance(parsed.get("pipeline"), list) else [parsed]
+    return [(s.get("subject"), s.get("operation")) for s in steps if isinstance(s, dict)]
+
+
+def _as_timestamp(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class HistoryStore:
+    """
+    SQLite history backend, usable as a HistoryWriter sink.
+
+    Parameters:
+        path (str): Database file.
+        durability (str): "none", "flush" or "fsync" (mapped to PRAGMA synchronous).
+    """
+
+    def __init__(self, path: str = HISTORY_DB, durability: str = "flush"):
+        if durability not in _SYNCHRONOUS:
+            raise ValueError(f"durability must be one of {tuple(_SYNCHRONOUS)}")
+        self.path = path
+        self.durability = durability
+        self._write_conn = None
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute(f"PRAGMA synchronous={_SYNCHRONOUS[self.durability]}")
+        return conn
+
+    # ------------------------------------------------------------ sink API
+
+    @staticmethod
+    def prepare(entry: dict) -> tuple:
+        """Turn an entry into a row while the caller still owns it."""
+        parsed = entry.get("parsed")
+        return (entry.get("timestamp"), entry.get("raw_input"), json.dumps(parsed), entry_steps(parsed))
+
+    def write_batch(self, rows: list, force: bool = False) -> None:
+        """Insert prepared rows in one transaction."""
+        if self._write_conn is None:
+            self._write_conn = self._connect()
+        with self._write_conn as conn:
+            self._insert(conn, rows)
+
+    def flush(self) -> None:
+        """Rows are committed per batch; nothing is buffered here."""
+
+    def close(self) -> None:
+        if self._write_conn is not None:
+            self._write_conn.close()
+            self._write_conn = None
+
+    @staticmethod
+    def _insert(conn, rows) -> None:
+        for timestamp, raw_input, parsed_json, steps in rows:
+            cur = conn.execute(
+                "INSERT INTO history (timestamp, raw_input, parsed) VALUES (?, ?, ?)",
+                (timestamp, raw_input, parsed_json),
+            )
+            if steps:
+                conn.executemany(
+                    "INSERT INTO history_ops (entry_id, subject, operation) VALUES (?, ?, ?)",
+                    [(cur.lastrowid, subject, operation) for subject, operation in steps],
+                )
+
+    # -------------------------------------------------------------- queries
+
+    @staticmethod
+    def _where(start, end, subject, operation):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("h.timestamp >= ?")
+            params.append(_as_timestamp(start))
+        if end is not None:
+            clauses.append("h.timestamp < ?")
+            params.append(_as_timestamp(end))
+        if subject is not None or operation is not None:
+            op_clauses = ["o.entry_id = h.id"]
+            if subject is not None:
+                op_clauses.append("o.subject = ?")
+                params.append(subject)
+            if operation is not None:
+                op_clauses.append("o.operation = ?")
+                params.append(operation)
+            clauses.append(f"EXISTS (SELECT 1 FROM history_ops o WHERE {' AND '.join(op_clauses)})")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def iter_entries(self, start=None, end=None, subject: str = None, operation: str = None,
+                     newest_first: bool = False, limit: int = None, batch_size: int = 500):
+        """
+        Stream entries matching the filters, oldest first by default.
+
+        Parameters:
+            start, end (str or datetime or None): Timestamp range [start, end).
+            subject, operation (str or None): Match if any step has this subject/operation.
+            newest_first (bool): Reverse the order.
+            limit (int or None): Stop after this many entries.
+        """
+        where, params = self._where(start, end, subject, operation)
+        sql = f"SELECT h.timestamp, h.raw_input, h.parsed FROM history h{where} ORDER BY h.id"
+        sql += " DESC" if newest_first else ""
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        conn = self._connect()
+        try:
+            cur = conn.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for timestamp, raw_input, parsed in rows:
+                    yield {"timestamp": timestamp, "raw_input": raw_input,
+                           "parsed": json.loads(parsed) if parsed is not None else None}
+        finally:
+            conn.close()
+
+    def last(self, n: int, **filters) -> list:
+        """The n most recent matching entries, in chronological order."""
+        entries = list(self.iter_entries(newest_first=True, limit=n, **filters))
+        entries.reverse()
+        return entries
+
+    def count(self, start=None, end=None, subject: str = None, operation: str = None) -> int:
+        where, params = self._where(start, end, subject, operation)
+        with closing(self._connect()) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM history h{where}", params).fetchone()[0]
+
+    # ------------------------------------------------------------ migration
+
+    def migrate_jsonl(self, jsonl_path: str, batch_size: int = 5000) -> int:
+        """
+        Import a history.txt-style JSONL file (and its rotated .N backups,
+        oldest first) once. Returns the number of imported entries; a source
+        that was already migrated is skipped and 0 is returned.
+        """
+        source = os.path.abspath(jsonl_path)
+        backups = []
+        i = 1
+        while os.path.exists(f"{jsonl_path}.{i}"):
+            backups.append(f"{jsonl_path}.{i}")
+            i += 1
+        files = list(reversed(backups)) + ([jsonl_path] if os.path.exists(jsonl_path) else [])
+
+        with closing(self._connect()) as conn, conn:
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+                return 0
+            imported = 0
+            batch = []
+            for path in files:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue  # skip a torn or corrupt line
+                        batch.append(self.prepare(entry))
+                        if len(batch) >= batch_size:
+                            self._insert(conn, batch)
+                            imported += len(batch)
+                            batch = []
+            self._insert(conn, batch)
+            imported += len(batch)
+            conn.execute(
+                "INSERT INTO migrations (source, entries, migrated_at) VALUES (?, ?, ?)",
+                (source, imported, datetime.now().isoformat()),
+            )
+        return imported
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "migrate":
+        print("usage: python history_store.py migrate <history.txt> [history.db]")
+        sys.exit(2)
+    store = HistoryStore(sys.argv[3] if len(sys.argv) > 3 else HISTORY_DB)
+    print(f"Imported {store.migrate_jsonl(sys.argv[2])} entries into {store.path}")
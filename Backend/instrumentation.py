@@ -0,0 +1,259 @@
+"""
+instrumentation.py
+------------------
+Per-stage latency metrics for the chatbot pipeline.
+
+Stages (parse, normalize, history, routing, solver, request) are timed into
+in-process histograms labelled by subject and operation, and can be exported
+as Prometheus text or as a JSON snapshot. An opt-in profiler hook runs
+cProfile on a sample of requests and dumps the stats of those slower than a
+threshold.
+
+Everything is off by default. While disabled, stage() hands back one shared
+no-op context manager, so the instrumented code pays about one function call
+per stage. Turn it on with enable_metrics() or MATH_TUTOR_METRICS=1.
+"""
+
+from bisect import bisect_left
+from collections import deque
+import cProfile
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# upper bounds in seconds; an implicit +Inf bucket follows
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_NAME = "math_tutor_stage_seconds"
+
+_enabled = os.environ.get("MATH_TUTOR_METRICS", "").lower() in ("1", "true", "yes")
+_histograms = {}
+_lock = threading.Lock()
+
+_profile = {"sample_rate": 0.0, "threshold": None, "directory": None}
+slow_profiles = deque(maxlen=100)  # paths of the latest dumped profiles, oldest first
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self) -> list:
+        total, out = 0, []
+        for c in self.counts:
+            total += c
+            out.append(total)
+        return out
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound that covers fraction q of observations."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, cumulative in zip(BUCKETS + (float("inf"),), self.cumulative()):
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+
+def observe(stage_name: str, seconds: float, subject=None, operation=None) -> None:
+    key = (stage_name, subject or "", operation or "")
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = Histogram()
+        hist.observe(seconds)
+
+
+class _Timer:
+    """Times one stage; labels can be filled in once they are known (e.g. after parsing)."""
+
+    __slots__ = ("stage", "subject", "operation", "start")
+
+    def __init__(self, stage_name, subject, operation):
+        self.stage = stage_name
+        self.subject = subject
+        self.operation = operation
+
+    def labels(self, subject=None, operation=None) -> None:
+        self.subject = subject
+        self.operation = operation
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start, self.subject, self.operation)
+        return False
+
+
+class _NoOpTimer:
+    __slots__ = ()
+
+    def labels(self, subject=None, operation=None) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoOpTimer()
+
+
+def stage(stage_name: str, subject=None, operation=None):
+    """Context manager timing one pipeline stage (a shared no-op while disabled)."""
+    if not _enabled:
+        return _NOOP
+    return _Timer(stage_name, subject, operation)
+
+
+def labels_for(parsed) -> tuple:
+    """(subject, operation) labels for a parsed query; pipelines are labelled "pipeline"."""
+    if not isinstance(parsed, dict):
+        return None, None
+    if isinstance(parsed.get("pipeline"), list):
+        return "pipeline", None
+    return parsed.get("subject"), parsed.get("operation")
+
+
+# ------------------------------------------------------------------ control
+
+def enable_metrics(enabled: bool = True) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    return _enabled
+
+
+def reset_metrics() -> None:
+    with _lock:
+        _histograms.clear()
+
+
+def configure_profiler(threshold: float = None, sample_rate: float = 1.0, directory: str = "profiles") -> None:
+    """
+    Profile a sample of requests with cProfile and dump the stats of those
+    that take longer than threshold seconds. threshold=None turns it off.
+
+    Parameters:
+        threshold (float or None): Slow-request cutoff in seconds.
+        sample_rate (float): Fraction of requests to profile (profiling costs
+            more than timing, so keep this low in production).
+        directory (str): Where .prof files are written (readable with pstats
+            or snakeviz).
+    """
+    _profile.update(threshold=threshold, sample_rate=sample_rate if threshold is not None else 0.0,
+                    directory=directory)
+
+
+class _RequestTimer:
+    """Times a whole request and, when sampled, profiles it."""
+
+    __slots__ = ("timer", "profiler", "label", "start")
+
+    def __init__(self, label: str):
+        self.timer = _Timer("request", None, None) if _enabled else _NOOP
+        self.profiler = None
+        self.label = label
+
+    def labels(self, subject=None, operation=None) -> None:
+        self.timer.labels(subject, operation)
+
+    def __enter__(self):
+        if _profile["sample_rate"] and random.random() < _profile["sample_rate"]:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:  # another profiler is already active in this thread
+                self.profiler = None
+        self.start = time.perf_counter() if self.profiler else None
+        self.timer.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.__exit__(*exc)
+        if self.profiler is not None:
+            self.profiler.disable()
+            elapsed = time.perf_counter() - self.start
+            threshold = _profile["threshold"]
+            if threshold is not None and elapsed >= threshold:
+                self._dump(elapsed)
+        return False
+
+    def _dump(self, elapsed: float) -> None:
+        directory = _profile["directory"]
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"slow-{time.strftime('%Y%m%d-%H%M%S')}-{int(elapsed * 1000)}ms-{id(self):x}.prof")
+        self.profiler.dump_stats(path)
+        slow_profiles.append(path)
+        logger.warning("slow request (%.0f ms) %r: profile written to %s", elapsed * 1000, self.label, path)
+
+
+def request(label: str = ""):
+    """Context manager for one whole request: timing plus the optional profiler hook."""
+    if not _enabled and not _profile["sample_rate"]:
+        return _NOOP
+    return _RequestTimer(label)
+
+
+# ------------------------------------------------------------------- export
+
+def metrics_snapshot() -> dict:
+    """JSON-serializable snapshot: one entry per (stage, subject, operation)."""
+    with _lock:
+        items = [(key, list(h.counts), h.sum, h.count, h.quantile(0.5), h.quantile(0.95), h.quantile(0.99))
+                 for key, h in _histograms.items()]
+    series = []
+    for (stage_name, subject, operation), counts, total, count, p50, p95, p99 in sorted(items):
+        series.append({
+            "stage": stage_name, "subject": subject, "operation": operation,
+            "count": count, "sum_seconds": total, "mean_seconds": total / count if count else 0.0,
+            "p50_le": p50, "p95_le": p95, "p99_le": p99,
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], counts)),
+        })
+    return {"enabled": _enabled, "series": series, "slow_profiles": list(slow_profiles)}
+
+
+def metrics_json() -> str:
+    return json.dumps(metrics_snapshot(), default=str)
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prometheus_text() -> str:
+    """Histograms in the Prometheus text exposition format."""
+    lines = [f"# HELP {METRIC_NAME} Time spent in each chatbot pipeline stage.",
+             f"# TYPE {METRIC_NAME} histogram"]
+    with _lock:
+        items = [(key, h.cumulative(), h.sum, h.count) for key, h in _histograms.items()]
+    for (stage_name, subject, operation), cumulative, total, count in sorted(items):
+        labels = (f'stage="{_label_value(stage_name)}",subject="{_label_value(subject)}",'
+                  f'operation="{_label_value(operation)}"')
+        for bound, value in zip([f"{b:g}" for b in BUCKETS] + ["+Inf"], cumulative):
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {value}')
+        lines.append(f"{METRIC_NAME}_sum{{{labels}}} {total!r}")
+        lines.append(f"{METRIC_NAME}_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,192 @@
+"""
+integration.py
+--------------
+Definite integrals ("integrate x**2 from 0 to 3"), computed by racing exact
+symbolic integration against numeric quadrature under one shared deadline.
+
+  symbolic   integrate(f, (x, a, b)) in a killable time_budget worker
+  numeric    mpmath.quad (tanh-sinh) in a thread, which also returns an
+             error estimate and handles infinite bounds
+
+An exact answer wins as soon as it arrives. The numeric side usually
+finishes within milliseconds; when its error
+estimate is within REL_TOL, the symbolic side gets EXACT_GRACE_SECONDS more
+to produce an exact answer and is then cancelled; otherwise it has until the
+deadline. The result says which side won: exact, or approximate with its
+error estimate. A numeric answer whose error is above LOOSE_REL_TOL is never
+returned (divergent integrals look like that), and an exact infinite value
+is reported as divergence. Approximate answers are returned as
+UncachedAnswer: a later call (e.g. on a warm worker) may find the exact one.
+"""
+
+import threading
+import time
+
+from result_cache import UncachedAnswer
+from time_budget import TimedOutResult, run_with_budget
+
+DEADLINE_SECONDS = 5.0
+EXACT_GRACE_SECONDS = 0.25
+REL_TOL = 1e-8
+LOOSE_REL_TOL = 1e-4
+ABS_TOL = 1e-12
+
+_INFINITY_WORDS = {"infinity": "oo", "inf": "oo", "-infinity": "-oo", "-inf": "-oo"}
+
+
+def parse_bound(text: str):
+    """SymPy value of an integration bound such as "0", "pi/2", "-infinity"."""
+    from nlp_preprocessor import normalize_operand
+    from Solvers.expression_parser import parse_expression
+
+    text = text.strip().lower()
+    return parse_expression(_INFINITY_WORDS.get(text, normalize_operand(text)))
+
+
+def _exact(expr, var, lower, upper):
+    """Runs in a budget worker: the exact value, or None when SymPy leaves the integral unevaluated."""
+    from sympy import Integral, integrate, nan
+
+    value = integrate(expr, (var, lower, upper))
+    if value.has(Integral) or value is nan:
+        return None
+    return value
+
+
+def _numeric(expr, var, lower, upper):
+    """(value, error estimate) from mpmath quadrature, or None if the integrand can't be evaluated."""
+    import mpmath
+    from sympy import lambdify, oo
+
+    def bound(b):
+        if b == oo:
+            return mpmath.inf
+        if b == -oo:
+            return -mpmath.inf
+        return mpmath.mpf(float(b))
+
+    try:
+        f = lambdify(var, expr, modules="mpmath")
+        value, error = mpmath.quad(f, [bound(lower), bound(upper)], error=True)
+        if isinstance(value, mpmath.mpc):
+            if abs(value.imag) > ABS_TOL:
+                return None
+            value = value.real
+        if not mpmath.isfinite(value):
+            return None
+        return float(value), float(error)
+    except Exception:
+        return None
+
+
+def _acceptable(numeric, rel_tol: float = REL_TOL) -> bool:
+    return numeric is not None and numeric[1] <= max(ABS_TOL, rel_tol * abs(numeric[0]))
+
+
+def definite_integral(expr, var, lower, upper, deadline: float = DEADLINE_SECONDS) -> dict:
+    """
+    Race symbolic and numeric evaluation of ∫[lower, upper] expr d(var).
+
+    Parameters:
+        expr, var, lower, upper: SymPy objects (bounds may be ±oo).
+        deadline (float): Seconds shared by both sides.
+
+    Returns:
+        dict: {"value", "exact" (bool), "error" (error estimate; 0 when
+        exact), "method" ("symbolic" or "quadrature"), "seconds"}; a
+        TimedOutResult when neither side produced an answer in time; None
+        when neither side can evaluate the integral at all.
+    """
+    start = time.perf_counter()
+    end = start + deadline
+    cancel = threading.Event()
+    progress = threading.Event()
+    box = {}
+
+    def symbolic():
+        try:
+            box["exact"] = run_with_budget(_exact, (expr, var, lower, upper), "definite_integral",
+                                           budget=deadline, cancel=cancel)
+        except RuntimeError:
+            box["exact"] = None
+        finally:
+            progress.set()
+
+    def numeric():
+        try:
+            box["numeric"] = _numeric(expr, var, lower, upper)
+        finally:
+            progress.set()
+
+    for target in (symbolic, numeric):
+        threading.Thread(target=target, name=f"definite-integral-{target.__name__}", daemon=True).start()
+
+    # stop at an exact answer, once both sides are done, or at the deadline;
+    # an acceptable numeric answer shortens the wait to EXACT_GRACE_SECONDS
+    grace_end = None
+    while True:
+        progress.clear()
+        if "exact" in box and (box["exact"] is not None and not isinstance(box["exact"], TimedOutResult)
+                               or "numeric" in box):
+            break
+        now = time.perf_counter()
+        if grace_end is None and _acceptable(box.get("numeric")):
+            grace_end = now + EXACT_GRACE_SECONDS
+        limit = min(end, grace_end) if grace_end is not None else end
+        if now >= limit:
+            break
+        progress.wait(limit - now)
+    cancel.set()
+
+    numeric = box.get("numeric")
+    exact = box.get("exact")
+    if exact is not None and not isinstance(exact, TimedOutResult):
+        return {"value": exact, "exact": True, "error": 0.0, "method": "symbolic",
+                "seconds": time.perf_counter() - start}
+    if _acceptable(numeric, LOOSE_REL_TOL):
+        return {"value": numeric[0], "exact": False, "error": numeric[1], "method": "quadrature",
+                "seconds": time.perf_counter() - start}
+    if "exact" not in box or isinstance(exact, TimedOutResult):
+        return TimedOutResult("definite_integral", deadline)
+    return None
+
+
+def _format_answer(result: dict) -> str:
+    value = result["value"]
+    if not result["exact"]:
+        return f"Definite integral: ≈ {value:.10g} (approximate, error ≈ {result['error']:.1e})"
+    if value.is_finite is False:
+        return f"Definite integral: diverges ({value})"
+    if value.is_Integer or not value.is_number:
+        return f"Definite integral: {value} (exact)"
+    if value.is_extended_real:
+        return f"Definite integral: {value} ≈ {float(value):.6g} (exact)"
+    return f"Definite integral: {value} ≈ {complex(value):.6g} (exact)"
+
+
+def solve_definite_integral(problem):
+    """Handler for ("calculus", "definite_integral"); problem.bounds holds the bound texts."""
+    try:
+        expr, var = problem.expr, problem.variable
+        lower, upper = (parse_bound(b) for b in problem.bounds)
+        result = definite_integral(expr, var, lower, upper)
+    except Exception as e:
+        return f"Error during calculus solving: {e}"
+    if isinstance(result, TimedOutResult):
+        return result
+    if result is None:
+        return "Could not evaluate this definite integral, exactly or numerically."
+
+    try:
+        answer = _format_answer(result)
+    except Exception as e:
+        return f"Error during calculus solving: {e}"
+    if problem.step_by_step:
+        method = ("Evaluated symbolically with the antiderivative." if result["exact"] else
+                  "No exact antiderivative in time; evaluated numerically by adaptive quadrature.")
+        answer = "\n".join([
+            f"Integral: ∫[{lower}, {upper}] {expr} d{var}",
+            method,
+            answer,
+        ])
+    return answer if result["exact"] else UncachedAnswer(answer)
@@ -2,69 +2,164 @@
 math_engine.py
 --------------
 Routes parsed problems (single-step or pipeline) to the correct solver(s).
+
+Each query or step becomes a Solvers.problem.Problem and is dispatched on
+(subject, operation) through solver_registry.
 """
 
-from Solvers.algebra_solver import solve_algebra
-from Solvers.calculus_solver import solve_calculus
-from Solvers.geometry_solver import solve_geometry
-from Solvers.stats_solver import solve_statistics
+from instrumentation import stage
+from result_cache import get_result_cache, make_key
+from solver_registry import dispatch
+from Solvers.problem import Problem
+from time_budget import TimedOutResult, run_with_budget
 
 
 def _call_solver(step: dict, step_by_step: bool) -> str:
+    """Solve one parsed query or pipeline step with its registered handler (see solver_registry)."""
+    return dispatch(Problem.from_step(step, step_by_step))
+
+
+def evaluate_expression(expression: str, x, kinds=("f", "derivative", "integral")) -> dict:
     """
-    Wrap each solver call so we can pass operation hints when useful.
-    Some solvers infer from expression; we optionally prefix operation keywords.
+    Numeric values of f, f' and ∫f (from x[0]) over an array of points, for
+    plots and tables. Compiled NumPy functions are cached per expression.
+
+    Returns:
+        dict: {"x": array, "f": array, "derivative": array, "integral": array,
+        "integral_method": "exact" or "trapezoid"}
     """
-    subject = (step.get("subject") or "").lower()
-    operation = (step.get("operation") or "").lower()
-    expression = step.get("expression", "")
-    parsed = {
-        "subject": subject,
-        "expression": expression,
-        "step_by_step": step_by_step
-    }
-
-    # For calculus, many solvers check keywords inside 'expression'
-    if subject == "calculus":
-        if operation == "differentiate":
-            parsed["expression"] = f"differentiate {expression}"
-        elif operation == "integrate":
-            parsed["expression"] = f"integrate {expression}"
-        return solve_calculus(parsed)
-
-    # Algebra solver already distinguishes '=' vs expression and can simplify
-    if subject == "algebra":
-        # Optionally hint the operation in expression for clarity (non-breaking)
-        if operation in {"simplify", "expand", "factor", "solve"} and operation not in expression.lower():
-            parsed["expression"] = f"{expression}"
-        return solve_algebra(parsed)
-
-    if subject == "geometry":
-        # Geometry solver looks for keywords like area/perimeter/volume in expression
-        if operation and operation not in expression.lower():
-            parsed["expression"] = f"{operation} {expression}"
-        return solve_geometry(parsed)
-
-    if subject == "statistics":
-        # Stats solver looks for 'mean/median/variance/std/probability' in expression
-        if operation and operation not in expression.lower():
-            parsed["expression"] = f"{operation} of {expression}"
-        return solve_statistics(parsed)
-
-    return "Sorry, I don't know how to solve that type of problem yet."
+    from numeric_eval import evaluate_grid
+
+    return evaluate_grid(expression, x, kinds)
+
+
+def _run_solver(step: dict, step_by_step: bool):
+    with stage("solver", step.get("subject"), step.get("operation")):
+        return run_with_budget(_call_solver, (step, step_by_step), step.get("operation"))
+
+
+def _solve_cached(step: dict, step_by_step: bool) -> str:
+    """
+    _call_solver behind the shared result cache, under the operation's time
+    budget. Timed-out answers are returned but never cached, and neither are
+    answers computed from a data file, whose contents may change, or
+    UncachedAnswer results (see ResultCache.put). Evaluate
+    steps skip this cache; their compiled functions are cached in numeric_eval.
+    """
+    if step.get("operation") == "evaluate":
+        return _call_solver(step, step_by_step)
+    if step.get("source"):
+        try:
+            return _run_solver(step, step_by_step)
+        except RuntimeError as e:
+            return f"Error while solving: {e}"
+
+    cache = get_result_cache()
+    key = make_key(step.get("subject"), step.get("operation"), step.get("expression", ""), step_by_step, step)
+    result = cache.get(key)
+    if result is None:
+        try:
+            result = _run_solver(step, step_by_step)
+        except RuntimeError as e:
+            return f"Error while solving: {e}"
+        if not isinstance(result, TimedOutResult):
+            cache.put(key, result)
+    return result
 
 
 def route_math_problem(parsed: dict) -> str:
 
     step_by_step = parsed.get("step_by_step", False)
 
-    # Pipeline path
+    # Pipeline path: steps pass SymPy results to each other (see pipeline_executor)
     if "pipeline" in parsed and isinstance(parsed["pipeline"], list):
-        outputs = []
-        for i, step in enumerate(parsed["pipeline"], 1):
-            res = _call_solver(step, step_by_step)
-            outputs.append(f"Step {i}: {res}")
-        return "\n\n".join(outputs)
+        from pipeline_executor import run_pipeline
+
+        answers = run_pipeline(parsed["pipeline"], step_by_step, _solve_cached)
+        return "\n\n".join(f"Step {i}: {res}" for i, res in enumerate(answers, 1))
 
     # Single-step path
-    return _call_solver(parsed, step_by_step)
+    return _solve_cached(parsed, step_by_step)
+
+
+class _IntegrationTimedOut(Exception):
+    def __init__(self, result: TimedOutResult):
+        super().__init__(str(result))
+        self.result = result
+
+
+def _budgeted_integrate(expr, var):
+    from sympy import integrate
+
+    result = run_with_budget(integrate, (expr, var), "integrate")
+    if isinstance(result, TimedOutResult):
+        raise _IntegrationTimedOut(result)
+    return result
+
+
+def _stream_calculus_steps(step: dict):
+    """Yield calculus explanation lines as they are computed; the full text is cached at the end."""
+    from Solvers.calculus_solver import iter_problem_steps
+
+    cache = get_result_cache()
+    key = make_key(step.get("subject"), step.get("operation"), step.get("expression", ""), True)
+    cached = cache.get(key)
+    if cached is not None:
+        yield from str(cached).split("\n")
+        return
+
+    lines = []
+    try:
+        for line in iter_problem_steps(Problem.from_step(step, True), integrator=_budgeted_integrate):
+            lines.append(line)
+            yield line
+    except _IntegrationTimedOut as e:
+        yield str(e.result)
+        return
+    except Exception as e:
+        yield f"Error during calculus solving: {e}"
+        return
+    cache.put(key, "\n".join(lines))
+
+
+def _stream_step(step: dict, step_by_step: bool):
+    operation = (step.get("operation") or "").lower()
+    if (step_by_step and (step.get("subject") or "").lower() == "calculus"
+            and operation in ("differentiate", "integrate")):
+        yield from _stream_calculus_steps(step)
+    else:
+        yield str(_solve_cached(step, step_by_step))
+
+
+def stream_math_problem(parsed: dict):
+    """
+    Streaming route_math_problem: yields the answer piece by piece.
+
+    Calculus explanations arrive one step at a time as each step is computed.
+    Pipelines yield "Step i: ..." as each chain of steps finishes. Other
+    answers are yielded whole.
+    """
+    step_by_step = parsed.get("step_by_step", False)
+
+    if "pipeline" in parsed and isinstance(parsed["pipeline"], list):
+        from pipeline_executor import iter_pipeline
+
+        for index, answer in iter_pipeline(parsed["pipeline"], step_by_step, _solve_cached):
+            yield f"Step {index + 1}: {answer}"
+        return
+
+    yield from _stream_step(parsed, step_by_step)
+
+
+def warm_result_cache(questions) -> int:
+    """
+    Solve a list of known questions so their answers are cached before the
+    first student asks. Returns the number of questions that were processed.
+    """
+    from nlp_parser import parse_user_input
+
+    count = 0
+    for question in questions:
+        route_math_problem(parse_user_input(question))
+        count += 1
+    return count
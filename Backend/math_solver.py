@@ -1,11 +1,119 @@
-from sympy import symbols, diff, integrate, simplify, sympify, Eq, solve, expand, Function
+from sympy import symbols, diff, integrate, simplify, Function
 from sympy.core.mul import Mul
 from sympy.core.add import Add
 from sympy.core.power import Pow
 
+from Solvers.equation_solver import solve_equations
+from Solvers.expression_parser import parse_expression
+
 x = symbols('x')
 
 
+def iter_expression_steps(parsed, integrator=integrate):
+    """
+    Step-mode explanation of solve_expression, yielded one line at a time as
+    each part is computed. Per-term and per-factor results are reused for the
+    final answer instead of being recomputed.
+
+    Parameters:
+        parsed (dict): Contains 'subject' and 'expression'.
+        integrator (callable): (expr, x) -> antiderivative.
+    """
+    expr_str = parsed['expression']
+    subject = parsed['subject']
+    # equations are split into sides below
+    expr = parse_expression(expr_str) if "=" not in expr_str else None
+
+    if subject == 'calculus':
+        if "differentiate" in expr_str or "derivative" in expr_str:
+            yield f"Original expression: {expr}"
+            yield "Now let's apply the appropriate rule..."
+            derivative = None
+
+            if isinstance(expr, Pow):
+                base, exponent = expr.args
+                if base == x:
+                    yield "This is a power function."
+                    yield f"Use the power rule: d/dx[x^{exponent}] = {exponent}*x^{exponent - 1}"
+
+            elif expr.is_Number:
+                yield "This is a constant."
+                yield "The derivative of any constant is 0."
+
+            elif expr.has(Function):
+                yield "This appears to be a composite function."
+                yield "Use the chain rule: d/dx[f(g(x))] = f'(g(x)) * g'(x)"
+
+            elif isinstance(expr, Mul):
+                u, v = expr.args[0], Mul(*expr.args[1:])
+                yield f"This is a product of two expressions: {u} * {v}"
+                yield "Use the product rule:"
+                yield "d/dx[u*v] = u'*v + u*v'"
+                du = diff(u, x)
+                yield f"u = {u}, u' = {du}"
+                dv = diff(v, x)
+                yield f"v = {v}, v' = {dv}"
+                yield f"Result: {du}*{v} + {u}*{dv}"
+                derivative = du * v + u * dv
+
+            elif isinstance(expr, Add):
+                yield "This is a sum of terms."
+                dterms = []
+                for i, term in enumerate(expr.args):
+                    dterms.append(diff(term, x))
+                    yield f"d/dx of term {i+1} ({term}) = {dterms[-1]}"
+                derivative = Add(*dterms)
+
+            else:
+                yield "Using general symbolic differentiation."
+
+            if derivative is None:
+                derivative = diff(expr, x)
+            yield f"Final derivative: {derivative}"
+            return
+
+        elif "integrate" in expr_str or "antiderivative" in expr_str:
+            yield f"Original expression: {expr}"
+            yield "Finding the antiderivative with respect to x."
+            integral = None
+
+            if isinstance(expr, Pow) and expr.args[0] == x:
+                n = expr.args[1]
+                yield "This is a power of x."
+                yield f"Use the rule: ∫x^{n} dx = x^{n+1}/({n+1}) + C"
+
+            elif expr.is_Number:
+                yield "This is a constant."
+                yield "Use the rule: ∫c dx = c*x + C"
+
+            elif isinstance(expr, Add):
+                yield "This is a sum of terms; integrate each one."
+                iterms = []
+                for i, term in enumerate(expr.args):
+                    iterms.append(integrator(term, x))
+                    yield f"∫ of term {i+1} ({term}) dx = {iterms[-1]}"
+                integral = Add(*iterms)
+
+            if integral is None:
+                integral = integrator(expr, x)
+            yield f"Final integral: {integral} + C"
+            return
+
+    elif subject == 'algebra':
+        if "=" in expr_str:
+            lhs, rhs = expr_str.split("=")
+            yield f"Equation: {lhs} = {rhs}"
+            yield "Solving for x using algebraic operations..."
+            yield f"Solution(s): {solve_equations([(parse_expression(lhs), parse_expression(rhs))], [x])[0]}"
+        else:
+            yield f"Original expression: {expr}"
+            yield "Applying simplification rules..."
+            yield f"Result: {simplify(expr)}"
+        return
+
+    yield "Sorry, I can't solve this type of problem yet."
+
+
 def solve_expression(parsed):
     """
     Takes parsed input with 'subject', 'expression', and optional 'step_by_step' flag.
@@ -17,99 +125,25 @@ def solve_expression(parsed):
         subject = parsed['subject']
         step_mode = parsed.get('step_by_step', False)
 
-        expr = sympify(expr_str)
-        steps = []
+        if step_mode:
+            return "\n".join(iter_expression_steps(parsed))
+
+        # equations are split into sides below
+        expr = parse_expression(expr_str) if "=" not in expr_str else None
 
         if subject == 'calculus':
             if "differentiate" in expr_str or "derivative" in expr_str:
-
-                derivative = diff(expr, x)
-
-                if not step_mode:
-                    return f"Derivative: {derivative}"
-
-                steps.append(f"Original expression: {expr}")
-                steps.append("Now let's apply the appropriate rule...")
-
-                if isinstance(expr, Pow):
-                    base, exponent = expr.args
-                    if base == x:
-                        steps.append("This is a power function.")
-                        steps.append(f"Use the power rule: d/dx[x^{exponent}] = {exponent}*x^{exponent - 1}")
-
-                elif expr.is_Number:
-                    steps.append("This is a constant.")
-                    steps.append("The derivative of any constant is 0.")
-
-                elif expr.has(Function):
-                    steps.append("This appears to be a composite function.")
-                    steps.append("Use the chain rule: d/dx[f(g(x))] = f'(g(x)) * g'(x)")
-
-                elif isinstance(expr, Mul):
-                    u, v = expr.args
-                    steps.append(f"This is a product of two expressions: {u} * {v}")
-                    du = diff(u, x)
-                    dv = diff(v, x)
-                    steps.append("Use the product rule:")
-                    steps.append(f"d/dx[u*v] = u'*v + u*v'")
-                    steps.append(f"u = {u}, u' = {du}")
-                    steps.append(f"v = {v}, v' = {dv}")
-                    steps.append(f"Result: {du}*{v} + {u}*{dv}")
-
-                elif isinstance(expr, Add):
-                    terms = expr.args
-                    steps.append("This is a sum of terms.")
-                    for i, term in enumerate(terms):
-                        dterm = diff(term, x)
-                        steps.append(f"d/dx of term {i+1} ({term}) = {dterm}")
-
-                else:
-                    steps.append("Using general symbolic differentiation.")
-
-                steps.append(f"Final derivative: {derivative}")
-                return "\n".join(steps)
-
+                return f"Derivative: {diff(expr, x)}"
 
             elif "integrate" in expr_str or "antiderivative" in expr_str:
-                integral = integrate(expr, x)
-
-                if not step_mode:
-                    return f"Integral: {integral} + C"
-
-                steps.append(f"Original expression: {expr}")
-                steps.append("Finding the antiderivative with respect to x.")
-
-                if isinstance(expr, Pow) and expr.args[0] == x:
-                    n = expr.args[1]
-                    steps.append("This is a power of x.")
-                    steps.append(f"Use the rule: ∫x^{n} dx = x^{n+1}/({n+1}) + C")
-
-                elif expr.is_Number:
-                    steps.append("This is a constant.")
-                    steps.append(f"Use the rule: ∫c dx = c*x + C")
-
-                steps.append(f"Final integral: {integral} + C")
-                return "\n".join(steps)
+                return f"Integral: {integrate(expr, x)} + C"
 
         elif subject == 'algebra':
             if "=" in expr_str:
                 lhs, rhs = expr_str.split("=")
-                equation = Eq(sympify(lhs), sympify(rhs))
-                solutions = solve(equation, x)
-                if step_mode:
-                    steps.append(f"Equation: {lhs} = {rhs}")
-                    steps.append("Solving for x using algebraic operations...")
-                    steps.append(f"Solution(s): {solutions}")
-                    return "\n".join(steps)
+                solutions, _ = solve_equations([(parse_expression(lhs), parse_expression(rhs))], [x])
                 return f"Solution: {solutions}"
-            else:
-                simplified = simplify(expr)
-                if step_mode:
-                    steps.append(f"Original expression: {expr}")
-                    steps.append("Applying simplification rules...")
-                    steps.append(f"Result: {simplified}")
-                    return "\n".join(steps)
-                return f"Simplified: {simplified}"
+            return f"Simplified: {simplify(expr)}"
 
         return "Sorry, I can't solve this type of problem yet."
 
@@ -1,7 +1,8 @@
 
 
 import re
-from nlp_preprocessor import normalize_math_text, detect_variables, split_multi_steps
+from nlp_preprocessor import normalize_operand, normalize_operands, detect_variables, split_multi_steps
+from instrumentation import stage
 
 # operation → (topic, canonical_operation)
 OP_KEYWORDS = {
@@ -9,6 +10,12 @@ OP_KEYWORDS = {
     "derivative": ("calculus", "differentiate"),
     "integrate": ("calculus", "integrate"),
     "antiderivative": ("calculus", "integrate"),
+    "integral": ("calculus", "integrate"),
+    "taylor series": ("calculus", "series"),
+    "maclaurin series": ("calculus", "series"),
+    "taylor": ("calculus", "series"),
+    "maclaurin": ("calculus", "series"),
+    "series": ("calculus", "series"),
     "simplify": ("algebra", "simplify"),
     "expand": ("algebra", "expand"),
     "factor": ("algebra", "factor"),
@@ -17,6 +24,9 @@ OP_KEYWORDS = {
     "perimeter": ("geometry", "perimeter"),
     "circumference": ("geometry", "perimeter"),
     "volume": ("geometry", "volume"),
+    "diameter": ("geometry", "diameter"),
+    "hypotenuse": ("geometry", "hypotenuse"),
+    "diagonal": ("geometry", "diagonal"),
     "mean": ("statistics", "mean"),
     "average": ("statistics", "mean"),
     "median": ("statistics", "median"),
@@ -29,8 +39,18 @@ OP_KEYWORDS = {
     "permutation": ("statistics", "permutation"),
     "ncr": ("statistics", "combination"),
     "npr": ("statistics", "permutation"),
+    "choose": ("statistics", "combination"),
+    # a value table of f, f' and ∫f (numeric_eval); any subject
+    "evaluate": (None, "evaluate"),
 }
 
+# Data files for statistics ("mean of scores.csv"); picked off the raw text
+# because normalization would break the path apart.
+DATA_FILE_PATTERN = re.compile(
+    r"(?<![\w.\\/])(?:[A-Za-z]:)?[\\/]?(?:[\w~\-.]+[\\/])*[\w~\-.]+\.(?:csv|tsv|txt|npy|f64|bin)\b",
+    re.IGNORECASE,
+)
+
 STEP_HINT_PATTERN = re.compile(r"(step|explain|how to|show work|show steps)", re.IGNORECASE)
 
 
@@ -38,6 +58,18 @@ def _detect_step_mode(text: str) -> bool:
     return STEP_HINT_PATTERN.search(text) is not None
 
 
+def _detect_data_file(text: str):
+    m = DATA_FILE_PATTERN.search(text)
+    return m.group(0) if m else None
+
+
+def _operation_of(ops: list):
+    """Canonical operation of the first keyword. "evaluate" only counts on its
+    own: "evaluate the integral of x" is an integral."""
+    ops = [op for op in ops if op != "evaluate"] or ops
+    return OP_KEYWORDS[ops[0]][1] if ops else None
+
+
 def _guess_topic_from_ops(ops: list) -> str:
     """Pick the first topic implied by operations; fallback algebra."""
     for op in ops:
@@ -47,20 +79,171 @@ def _guess_topic_from_ops(ops: list) -> str:
     return "algebra"
 
 
+# One alternation over every keyword, built once at import. Longer keys come
+# first so "standard deviation" wins over any shorter key at the same spot, and
+# each key gets its own capturing group so ``match.lastindex`` maps straight
+# back to the canonical keyword without re-lowercasing the matched text.
+_OP_KEYS = sorted(OP_KEYWORDS.keys(), key=len, reverse=True)
+_OP_PATTERN = re.compile(
+    r"\b(?:" + "|".join(f"({re.escape(key)})" for key in _OP_KEYS) + r")\b",
+    re.IGNORECASE,
+)
+
+
+# Operation words (with a trailing "of"/"for"), step-mode hints, question
+# lead-ins and references to a previous result; stripping them from a query
+# or pipeline segment leaves its math operand. The subject and operation are
+# passed on separately, so solvers never see the words again.
+_OPERAND_NOISE = re.compile(
+    _OP_PATTERN.pattern + r"(?:\s+(?:of|for)\b)?"
+    r"|\b(?:show steps|show work|explain|how to|step by step|steps?)\b"
+    r"|\b(?:what(?:'s|\s+is|\s+are)|how\s+(?:do|can|would|should)\s+(?:i|you|we))\b|\?"
+    r"|\b(?:the|result|answer|it|that|this)\b",
+    re.IGNORECASE,
+)
+_HAS_OPERAND = re.compile(r"[a-zA-Z0-9]")
+
+# Limits of a definite integral: "from 0 to 3", "between -1 and 1",
+# "from x = 0 to infinity". Each bound is one space-free token. The
+# differential ("dx") is dropped along with them.
+_BOUND = r"-?[\w.*/^()+\-]+"
+_BOUNDS_PATTERN = re.compile(
+    rf"\b(?:from|between)\s+(?:[a-z]\s*=\s*)?(?P<lower>{_BOUND})\s+(?:to|and)\s+(?P<upper>{_BOUND})",
+    re.IGNORECASE,
+)
+_DIFFERENTIAL = re.compile(r"\bd[a-z]\b")
+
+# Derivative and series options: the order ("second derivative", "10th order",
+# "to order 10", "up to x^10", "3 times", "twice"), the variables of a partial
+# derivative ("with respect to x and y") and a series' expansion point
+# ("about x = 1", "at pi"; Maclaurin series are about 0, the default).
+_ORDINALS = {"first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5,
+             "sixth": 6, "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10}
+_ORDER_PATTERN = re.compile(
+    r"\b(?P<ordinal>" + "|".join(_ORDINALS) + r"|\d+(?:st|nd|rd|th))(?:[\s-]+order)?\b"
+    r"|\b(?:(?:up\s+)?to\s+|of\s+)?(?:order|degree)\s+(?P<number>\d+)\b"
+    r"|\bup\s+to\s+[a-z]\s*(?:\^|\*\*)\s*(?P<power>\d+)"
+    r"|\b(?P<times>\d+)\s+times\b|\b(?P<twice>twice)\b",
+    re.IGNORECASE,
+)
+_WRT_PATTERN = re.compile(
+    r"\b(?:with\s+respect\s+to|wrt|w\.r\.t\.?)\s+(?P<variables>[a-z]\b(?:\s*(?:,|and)?\s*[a-z]\b)*)",
+    re.IGNORECASE,
+)
+_PARTIAL_PATTERN = re.compile(r"\bpartial\b", re.IGNORECASE)
+# Points to evaluate at: "at x = 3", "for x = -1, 0 and 2".
+_NUMBER = r"-?(?:\d+\.?\d*|\.\d+)"
+_POINTS_PATTERN = re.compile(
+    rf"\b(?:at|for|when)\s+(?:[a-z]\s*=\s*)?(?P<points>{_NUMBER}(?:\s*(?:,|and)\s*{_NUMBER})*)",
+    re.IGNORECASE,
+)
+_POINT_PATTERN = re.compile(
+    rf"\b(?:at|about|around|near|centred\s+at|centered\s+at)\s+(?:[a-z]\s*=\s*)?(?P<point>{_BOUND})",
+    re.IGNORECASE,
+)
+
+
+def _operand_text(text: str) -> str:
+    return _OPERAND_NOISE.sub(" ", text).strip(" ,.;:")
+
+
+def _detect_bounds(text: str):
+    """(text without the limits phrase, (lower, upper)) or (text, None)."""
+    m = _BOUNDS_PATTERN.search(text)
+    if not m:
+        return text, None
+    text = _DIFFERENTIAL.sub(" ", text[:m.start()] + text[m.end():])
+    return text, (m.group("lower"), m.group("upper"))
+
+
+def _cut(text: str, m) -> str:
+    return text[:m.start()] + " " + text[m.end():]
+
+
+def _order_of(m) -> int:
+    if m.group("ordinal"):
+        word = m.group("ordinal").lower()
+        return _ORDINALS.get(word) or int(word[:-2])
+    if m.group("twice"):
+        return 2
+    return int(m.group("number") or m.group("power") or m.group("times"))
+
+
+def _detect_derivative_options(text: str, operation: str):
+    """
+    Pick derivative/series options off the text.
+    Returns (text without them, operation, options): "differentiate" becomes
+    "nth_derivative" for orders above 1 and "partial_derivative" when the
+    text says "partial" or names the variables.
+    """
+    options = {}
+    order = None
+    m = _ORDER_PATTERN.search(text)
+    if m:
+        order, text = _order_of(m), _cut(text, m)
+
+    if operation == "series":
+        m = _POINT_PATTERN.search(text)
+        if m:
+            options["point"], text = m.group("point"), _cut(text, m)
+        if order is not None:
+            options["order"] = order
+        return text, operation, options
+
+    m = _WRT_PATTERN.search(text)
+    variables = re.findall(r"\b[a-z]\b", m.group("variables").lower()) if m else []
+    if m:
+        text = _cut(text, m)
+    partial = _PARTIAL_PATTERN.search(text)
+    if partial:
+        text = _cut(text, partial)
+    if variables or partial:
+        operation = "partial_derivative"
+        if variables:
+            options["wrt"] = tuple(variables)
+        if order and order > 1:
+            options["order"] = order
+    elif order and order > 1:
+        operation, options["order"] = "nth_derivative", order
+    return text, operation, options
+
+
+def _detect_step_options(text: str, operation: str):
+    """
+    Integral bounds and derivative/series options of one query or pipeline
+    segment. Returns (text without them, operation, extra step fields).
+    """
+    if operation == "integrate":
+        text, bounds = _detect_bounds(text)
+        if bounds:
+            return text, "definite_integral", {"bounds": bounds}
+    elif operation in ("differentiate", "series"):
+        return _detect_derivative_options(text, operation)
+    elif operation == "evaluate":
+        m = _POINTS_PATTERN.search(text)
+        if m:
+            points = tuple(float(p) for p in re.findall(_NUMBER, m.group("points")))
+            return _cut(text, m), operation, {"points": points}
+    return text, operation, {}
+
+
 def _detect_operations(text: str) -> list:
     """
     Return operations (in order) mentioned in the text.
-    We check multi-word keys first by sorting by length descending.
+    A single scan with the precompiled keyword pattern; each keyword is
+    reported once, at the position of its first whole-word occurrence. Where
+    keywords overlap, only the longest one at that spot is reported:
+    "taylor series" gives ["taylor series"], not also "taylor" and "series"
+    (the old per-keyword scan listed all three; the first entry, the only
+    one callers use, is the same).
     """
-    ops = []
-    for key in sorted(OP_KEYWORDS.keys(), key=len, reverse=True):
-        if re.search(rf"\b{re.escape(key)}\b", text, flags=re.IGNORECASE):
-            ops.append(key)
-    # Preserve the textual order (stable by scanning)
     ordered = []
-    cursor = text.lower()
-    for key in sorted(set(ops), key=lambda k: cursor.find(k)):
-        ordered.append(key)
+    seen = set()
+    for match in _OP_PATTERN.finditer(text):
+        key = _OP_KEYS[match.lastindex - 1]
+        if key not in seen:
+            seen.add(key)
+            ordered.append(key)
     return ordered
 
 
@@ -72,49 +255,72 @@ def parse_user_input(user_input: str) -> dict:
     # If multi-step, build a pipeline
     if len(raw_steps) > 1:
         pipeline = []
-        # Use the last step to extract the base expression if earlier steps omit it
+        # The operand of a step is what is left once its operation words and
+        # references to an earlier result ("it", "the result") are removed.
+        # Bounds and derivative options are picked off each segment first.
+        # Each segment is normalized once, in a single batch.
+        segments = []
+        for seg in raw_steps:
+            ops = _detect_operations(seg)
+            operation = _operation_of(ops)
+            segments.append((ops, *_detect_step_options(seg, operation)))
+        with stage("normalize", "pipeline"):
+            operands = normalize_operands(_operand_text(text) for _, text, _, _ in segments)
+
         # Strategy: the first segment that contains numbers/variables becomes the base expression
         base_expr = None
-        for seg in raw_steps:
-            norm = normalize_math_text(seg)
-            if not base_expr and re.search(r"[a-zA-Z0-9]", norm):
-                base_expr = norm
-        base_expr = base_expr or normalize_math_text(user_input)
+        for operand in operands:
+            if not base_expr and _HAS_OPERAND.search(operand):
+                base_expr = operand
+        base_expr = base_expr or normalize_operand(_operand_text(user_input))
 
-        # Build pipeline with operations inferred per step; if a step has no explicit expr, reuse base_expr
-        for seg in raw_steps:
-            norm = normalize_math_text(seg)
-            ops = _detect_operations(seg)
-            op = ops[0] if ops else None
+        # Build pipeline with operations inferred per step. A later step with no
+        # operand of its own works on the previous step's result ("chain");
+        # its expression falls back to base_expr for solvers that need text.
+        for i, (seg, operand, (ops, _, operation, options)) in enumerate(zip(raw_steps, operands, segments)):
             subject = _guess_topic_from_ops(ops)
-            expr = norm
-            # If the normalized segment is mostly operation words, attach base expression
-            if len(norm) <= 20 and op is not None:
-                expr = base_expr
-            pipeline.append({
+            # "solve = 0" continues from the previous result
+            has_operand = _HAS_OPERAND.search(operand) is not None and not operand.startswith("=")
+            step = {
                 "subject": subject,
-                "operation": OP_KEYWORDS.get(op, (None, None))[1] if op else None,
-                "expression": expr
-            })
+                "operation": operation,
+                "expression": operand if has_operand else base_expr,
+                "chain": i > 0 and not has_operand,
+                **options,
+            }
+            if subject == "geometry":
+                step["expression"] = seg
+            source = _detect_data_file(seg) or _detect_data_file(user_input)
+            if source and subject == "statistics":
+                step["source"] = source
+            pipeline.append(step)
 
         variables = detect_variables(base_expr)
         return {"pipeline": pipeline, "variables": variables, "step_by_step": step_by_step}
 
     # Single-step path
-    normalized = normalize_math_text(user_input)
     ops = _detect_operations(user_input)
     subject = _guess_topic_from_ops(ops)
-    operation = OP_KEYWORDS.get(ops[0], (None, None))[1] if ops else None
-    variables = detect_variables(normalized)
-
-    # Try to keep only the right-hand side after keywords like 'of', 'for', '='
-    m = re.search(r"(?:of|for|=)\s*(.*)", normalized, flags=re.IGNORECASE)
-    expression = m.group(1) if m else normalized
+    operation = _operation_of(ops)
+    operand_text, operation, options = _detect_step_options(user_input, operation)
+    if subject == "geometry":
+        # Dimension words ("diameter 10") are also operation keywords, and the
+        # normalizer splits words apart, so the geometry solver reads the raw text.
+        expression, variables = user_input, []
+    else:
+        with stage("normalize", subject, operation):
+            expression = normalize_operand(_operand_text(operand_text))
+        variables = detect_variables(expression)
 
-    return {
+    parsed = {
         "subject": subject,
         "operation": operation,
-        "expression": expression.strip(),
+        "expression": expression,
         "variables": variables,
         "step_by_step": step_by_step
     }
+    parsed.update(options)
+    source = _detect_data_file(user_input)
+    if source and subject == "statistics":
+        parsed["source"] = source
+    return parsed
@@ -24,84 +24,177 @@ POWER_WORDS = {
     "squared": "**2", "cubed": "**3",
 }
 
+# Function names and constants that operands keep whole ("sin(x)", not "s*in*(x)")
+MATH_FUNCTIONS = {
+    "sin", "cos", "tan", "cot", "sec", "csc", "asin", "acos", "atan",
+    "sinh", "cosh", "tanh", "exp", "log", "ln", "sqrt", "abs", "pi",
+}
+
 FILLER = [
     "please", "can you", "could you", "would you", "show me", "tell me",
     "calculate", "compute", "evaluate", "find", "solve", "determine",
 ]
 
 
-def _replace_number_words(text: str) -> str:
-    """Convert simple number words + common two-word fractions to digits."""
-    # fractions first (to avoid splitting their words)
-    for phrase, val in FRACTIONS.items():
-        text = re.sub(rf"\b{re.escape(phrase)}\b", str(val), text, flags=re.IGNORECASE)
+def _alternation(phrases) -> str:
+    """Regex alternation of literal phrases, longest first."""
+    return "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
 
-    # compound numbers like "twenty one"
-    def repl(match):
-        words = match.group(0).split()
-        total = 0
-        for w in words:
-            if w in NUMBER_WORDS:
-                total += NUMBER_WORDS[w]
-        return str(total)
 
-    pattern = r"\b(" + "|".join(NUMBER_WORDS.keys()) + r")(?:\s+(" + "|".join(NUMBER_WORDS.keys()) + r"))?\b"
-    return re.sub(pattern, lambda m: repl(m).lower(), text, flags=re.IGNORECASE)
+# ---------------------------------------------------------------------------
+# Compiled rules
+# ---------------------------------------------------------------------------
+# Normalization runs in two passes over the text:
+#   1. filler words are dropped and whitespace is collapsed;
+#   2. a single tokenizing scan where each match is dispatched on the name of
+#      the rule that fired (fractions, number words, power words, word
+#      operators, or a plain word run that gets implicit multiplication).
+# Every rule matches whole words only, so their outputs never merge with the
+# neighbouring text and one left-to-right scan gives the same result as
+# applying the rules one after another.
 
+_FILLER_RE = re.compile(rf"\b(?:{_alternation(FILLER)})\b", re.IGNORECASE)
 
-def _replace_power_words(text: str) -> str:
-    """x squared → x**2 ; y cubed → y**3"""
-    text = re.sub(r"\b([a-zA-Z])\s+squared\b", r"\1**2", text)
-    text = re.sub(r"\b([a-zA-Z])\s+cubed\b", r"\1**3", text)
-    return text
+_FRACTION_TEXT = {phrase: str(val) for phrase, val in FRACTIONS.items()}
+_FRACTION_ALT = _alternation(FRACTIONS)
+_NUMBER_ALT = "|".join(NUMBER_WORDS)
 
+# "equal to" / "is equal to" must not claim the "to" of "to the power of",
+# which the word-operator rules have always resolved first.
+_SYMBOL_PHRASES = "|".join(
+    re.escape(p) + (r"(?! the power of\b)" if p.endswith(" to") else "")
+    for p in sorted(WORD_TO_SYMBOL, key=len, reverse=True)
+)
 
-def _replace_word_symbols(text: str) -> str:
-    """Map word operators to symbols (plus→+, divided by→/ …)."""
-    # longest phrases first to avoid partial matches
-    for phrase, sym in sorted(WORD_TO_SYMBOL.items(), key=lambda kv: -len(kv[0])):
-        text = re.sub(rf"\b{re.escape(phrase)}\b", f" {sym} ", text, flags=re.IGNORECASE)
-    return text
+_TOKEN_RE = re.compile(
+    rf"\b(?P<fraction>{_FRACTION_ALT})\b(?P<fraction_paren>\s*\()?"
+    # a second number word is only joined on if it does not start a fraction
+    rf"|\b(?P<number>(?:{_NUMBER_ALT})(?:\s+(?!(?:{_FRACTION_ALT})\b)(?:{_NUMBER_ALT}))?)\b"
+    rf"(?P<number_paren>\s*\()?"
+    rf"|(?-i:\b(?P<power_base>[a-zA-Z])\s+(?P<power>{_alternation(POWER_WORDS)})\b)"
+    rf"(?P<power_paren>\s*\()?"
+    rf"|\b(?P<symbol>{_SYMBOL_PHRASES})\b"
+    rf"|(?P<word>\w+)(?P<word_paren>\s*\()?",
+    re.IGNORECASE,
+)
 
+_SYMBOL_TEXT = {phrase: f" {sym} " for phrase, sym in WORD_TO_SYMBOL.items()}
 
-def _strip_fillers(text: str) -> str:
-    for w in FILLER:
-        text = re.sub(rf"\b{re.escape(w)}\b", " ", text, flags=re.IGNORECASE)
-    return re.sub(r"\s+", " ", text).strip()
 
+def _is_ascii_letter(ch: str) -> bool:
+    return ch.isascii() and ch.isalpha()
 
-def _insert_implicit_multiplication(text: str) -> str:
+
+def _insert_implicit_multiplication(word: str) -> str:
     """
-    2x → 2*x ; xy → x*y ; 3(x+1) → 3*(x+1) ; x(…)-> x*(…)
+    2x → 2*x ; x2 → x*2 ; xy → x*y (letters are paired left to right, so
+    xyz → x*yz) for a single run of word characters.
     """
-    text = re.sub(r'(\d)([a-zA-Z])', r'\1*\2', text)
-    text = re.sub(r'([a-zA-Z])(\d)', r'\1*\2', text)
-    text = re.sub(r'([a-zA-Z])([a-zA-Z])', r'\1*\2', text)
-    text = re.sub(r'(\d|\w)\s*\(', r'\1*(', text)
-    return text
+    out = []
+    letter_run = 0
+    prev = ""
+    for ch in word:
+        if _is_ascii_letter(ch):
+            if prev.isdecimal():
+                out.append("*")
+                letter_run = 0
+            elif letter_run % 2 == 1:
+                out.append("*")
+            letter_run += 1
+        else:
+            if ch.isdecimal() and letter_run:
+                out.append("*")
+            letter_run = 0
+        out.append(ch)
+        prev = ch
+    return "".join(out)
+
+
+def _number_text(match) -> str:
+    # Lookup is case-sensitive on purpose: it mirrors the historic behaviour
+    # pinned by the golden outputs in benchmarks/golden.
+    return str(sum(NUMBER_WORDS.get(w, 0) for w in match.group("number").split()))
+
+
+# rule name (regex group) → replacement builder
+_TOKEN_RULES = {
+    "fraction": lambda m: _FRACTION_TEXT[m.group("fraction").lower()],
+    "number": _number_text,
+    "power": lambda m: m.group("power_base") + POWER_WORDS[m.group("power")],
+    "symbol": lambda m: _SYMBOL_TEXT[m.group("symbol").lower()],
+    "word": lambda m: _insert_implicit_multiplication(m.group("word")),
+}
+
+
+def _dispatch_token(match) -> str:
+    rule = match.lastgroup
+    # a trailing "<rule>_paren" group means the token runs into "(":
+    # 3(x+1) → 3*(x+1) ; x (…) → x*(…)
+    if rule.endswith("_paren"):
+        return _TOKEN_RULES[rule[:-len("_paren")]](match) + "*("
+    return _TOKEN_RULES[rule](match)
+
+
+def _strip_fillers(text: str) -> str:
+    return " ".join(_FILLER_RE.sub(" ", text).split())
 
 
 def normalize_math_text(user_input: str) -> str:
     """Full normalization pipeline."""
-    s = user_input.strip()
-    s = _strip_fillers(s)
-    s = _replace_number_words(s)
-    s = _replace_power_words(s)
-    s = _replace_word_symbols(s)
-    s = _insert_implicit_multiplication(s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    s = _strip_fillers(user_input)
+    s = _TOKEN_RE.sub(_dispatch_token, s)
+    return " ".join(s.split())
+
+
+def normalize_many(texts) -> list:
+    """Normalize a batch of texts with the same compiled rules."""
+    strip, sub, dispatch = _strip_fillers, _TOKEN_RE.sub, _dispatch_token
+    return [" ".join(sub(dispatch, strip(t)).split()) for t in texts]
+
+
+# "2 x" → "2*x" and "(x + 2)(x - 2)" → "(x + 2)*(x - 2)", which sympify can't read as written
+_SPACED_PRODUCT_RE = re.compile(r"(?<=\d)\s+(?=[a-zA-Z](?:[\s+\-/)=^]|$))|(?<=\))\s*(?=\()")
+_COEFFICIENT_RE = re.compile(r"(\d*)([a-zA-Z]+)$")
+
+
+def _dispatch_operand_token(match) -> str:
+    word = match.group("word")
+    m = _COEFFICIENT_RE.match(word) if word is not None else None
+    if m and m.group(2).lower() in MATH_FUNCTIONS:
+        coefficient = m.group(1) + "*" if m.group(1) else ""
+        return coefficient + m.group(2).lower() + ("(" if match.group("word_paren") else "")
+    return _dispatch_token(match)
+
+
+def normalize_operand(text: str) -> str:
+    """
+    Normalize the math operand of a query, i.e. the text left once the parser
+    has removed its operation words. Like normalize_math_text, except that
+    function names stay intact and spaced products get an explicit "*", so
+    the result can go straight to the expression parser.
+    """
+    s = _TOKEN_RE.sub(_dispatch_operand_token, _strip_fillers(text))
+    return _SPACED_PRODUCT_RE.sub("*", " ".join(s.split()))
+
+
+def normalize_operands(texts) -> list:
+    """normalize_operand over a batch of texts."""
+    return [normalize_operand(t) for t in texts]
+
+
+_VARIABLE_RE = re.compile(r"[a-zA-Z]")
+_STEP_CONNECTOR_RE = re.compile(r"\b(and then|then|after that|next)\b", re.IGNORECASE)
 
 
 def detect_variables(expression: str) -> list:
     """Return sorted unique variable names (single letters)."""
-    vars_found = sorted(set(re.findall(r"[a-zA-Z]", expression)))
+    vars_found = sorted(set(_VARIABLE_RE.findall(expression)))
     return vars_found
 
 
 def split_multi_steps(user_input: str) -> list:
 
     # normalize connectors to '||'
-    tmp = re.sub(r"\b(and then|then|after that|next)\b", "||", user_input, flags=re.IGNORECASE)
+    tmp = _STEP_CONNECTOR_RE.sub("||", user_input)
     steps = [s.strip(" ,.") for s in tmp.split("||") if s.strip(" ,.")]
     return steps
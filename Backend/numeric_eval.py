@@ -0,0 +1,197 @@
+"""
+numeric_eval.py
+---------------
+Compiled numeric evaluation of f(x), f'(x) and ∫f over grids of points,
+for plots and value tables.
+
+An expression is normalized like any chat operand ("2x^2" → "2*x^2"),
+parsed once and compiled with lambdify to a NumPy function.
+Its derivative and antiderivative are compiled on first use. The compiled
+functions are cached per expression fingerprint, so plotting the same function
+again (zooming, panning, another table) skips SymPy entirely and runs at
+NumPy speed.
+
+The integral column is the definite integral from the first grid point,
+∫[x0, x] f(t) dt. It is read off the symbolic antiderivative when SymPy finds
+one within the "integrate" time budget. Otherwise it is built by cumulative
+trapezoid sums over the grid.
+"""
+
+from collections import OrderedDict
+import threading
+
+from fingerprint import fingerprint
+from nlp_preprocessor import normalize_operand
+from time_budget import TimedOutResult, run_with_budget
+
+CACHE_SIZE = 256
+KINDS = ("f", "derivative", "integral")
+DEFAULT_POINTS = tuple(range(-5, 6))
+
+
+class CompiledExpression:
+    """One parsed expression and its lazily compiled f, f' and antiderivative."""
+
+    def __init__(self, expression: str):
+        from sympy import Symbol
+        from Solvers.expression_parser import parse_expression
+
+        self.expression = expression
+        self.expr = parse_expression(expression)
+        free = sorted(self.expr.free_symbols, key=str)
+        if len(free) > 1:
+            raise ValueError(f"expected a function of one variable, got {', '.join(map(str, free))}")
+        self.var = free[0] if free else Symbol('x')
+        self._functions = {}
+        self._lock = threading.Lock()
+        self.antiderivative = None  # SymPy antiderivative, once found
+
+    def _compile(self, expr):
+        from sympy import lambdify
+        return lambdify(self.var, expr, modules="numpy")
+
+    def function(self, kind: str):
+        """Compiled NumPy function for kind ("f", "derivative" or "antiderivative"); None if unavailable."""
+        with self._lock:
+            if kind in self._functions:
+                return self._functions[kind]
+        if kind == "f":
+            fn = self._compile(self.expr)
+        elif kind == "derivative":
+            from sympy import diff
+            fn = self._compile(diff(self.expr, self.var))
+        elif kind == "antiderivative":
+            from sympy import Integral
+            from pipeline_executor import apply_operation
+            try:
+                result = run_with_budget(apply_operation, ("integrate", self.expr, self.var), "integrate")
+            except RuntimeError:
+                result = None
+            if result is None or isinstance(result, TimedOutResult) or result.has(Integral):
+                fn = None
+            else:
+                self.antiderivative = result
+                fn = self._compile(result)
+        else:
+            raise ValueError(f"unknown function kind {kind!r}")
+        with self._lock:
+            self._functions[kind] = fn
+        return fn
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+hits = 0
+misses = 0
+
+
+def get_compiled(expression: str) -> CompiledExpression:
+    """Cached CompiledExpression for an expression string."""
+    global hits, misses
+    key = fingerprint(expression)
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            hits += 1
+            return compiled
+        misses += 1
+    compiled = CompiledExpression(normalize_operand(" ".join(expression.split())))
+    with _cache_lock:
+        _cache[key] = compiled
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def compiled_cache_stats() -> dict:
+    with _cache_lock:
+        return {"size": len(_cache), "max_size": CACHE_SIZE, "hits": hits, "misses": misses}
+
+
+def clear_compiled_cache() -> None:
+    global hits, misses
+    with _cache_lock:
+        _cache.clear()
+        hits = misses = 0
+
+
+def _apply(fn, x):
+    import numpy as np
+
+    with np.errstate(all="ignore"):
+        values = fn(x)
+    # constants come back as scalars
+    return np.broadcast_to(np.asarray(values, dtype=np.result_type(values, np.float64)), x.shape).copy()
+
+
+def _cumulative_trapezoid(x, y):
+    import numpy as np
+
+    out = np.zeros_like(y)
+    out[1:] = np.cumsum((y[1:] + y[:-1]) * np.diff(x) / 2)
+    return out
+
+
+def evaluate_grid(expression: str, x, kinds=KINDS) -> dict:
+    """
+    Evaluate an expression and its derivative/integral over an array of points.
+
+    Parameters:
+        expression (str): Function of one variable, e.g. "sin(x)*exp(-x/5)".
+        x (array-like): Points to evaluate at (sorted, for the integral).
+        kinds (iterable): Any of "f", "derivative", "integral".
+
+    Returns:
+        dict: {"x": array, kind: array, ...} plus "integral_method"
+        ("exact" or "trapezoid") when the integral was requested.
+    """
+    import numpy as np
+
+    compiled = get_compiled(expression)
+    x = np.asarray(x, dtype=np.float64)
+    out = {"x": x}
+    for kind in kinds:
+        if kind == "f":
+            out["f"] = _apply(compiled.function("f"), x)
+        elif kind == "derivative":
+            out["derivative"] = _apply(compiled.function("derivative"), x)
+        elif kind == "integral":
+            antiderivative = compiled.function("antiderivative")
+            values = None
+            if antiderivative is not None and x.size:
+                try:
+                    values = _apply(antiderivative, x)
+                except (NameError, TypeError):
+                    values = None  # special function NumPy can't evaluate
+            if values is not None:
+                out["integral"] = values - values.flat[0]
+                out["integral_method"] = "exact"
+            else:
+                y = out["f"] if "f" in out else _apply(compiled.function("f"), x)
+                out["integral"] = _cumulative_trapezoid(x, y)
+                out["integral_method"] = "trapezoid"
+        else:
+            raise ValueError(f"unknown kind {kind!r}; expected one of {KINDS}")
+    return out
+
+
+def evaluate_problem(problem) -> str:
+    """
+    Handler for the "evaluate" operation: a table of f, f' and ∫f at
+    problem.points, or just the value of an expression with no variable.
+    """
+    try:
+        compiled = get_compiled(problem.expression)
+        if not compiled.expr.free_symbols:
+            if compiled.expr.is_Integer:
+                return f"Value: {compiled.expr}"
+            return f"Value: {compiled.expr} ≈ {compiled.expr.evalf():.10g}"
+        values = evaluate_grid(problem.expression, problem.points if problem.points is not None else DEFAULT_POINTS)
+    except Exception as e:
+        return f"Error while evaluating: {e}"
+    note = "" if values["integral_method"] == "exact" else " (trapezoid)"
+    rows = [f"x | f(x) | f'(x) | ∫f from {values['x'][0]:g}{note}"]
+    for x, f, d, i in zip(values["x"], values["f"], values["derivative"], values["integral"]):
+        rows.append(f"{x:g} | {f:.6g} | {d:.6g} | {i:.6g}")
+    return "\n".join(rows)
@@ -0,0 +1,205 @@
+"""
+pipeline_executor.py
+--------------------
+Runs multi-step pipelines ("simplify ... then differentiate") on SymPy
+objects.
+
+A step marked "chain" works on the previous step's SymPy result directly,
+with no text round trip. Every other step starts a new chain from its own
+expression. Independent chains run concurrently. Symbolic results are
+memoized on (operation, expression, variable), so a chain that repeats work
+another chain (or an earlier request) already did gets it for free. Steps
+with no symbolic operation (geometry, statistics, ...) go through the regular
+solver path. SymPy is only imported once a symbolic step actually runs.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from time_budget import TimedOutResult, run_with_budget
+
+MAX_PARALLEL_CHAINS = 4
+MEMO_SIZE = 1024
+
+# (subject, operation) → label used when reporting the result
+SYMBOLIC_OPERATIONS = {
+    ("calculus", "differentiate"): "Derivative",
+    ("calculus", "integrate"): "Integral",
+    ("algebra", "simplify"): "Simplified",
+    ("algebra", "expand"): "Expanded",
+    ("algebra", "factor"): "Factored",
+    ("algebra", "solve"): "Solution",
+}
+
+
+def apply_operation(operation: str, expr, var):
+    """Apply one symbolic operation; runs in-process or in a budget worker."""
+    from sympy import expand, factor, integrate, simplify
+
+    if operation == "differentiate":
+        # the shared derivative cache: repeated "then differentiate" steps
+        # extend the same chain of derivatives the nth-derivative solver uses
+        from Solvers.derivatives import derivative
+        return derivative(expr, var)
+    if operation == "integrate":
+        return integrate(expr, var)
+    if operation == "simplify":
+        return simplify(expr)
+    if operation == "expand":
+        return expand(expr)
+    if operation == "factor":
+        return factor(expr)
+    if operation == "solve":
+        from Solvers.equation_solver import solve_equations
+        return solve_equations([expr], [var])[0]
+    raise ValueError(f"unknown symbolic operation {operation!r}")
+
+
+class _StepTimedOut(Exception):
+    def __init__(self, result: TimedOutResult):
+        super().__init__(str(result))
+        self.result = result
+
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def evaluate(operation: str, expr, var):
+    """Memoized apply_operation, run under the operation's time budget."""
+    key = (operation, expr, var)
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+    result = run_with_budget(apply_operation, (operation, expr, var), operation)
+    if isinstance(result, TimedOutResult):
+        raise _StepTimedOut(result)
+    with _memo_lock:
+        _memo[key] = result
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+    return result
+
+
+def clear_memo() -> None:
+    """Forget every memoized symbolic result."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def _variable_for(expr):
+    """Differentiate/integrate/solve for x when present, else the first free symbol."""
+    from sympy import Symbol
+
+    x = Symbol('x')
+    free = getattr(expr, "free_symbols", set())
+    if not free or x in free:
+        return x
+    return sorted(free, key=str)[0]
+
+
+def _to_symbolic(expression: str):
+    """Parse a step's text; 'lhs = rhs' becomes an equation."""
+    from sympy import Eq
+    from Solvers.expression_parser import parse_expression
+
+    if "=" in expression:
+        lhs, rhs = expression.split("=", 1)
+        return Eq(parse_expression(lhs), parse_expression(rhs))
+    return parse_expression(expression)
+
+
+def _format(label: str, operation: str, value) -> str:
+    if operation == "integrate":
+        return f"{label}: {value} + C"
+    return f"{label}: {value}"
+
+
+def _run_chain(steps: list, step_by_step: bool, solve_step) -> list:
+    """Run consecutive dependent steps; returns [(index, text)]."""
+    outputs = []
+    value = None  # SymPy result of the previous step, if it produced one
+    for index, step in steps:
+        subject = (step.get("subject") or "").lower()
+        operation = (step.get("operation") or "").lower()
+        label = SYMBOLIC_OPERATIONS.get((subject, operation))
+
+        if label is None:
+            outputs.append((index, solve_step(step, step_by_step)))
+            value = None
+            continue
+
+        try:
+            current = value if (step.get("chain") and value is not None) else _to_symbolic(step.get("expression", ""))
+            if getattr(current, "is_Relational", False) and operation != "solve":
+                current = current.lhs - current.rhs
+            result = evaluate(operation, current, _variable_for(current))
+        except _StepTimedOut as e:
+            outputs.append((index, e.result))
+            value = None
+            continue
+        except Exception:
+            # Text the symbolic path can't handle still gets the solver's answer.
+            outputs.append((index, solve_step(step, step_by_step)))
+            value = None
+            continue
+
+        if step_by_step:
+            # The solvers own the explanations; hand them the expression this
+            # step actually worked on.
+            text = solve_step({**step, "expression": str(current)}, step_by_step)
+        else:
+            text = _format(label, operation, result)
+        outputs.append((index, text))
+        # A list of solutions ends the chain.
+        value = None if operation == "solve" else result
+    return outputs
+
+
+def _group_chains(pipeline: list) -> list:
+    """Split a pipeline into chains of dependent steps: [[(index, step), ...], ...]."""
+    chains = []
+    for index, step in enumerate(pipeline):
+        if step.get("chain") and chains:
+            chains[-1].append((index, step))
+        else:
+            chains.append([(index, step)])
+    return chains
+
+
+def iter_pipeline(pipeline: list, step_by_step: bool, solve_step):
+    """
+    Streaming run_pipeline: yields (index, answer) chain by chain, as soon as
+    each chain finishes. Chains run one after another here, so the first
+    answers arrive early rather than all at once.
+    """
+    for chain in _group_chains(pipeline):
+        yield from _run_chain(chain, step_by_step, solve_step)
+
+
+def run_pipeline(pipeline: list, step_by_step: bool, solve_step) -> list:
+    """
+    Execute a parsed pipeline and return one answer per step, in order.
+
+    Parameters:
+        pipeline (list): Step dicts from nlp_parser (subject, operation,
+            expression, chain).
+        step_by_step (bool): Ask for explanations rather than bare results.
+        solve_step (callable): (step, step_by_step) -> answer, used for steps
+            without a symbolic fast path.
+    """
+    chains = _group_chains(pipeline)
+    if len(chains) == 1:
+        results = _run_chain(chains[0], step_by_step, solve_step)
+    else:
+        workers = min(len(chains), MAX_PARALLEL_CHAINS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline") as pool:
+            futures = [pool.submit(_run_chain, chain, step_by_step, solve_step) for chain in chains]
+            results = [item for future in futures for item in future.result()]
+
+    answers = [None] * len(pipeline)
+    for index, text in results:
+        answers[index] = text
+    return answers
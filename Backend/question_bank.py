@@ -0,0 +1,396 @@
+"""
+question_bank.py
+----------------
+Precomputed practice questions for question_generator.
+
+Questions come from parameterized templates: each template draws its
+parameters from fixed ranges, renders the question text and computes the
+answer (with SymPy for algebra and calculus). The bank is built offline, with
+answers computed across worker processes, and written to one compact binary
+file:
+
+    b"QBNK" | u16 version | u32 header length | JSON header
+    index:   one u64 record offset per question, per subject
+    records: u16 question length | u16 answer length | UTF-8 question | UTF-8 answer
+
+The header maps each subject to (index offset, count). QuestionBank
+memory-maps the file, so a lookup is a couple of struct reads and sampling a
+question is O(1) with no SymPy work.
+
+Build the bank:
+    python question_bank.py build [--per-subject 3000] [--workers N] [path]
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import mmap
+import os
+import random
+import statistics
+import struct
+
+BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.qb")
+MAGIC = b"QBNK"
+VERSION = 1
+_PREFIX = struct.Struct("<4sHI")
+_OFFSET = struct.Struct("<Q")
+_LENGTHS = struct.Struct("<HH")
+
+# ranges: one range per parameter; question/answer: (*params) -> str;
+# draw: optional (rng) -> params, for parameters that aren't independent
+Template = namedtuple("Template", "name ranges question answer draw", defaults=(None,))
+
+_SUPERSCRIPTS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+def _term(coef: int, power: int) -> str:
+    """One unsigned term of a polynomial in x, e.g. 3x², x, 7."""
+    coef = abs(coef)
+    if power == 0:
+        return str(coef)
+    base = "x" if power == 1 else "x" + str(power).translate(_SUPERSCRIPTS)
+    return base if coef == 1 else f"{coef}{base}"
+
+
+def _poly(coeffs) -> str:
+    """Render coefficients (highest power first) as '3x² - 2x + 5'."""
+    degree = len(coeffs) - 1
+    text = ""
+    for i, coef in enumerate(coeffs):
+        if coef == 0:
+            continue
+        term = _term(coef, degree - i)
+        if not text:
+            text = term if coef > 0 else f"-{term}"
+        else:
+            text += f" + {term}" if coef > 0 else f" - {term}"
+    return text or "0"
+
+
+def _signed(n: int) -> str:
+    return f"+ {n}" if n >= 0 else f"- {-n}"
+
+
+# ----------------------------------------------------------------- answers
+# Answer functions run offline (or on the no-bank fallback path), never when
+# sampling from a built bank.
+
+def _sympy_x():
+    from sympy import symbols
+    return symbols('x')
+
+
+def _solve_linear(a, b, x0):
+    from sympy import Eq, solve
+    x = _sympy_x()
+    return ", ".join(str(s) for s in solve(Eq(a * x + b, a * x0 + b), x))
+
+
+def _factor_quadratic(r1, r2):
+    from sympy import factor
+    x = _sympy_x()
+    return str(factor((x - r1) * (x - r2)))
+
+
+def _expand_product(a, b):
+    from sympy import expand
+    x = _sympy_x()
+    return str(expand((x + a) * (x - b)))
+
+
+def _poly_expr(coeffs):
+    x = _sympy_x()
+    degree = len(coeffs) - 1
+    return sum(c * x ** (degree - i) for i, c in enumerate(coeffs))
+
+
+def _differentiate(*coeffs):
+    from sympy import diff
+    return str(diff(_poly_expr(coeffs), _sympy_x()))
+
+
+def _integrate(*coeffs):
+    from sympy import integrate
+    return str(integrate(_poly_expr(coeffs), _sympy_x())) + " + C"
+
+
+_FUNCTIONS = ("sin", "cos", "exp")
+
+
+def _differentiate_function(f, a, b):
+    import sympy
+    x = _sympy_x()
+    return str(sympy.diff(a * getattr(sympy, _FUNCTIONS[f])(b * x), x))
+
+
+def _function_text(f, a, b):
+    inner = "x" if b == 1 else f"{b}x"
+    return f"{'' if a == 1 else a}{_FUNCTIONS[f]}({inner})"
+
+
+_GEOMETRY_CASES = (
+    ("circle", "area", "radius {0}"),
+    ("circle", "perimeter", "radius {0}"),
+    ("rectangle", "area", "length {0} and width {1}"),
+    ("rectangle", "perimeter", "length {0} and width {1}"),
+    ("triangle", "area", "base {0} and height {1}"),
+    ("cube", "volume", "side {0}"),
+    ("sphere", "volume", "radius {0}"),
+    ("cylinder", "volume", "radius {0} and height {1}"),
+    ("cone", "volume", "radius {0} and height {1}"),
+)
+_QUANTITY_WORDS = {"perimeter": "circumference"}
+
+
+def _geometry_question(case, d1, d2):
+    shape, quantity, dims = _GEOMETRY_CASES[case]
+    word = _QUANTITY_WORDS.get(quantity, quantity) if shape == "circle" else quantity
+    return f"Find the {word} of a {shape} with {dims.format(d1, d2)}."
+
+
+def _geometry_answer(case, d1, d2):
+    from Solvers.geometry_solver import lookup
+    shape, quantity, _ = _GEOMETRY_CASES[case]
+    formula = lookup(shape, quantity)
+    return f"{formula.fn(*(d1, d2)[:len(formula.params)]):.2f}"
+
+
+_STATISTICS_OPS = ("mean", "median", "mode", "range")
+_STATISTICS_VALUES = range(1, 50)
+
+
+def _statistics_values(values):
+    # repeat the first value so every list has a mode
+    return list(values) + [values[0]]
+
+
+def _draw_statistics(rng) -> tuple:
+    # distinct values, so the repeated first one is the only mode
+    return (rng.randrange(len(_STATISTICS_OPS)), *rng.sample(_STATISTICS_VALUES, 5))
+
+
+def _statistics_question(op, *values):
+    numbers = ", ".join(str(v) for v in _statistics_values(values))
+    return f"Find the {_STATISTICS_OPS[op]} of {numbers}."
+
+
+def _statistics_answer(op, *values):
+    values = _statistics_values(values)
+    name = _STATISTICS_OPS[op]
+    if name == "mean":
+        return f"{statistics.mean(values):.2f}"
+    if name == "median":
+        return f"{statistics.median(values):g}"
+    if name == "mode":
+        return str(statistics.mode(values))
+    return str(max(values) - min(values))
+
+
+TEMPLATES = {
+    "algebra": [
+        Template("linear", (range(2, 13), range(-20, 21), range(-12, 13)),
+                 lambda a, b, x0: f"Solve: {a}x {_signed(b)} = {a * x0 + b}",
+                 _solve_linear),
+        Template("scale", (range(2, 16), range(0, 1), range(-15, 16)),
+                 lambda a, _, x0: f"What is x if {a}x = {a * x0}?",
+                 _solve_linear),
+        Template("factor", (range(-12, 13), range(-12, 13)),
+                 lambda r1, r2: f"Factor: {_poly((1, -(r1 + r2), r1 * r2))}",
+                 _factor_quadratic),
+        Template("simplify", (range(1, 31), range(1, 31)),
+                 lambda a, b: f"Simplify: (x + {a})(x - {b})",
+                 _expand_product),
+    ],
+    "calculus": [
+        Template("differentiate", (range(1, 6), range(-9, 10), range(-9, 10), range(0, 10)),
+                 lambda *c: f"Differentiate: {_poly(c)}",
+                 _differentiate),
+        Template("function_derivative", (range(len(_FUNCTIONS)), range(1, 10), range(1, 10)),
+                 lambda f, a, b: f"What is the derivative of {_function_text(f, a, b)}?",
+                 _differentiate_function),
+        Template("integrate", (range(1, 10), range(-9, 10), range(0, 10)),
+                 lambda *c: f"Integrate: {_poly(c)}",
+                 _integrate),
+        Template("antiderivative", (range(1, 10), range(0, 1), range(1, 9)),
+                 lambda a, _, n: f"Find the antiderivative of {_term(a, n)}",
+                 lambda a, _, n: _integrate(a, *([0] * n))),
+    ],
+    "geometry": [
+        Template("formula", (range(len(_GEOMETRY_CASES)), range(1, 31), range(1, 31)),
+                 _geometry_question, _geometry_answer),
+    ],
+    "statistics": [
+        Template("summary", (range(len(_STATISTICS_OPS)),) + (_STATISTICS_VALUES,) * 5,
+                 _statistics_question, _statistics_answer, _draw_statistics),
+    ],
+}
+
+
+def _draw(template: Template, rng) -> tuple:
+    if template.draw is not None:
+        return template.draw(rng)
+    return tuple(rng.choice(r) for r in template.ranges)
+
+
+def live_question(subject: str, rng=random) -> dict:
+    """Render and answer one random template instance right now (no bank needed)."""
+    template = rng.choice(TEMPLATES[subject])
+    params = _draw(template, rng)
+    return {"question": template.question(*params), "answer": template.answer(*params)}
+
+
+# ----------------------------------------------------------------- building
+
+def _answer_chunk(items: list) -> list:
+    """Worker entry point: answer (subject, template name, params) items."""
+    by_name = {(s, t.name): t for s, templates in TEMPLATES.items() for t in templates}
+    return [by_name[(subject, name)].answer(*params) for subject, name, params in items]
+
+
+def _draw_distinct(subject: str, per_subject: int, rng) -> list:
+    """Distinct template instances for a subject, spread evenly over its templates."""
+    templates = TEMPLATES[subject]
+    items, seen = [], set()
+    for i, template in enumerate(templates):
+        target = per_subject // len(templates) + (i < per_subject % len(templates))
+        attempts = 0
+        while target and attempts < 20 * target:
+            attempts += 1
+            params = _draw(template, rng)
+            question = template.question(*params)
+            if question in seen:
+                continue
+            seen.add(question)
+            items.append((question, (subject, template.name, params)))
+            target -= 1
+    return items
+
+
+def build_bank(path: str = BANK_PATH, per_subject: int = 3000, workers: int = None,
+               seed: int = 0) -> dict:
+    """
+    Generate, answer and write a question bank.
+
+    Parameters:
+        path (str): Output file.
+        per_subject (int): Distinct questions to aim for per subject.
+        workers (int or None): Processes used to compute answers; defaults to
+            the CPU count. workers=1 answers in the calling process.
+        seed (int): Seed for the parameter draws.
+
+    Returns:
+        dict: Number of questions written per subject.
+    """
+    rng = random.Random(seed)
+    drawn = {subject: _draw_distinct(subject, per_subject, rng) for subject in TEMPLATES}
+    items = [item for subject in TEMPLATES for _, item in drawn[subject]]
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1:
+        answers = _answer_chunk(items)
+    else:
+        chunksize = max(1, len(items) // (workers * 4))
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            answers = [a for chunk in pool.map(_answer_chunk, chunks) for a in chunk]
+
+    records = []
+    answer_iter = iter(answers)
+    for subject in TEMPLATES:
+        records.append([(question, next(answer_iter)) for question, _ in drawn[subject]])
+    _write_bank(path, dict(zip(TEMPLATES, records)))
+    return {subject: len(drawn[subject]) for subject in TEMPLATES}
+
+
+def _write_bank(path: str, bank: dict) -> None:
+    # The header holds absolute offsets, which depend on its own length; size
+    # it with placeholder offsets first, then fill them in.
+    counts = {subject: len(rows) for subject, rows in bank.items()}
+    header = json.dumps({"subjects": {s: [0, n] for s, n in counts.items()}})
+    header_len = len(header.encode()) + 20 * len(counts)  # room for the real offsets
+
+    index_start = _PREFIX.size + header_len
+    index_offsets, pos = {}, index_start
+    for subject, n in counts.items():
+        index_offsets[subject] = pos
+        pos += n * _OFFSET.size
+
+    index, blob = bytearray(), bytearray()
+    for subject, rows in bank.items():
+        for question, answer in rows:
+            q, a = question.encode(), answer.encode()
+            index += _OFFSET.pack(pos + len(blob))
+            blob += _LENGTHS.pack(len(q), len(a)) + q + a
+
+    header = json.dumps({"subjects": {s: [index_offsets[s], n] for s, n in counts.items()}})
+    header = header.encode().ljust(header_len)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, header_len) + header + index + blob)
+    os.replace(tmp, path)
+
+
+# ------------------------------------------------------------------ reading
+
+class QuestionBank:
+    """
+    Read-only, memory-mapped view of a bank file.
+
+    Parameters:
+        path (str): Bank file written by build_bank.
+    """
+
+    def __init__(self, path: str = BANK_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_len = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} question bank")
+        header = json.loads(bytes(self._map[_PREFIX.size:_PREFIX.size + header_len]))
+        self._subjects = {s: tuple(v) for s, v in header["subjects"].items()}
+
+    def subjects(self) -> list:
+        return list(self._subjects)
+
+    def count(self, subject: str) -> int:
+        return self._subjects.get(subject, (0, 0))[1]
+
+    def get(self, subject: str, i: int) -> dict:
+        index_offset, count = self._subjects[subject]
+        if not 0 <= i < count:
+            raise IndexError(i)
+        (offset,) = _OFFSET.unpack_from(self._map, index_offset + i * _OFFSET.size)
+        q_len, a_len = _LENGTHS.unpack_from(self._map, offset)
+        start = offset + _LENGTHS.size
+        return {"question": self._map[start:start + q_len].decode(),
+                "answer": self._map[start + q_len:start + q_len + a_len].decode()}
+
+    def sample(self, subject: str, rng=random) -> dict:
+        """One uniformly random question for subject."""
+        return self.get(subject, rng.randrange(self.count(subject)))
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the practice question bank.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("path", nargs="?", default=BANK_PATH)
+    parser.add_argument("--per-subject", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = build_bank(args.path, args.per_subject, args.workers, args.seed)
+    for subject, n in counts.items():
+        print(f"{subject:>10}: {n} questions")
+    print(f"Wrote {args.path} ({os.path.getsize(args.path) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
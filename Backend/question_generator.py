@@ -1,62 +1,81 @@
+import logging
+import os
 import random
-from sympy import symbols, simplify, diff, integrate
+import subprocess
+import sys
+import tempfile
+import threading
 
-x = symbols('x')
+import question_bank
+from question_bank import BANK_PATH, TEMPLATES, QuestionBank, live_question
+
+logger = logging.getLogger(__name__)
+
+_bank = None
+_bank_lock = threading.Lock()
+_build = None  # (process, stderr file, path) of a background `question_bank.py build`
+
+
+def _check_build() -> None:
+    """Reap a finished background build: load the bank it wrote, or log why it failed."""
+    global _bank, _build
+    if _build is None:
+        return
+    process, errors, path = _build
+    if process.poll() is None:
+        return
+    _build = None
+    if process.returncode == 0 and os.path.exists(path):
+        _bank = QuestionBank(path)
+    else:
+        errors.seek(0)
+        logger.error("building the question bank failed (exit code %s): %s", process.returncode,
+                     errors.read().decode("utf-8", "replace").strip()[-2000:])
+    errors.close()
+
+
+def load_question_bank(path: str = BANK_PATH, build_if_missing: bool = True):
+    """
+    Memory-map the precomputed question bank. Call at startup: when the file
+    is missing, it is built (`python question_bank.py build`) in a background
+    process and None is returned until that finishes. generate_question picks
+    up the finished bank; a failed build is logged and started again by the
+    next load_question_bank call.
+    """
+    global _bank, _build
+    with _bank_lock:
+        _check_build()
+        if _bank is None and _build is None and os.path.exists(path):
+            _bank = QuestionBank(path)
+        elif _bank is None and build_if_missing and _build is None:
+            errors = tempfile.TemporaryFile()
+            process = subprocess.Popen([sys.executable, question_bank.__file__, "build", path],
+                                       stdout=subprocess.DEVNULL, stderr=errors)
+            _build = (process, errors, path)
+        return _bank
 
 
 def generate_question(subject):
     """
     Generates a math question and its answer based on the given subject.
 
+    Questions are sampled from the precomputed bank. While the bank is
+    missing or still being built (see load_question_bank), one template is
+    rendered and answered on the spot.
+
     Returns:
         dict: { "question": str, "answer": str }
     """
 
-    if subject == "algebra":
-        templates = [
-            lambda: {
-                "question": "Solve: 2x + 5 = 13",
-                "answer": "4"
-            },
-            lambda: {
-                "question": "What is x if 3x = 12?",
-                "answer": "4"
-            },
-            lambda: {
-                "question": "Factor: x² - 9",
-                "answer": "(x - 3)(x + 3)"
-            },
-            lambda: {
-                "question": "Simplify: (x + 2)(x - 2)",
-                "answer": simplify((x + 2) * (x - 2)).__str__()
-            }
-        ]
-
-    elif subject == "calculus":
-        templates = [
-            lambda: {
-                "question": "Differentiate: x²",
-                "answer": diff(x ** 2, x).__str__()
-            },
-            lambda: {
-                "question": "What is the derivative of sin(x)?",
-                "answer": "cos(x)"
-            },
-            lambda: {
-                "question": "Integrate: x",
-                "answer": integrate(x, x).__str__() + " + C"
-            },
-            lambda: {
-                "question": "Find the antiderivative of x²",
-                "answer": integrate(x ** 2, x).__str__() + " + C"
-            }
-        ]
+    bank = _bank or load_question_bank(build_if_missing=False)
+    if bank is not None and bank.count(subject):
+        return bank.sample(subject)
 
-    else:
-        # fallback if no subject match
-        return {
-            "question": "Sorry, I don't have questions for that subject yet.",
-            "answer": ""
-        }
+    if subject in TEMPLATES:
+        return live_question(subject, random)
 
-    return random.choice(templates)()
+    # fallback if no subject match
+    return {
+        "question": "Sorry, I don't have questions for that subject yet.",
+        "answer": ""
+    }
@@ -0,0 +1,193 @@
+"""
+result_cache.py
+---------------
+Two-tier cache for solved problems.
+
+Answers are keyed on (subject, operation, canonical expression, step_by_step).
+Algebra and calculus expressions are keyed on their fingerprint (see
+fingerprint.py), so "2x+1" and "1 + 2*x" share one entry; other subjects'
+text is keyed with its whitespace collapsed. Steps with extra parameters
+(integral bounds, derivative or series order, ...) add them to the key.
+Lookups go to an in-memory LRU first and then, if configured, to an SQLite
+file that survives restarts. Only string answers are written to disk; other
+results stay in the memory tier. UncachedAnswer results are not stored at all.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_SIZE = 2048
+# subjects whose expressions are parsed by SymPy, and so can be fingerprinted
+SYMBOLIC_SUBJECTS = {"algebra", "calculus"}
+# parsed step fields, besides the expression, that change the answer
+STEP_PARAMETERS = ("bounds", "order", "wrt", "point")
+
+
+class UncachedAnswer(str):
+    """An answer string that put() doesn't store, e.g. an approximation a later call may improve on."""
+
+
+def canonical_expression(expression: str) -> str:
+    """Canonical form of an expression string used in cache keys."""
+    return " ".join((expression or "").split())
+
+
+def _parameter_key(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_parameter_key(v) for v in value)
+    return canonical_expression(value) if isinstance(value, str) else value
+
+
+def make_key(subject, operation, expression, step_by_step, params: dict = None) -> tuple:
+    """
+    Cache key for a solver call. params is the parsed step; any STEP_PARAMETERS
+    it sets are appended to the key.
+    """
+    subject = (subject or "").lower()
+    if subject in SYMBOLIC_SUBJECTS:
+        from fingerprint import fingerprint
+        expression_key = fingerprint(expression)
+    else:
+        expression_key = canonical_expression(expression)
+    key = (subject, (operation or "").lower(), expression_key, bool(step_by_step))
+    extra = tuple((name, _parameter_key(params[name])) for name in STEP_PARAMETERS
+                  if params and params.get(name) is not None)
+    return key + extra if extra else key
+
+
+class ResultCache:
+    """
+    In-memory LRU of solver answers with an optional SQLite tier.
+
+    Parameters:
+        max_size (int): Number of answers kept in memory.
+        disk_path (str or None): SQLite file for the persistent tier; None keeps
+            the cache memory-only.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, disk_path: str = None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.disk_path = disk_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, answer TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _disk_key(key: tuple) -> str:
+        return json.dumps(key)
+
+    def get(self, key: tuple):
+        """Return the cached answer for key, or None on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT answer FROM results WHERE key = ?", (self._disk_key(key),)
+                ).fetchone()
+                if row is not None:
+                    self.disk_hits += 1
+                    self._store_memory(key, row[0])
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, answer) -> None:
+        if isinstance(answer, UncachedAnswer):
+            return
+        with self._lock:
+            self._store_memory(key, answer)
+            if self._db is not None and isinstance(answer, str):
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, answer, created) VALUES (?, ?, ?)",
+                    (self._disk_key(key), answer, time.time()),
+                )
+                self._db.commit()
+
+    def __contains__(self, key: tuple) -> bool:
+        with self._lock:
+            if key in self._entries:
+                return True
+            if self._db is None:
+                return False
+            return self._db.execute(
+                "SELECT 1 FROM results WHERE key = ?", (self._disk_key(key),)
+            ).fetchone() is not None
+
+    def clear(self, disk: bool = False) -> None:
+        """Empty the memory tier (and the disk tier if disk=True) and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = self.disk_hits = self.misses = self.evictions = 0
+            if disk and self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            disk_size = None
+            if self._db is not None:
+                disk_size = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "disk_size": disk_size,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def _store_memory(self, key: tuple, answer) -> None:
+        self._entries[key] = answer
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    return _cache
+
+
+def configure_result_cache(max_size: int = DEFAULT_MAX_SIZE, disk_path: str = None) -> ResultCache:
+    """Replace the shared cache, e.g. to enable the on-disk tier at startup."""
+    global _cache
+    _cache.close()
+    _cache = ResultCache(max_size=max_size, disk_path=disk_path)
+    return _cache
+
+
+def result_cache_stats() -> dict:
+    return _cache.stats()
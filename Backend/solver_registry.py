@@ -0,0 +1,89 @@
+"""
+solver_registry.py
+------------------
+Maps (subject, operation) to the handler that solves it.
+
+Handlers take a Solvers.problem.Problem and return the answer text. The table
+is built once at import and names each handler by module and function, so a
+solver module (and SymPy with it) is only imported the first time one of its
+operations is asked for. Lookups are plain dict hits:
+
+    (subject, operation)  the handler for that operation
+    (None, operation)     operations any subject can ask for ("evaluate")
+    (subject, None)       the subject's fallback when no operation was named
+
+New operations are added with register(), no change to math_engine needed.
+"""
+
+import importlib
+import threading
+
+HANDLERS = {
+    ("calculus", "differentiate"): ("Solvers.calculus_solver", "solve_derivative"),
+    ("calculus", "integrate"): ("Solvers.calculus_solver", "solve_integral"),
+    ("calculus", "definite_integral"): ("integration", "solve_definite_integral"),
+    ("calculus", "nth_derivative"): ("Solvers.calculus_solver", "solve_nth_derivative"),
+    ("calculus", "partial_derivative"): ("Solvers.calculus_solver", "solve_partial_derivative"),
+    ("calculus", "series"): ("Solvers.calculus_solver", "solve_series"),
+    ("calculus", None): ("Solvers.calculus_solver", "unknown_operation"),
+    ("algebra", "simplify"): ("Solvers.algebra_solver", "rewrite_expression"),
+    ("algebra", "expand"): ("Solvers.algebra_solver", "rewrite_expression"),
+    ("algebra", "factor"): ("Solvers.algebra_solver", "rewrite_expression"),
+    ("algebra", "solve"): ("Solvers.algebra_solver", "solve_equation"),
+    ("algebra", None): ("Solvers.algebra_solver", "solve_equation"),
+    **{("geometry", op): ("Solvers.geometry_solver", "solve_geometry_problem")
+       for op in ("area", "perimeter", "volume", "diameter", "hypotenuse", "diagonal", None)},
+    **{("statistics", op): ("Solvers.stats_solver", "solve_statistics_problem")
+       for op in ("mean", "median", "mode", "variance", "std", None)},
+    **{("statistics", op): ("Solvers.stats_solver", "solve_counting_problem")
+       for op in ("probability", "combination", "permutation")},
+    (None, "evaluate"): ("numeric_eval", "evaluate_problem"),
+}
+
+_resolved = {}
+_lock = threading.Lock()
+
+
+def register(subject, operation, handler) -> None:
+    """
+    Add or replace a handler.
+
+    Parameters:
+        subject (str or None): e.g. "calculus"; None for every subject.
+        operation (str or None): e.g. "differentiate"; None for the subject's fallback.
+        handler (callable or tuple): Problem -> answer, or a (module, function)
+            pair imported on first use.
+    """
+    with _lock:
+        HANDLERS[(subject, operation)] = handler
+        _resolved.pop((subject, operation), None)
+
+
+def _resolve(key):
+    handler = _resolved.get(key)
+    if handler is not None:
+        return handler
+    spec = HANDLERS[key]
+    if callable(spec):
+        return spec
+    module_name, func_name = spec
+    handler = getattr(importlib.import_module(module_name), func_name)
+    with _lock:
+        _resolved[key] = handler
+    return handler
+
+
+def get_handler(subject, operation):
+    """The handler for (subject, operation), falling back as described above; None if there is none."""
+    for key in ((subject, operation), (None, operation), (subject, None)):
+        if key in HANDLERS:
+            return _resolve(key)
+    return None
+
+
+def dispatch(problem):
+    """Solve a Problem with its registered handler."""
+    handler = get_handler(problem.subject, problem.operation)
+    if handler is None:
+        return "Sorry, I don't know how to solve that type of problem yet."
+    return handler(problem)
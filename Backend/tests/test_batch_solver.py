@@ -0,0 +1,24 @@
+"""
+test_batch_solver.py
+--------------------
+Batches solved after the parent has used its budget workers must not share
+those workers between pool processes.
+"""
+
+from batch_solver import solve_batch
+from time_budget import run_with_budget
+
+
+def _integrate(text):
+    from sympy import integrate, sympify
+    return integrate(sympify(text))
+
+
+def test_batch_after_parent_used_budget_workers():
+    assert str(run_with_budget(_integrate, ("x**2",), "integrate")) == "x**3/3"
+
+    queries = [f"integrate x**{k}" for k in range(1, 17)]
+    answers = solve_batch(queries, workers=4, chunksize=1)
+
+    for k, answer in enumerate(answers, start=1):
+        assert answer == f"Integral: x**{k + 1}/{k + 1} + C"
@@ -0,0 +1,37 @@
+"""
+test_detect_operations.py
+-------------------------
+Keyword detection in nlp_parser, including keywords that overlap.
+"""
+
+import pytest
+
+from nlp_parser import _detect_operations, parse_user_input
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("differentiate x^2 then integrate", ["differentiate", "integrate"]),
+    ("integrate it after you differentiate x^2", ["integrate", "differentiate"]),
+    ("simplify x + x and simplify again", ["simplify"]),
+    # overlapping keys: the longest one at a spot is reported, not its parts
+    ("taylor series of sin(x)", ["taylor series"]),
+    ("maclaurin series of exp(x)", ["maclaurin series"]),
+    ("standard deviation of 1, 2, 3", ["standard deviation"]),
+    ("std of 1, 2, 3", ["std"]),
+    # a shorter key still counts where it appears on its own
+    ("taylor series of sin(x), then the series of cos(x)", ["taylor series", "series"]),
+    ("evaluate the integral of x", ["evaluate", "integral"]),
+])
+def test_detect_operations(text, expected):
+    assert _detect_operations(text) == expected
+
+
+@pytest.mark.parametrize("text, subject, operation", [
+    ("taylor series of sin(x)", "calculus", "series"),
+    ("standard deviation of 1, 2, 3", "statistics", "std"),
+    ("evaluate the integral of x", "calculus", "integrate"),
+    ("evaluate 2x^2 at x = 3", "algebra", "evaluate"),
+])
+def test_first_operation_decides(text, subject, operation):
+    parsed = parse_user_input(text)
+    assert (parsed["subject"], parsed["operation"]) == (subject, operation)
@@ -0,0 +1,28 @@
+"""
+test_golden_normalize.py
+------------------------
+normalize_math_text and normalize_many must reproduce the outputs recorded in
+benchmarks/golden/normalize_math_text.json.
+"""
+
+import json
+import os
+
+import pytest
+
+from nlp_preprocessor import normalize_math_text, normalize_many
+
+GOLDEN_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "benchmarks", "golden", "normalize_math_text.json")
+
+with open(GOLDEN_FILE, encoding="utf-8") as f:
+    GOLDEN = json.load(f)
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=lambda case: case["input"])
+def test_normalize_math_text(case):
+    assert normalize_math_text(case["input"]) == case["output"]
+
+
+def test_normalize_many():
+    assert normalize_many([case["input"] for case in GOLDEN]) == [case["output"] for case in GOLDEN]
@@ -0,0 +1,292 @@
+"""
+time_budget.py
+--------------
+Per-operation time budgets for SymPy-heavy solver calls.
+
+Budgeted calls run in long-lived worker processes. If a call is still busy
+when its operation's budget runs out, the worker is killed and replaced,
+and the caller gets a TimedOutResult instead of waiting forever. Operations
+without a budget run inline in the calling process.
+
+Workers come from a forkserver (spawn where that is unavailable), never a
+plain fork: the service process runs threads (history writer, pipeline pool,
+asyncio), and forking it could copy a lock some other thread holds. The
+forkserver preloads SymPy and the solver modules workers run, so a new
+worker starts in milliseconds.
+
+Like any forkserver/spawn user, a script that solves problems must guard its
+entry point with ``if __name__ == "__main__":``; each worker imports the
+script's main module, and an unguarded one runs again there. When a worker
+can't be started at all (that case included), the call runs inline without
+a time budget and a warning is logged.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# operation → seconds; None (or a missing entry) means "run inline, no limit"
+TIME_BUDGETS = {
+    "integrate": 10.0,
+    "simplify": 5.0,
+    "expand": 5.0,
+    "factor": 5.0,
+    "solve": 10.0,
+}
+
+MAX_WORKERS = 2
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+FORKSERVER_PRELOAD = ["sympy", "math_engine", "pipeline_executor", "integration",
+                      "Solvers.algebra_solver", "Solvers.calculus_solver",
+                      "Solvers.equation_solver", "Solvers.derivatives"]
+# how often a cancellable call checks its cancel event
+CANCEL_POLL_SECONDS = 0.02
+
+
+class TimedOutResult:
+    """Answer returned when an operation exceeds its time budget."""
+
+    def __init__(self, operation: str, budget: float):
+        self.operation = operation
+        self.budget = budget
+        self.timed_out = True
+
+    def to_dict(self) -> dict:
+        return {"status": "timed_out", "operation": self.operation, "budget_seconds": self.budget}
+
+    def __str__(self):
+        return (f"Sorry, the {self.operation or 'solve'} step took longer than "
+                f"{self.budget:g}s and was stopped. Try a simpler form of the problem.")
+
+    def __repr__(self):
+        return f"TimedOutResult(operation={self.operation!r}, budget={self.budget!r})"
+
+
+def _worker_main(conn):
+    """Worker loop: receive (fn, args), send back ("ok", result) or ("error", message)."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        fn, args = task
+        try:
+            conn.send(("ok", fn(*args)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class BudgetRunner:
+    """
+    Pool of killable worker processes that enforces per-call deadlines.
+
+    Parameters:
+        max_workers (int): Upper bound on concurrently running worker processes.
+        context (str): multiprocessing start method ("forkserver" or "spawn";
+            "fork" is unsafe in a threaded process).
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, context: str = START_METHOD):
+        self._ctx = multiprocessing.get_context(context)
+        if context == "forkserver":
+            self._ctx.set_forkserver_preload(FORKSERVER_PRELOAD)
+        self._max_workers = max_workers
+        self._idle = []
+        self._live = 0
+        self._cond = threading.Condition()
+        self._metrics = {}
+
+    def _acquire(self) -> _Worker:
+        with self._cond:
+            while not self._idle and self._live >= self._max_workers:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._live += 1
+        try:
+            return _Worker(self._ctx)
+        except Exception:
+            self._discard()
+            raise
+
+    def _release(self, worker: _Worker) -> None:
+        with self._cond:
+            self._idle.append(worker)
+            self._cond.notify()
+
+    def _discard(self) -> None:
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    def _record(self, operation: str, elapsed: float, timed_out: bool, cancelled: bool = False) -> None:
+        with self._cond:
+            m = self._metrics.setdefault(operation, {"runs": 0, "timeouts": 0, "cancelled": 0,
+                                                     "total_seconds": 0.0})
+            m["runs"] += 1
+            m["timeouts"] += int(timed_out)
+            m["cancelled"] += int(cancelled)
+            m["total_seconds"] += elapsed
+
+    def _wait(self, worker: _Worker, budget: float, cancel) -> bool:
+        """Wait for the worker's answer; False on timeout or once cancel is set."""
+        if cancel is None:
+            return worker.conn.poll(budget)
+        deadline = time.perf_counter() + budget
+        while not cancel.is_set():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            if worker.conn.poll(min(remaining, CANCEL_POLL_SECONDS)):
+                return True
+        return False
+
+    def run(self, fn, args: tuple, operation: str, budget: float, cancel=None):
+        """
+        Run fn(*args) in a worker; return its result or a TimedOutResult.
+        Setting the threading.Event cancel stops the call early (the worker
+        is killed and a TimedOutResult returned). If no worker can be
+        started, fn runs inline with no budget.
+        """
+        try:
+            worker = self._acquire()
+        except (RuntimeError, OSError) as e:
+            logger.warning("could not start a solver worker, running %r without a time budget: %s",
+                           operation, " ".join(str(e).split()) or type(e).__name__)
+            return fn(*args)
+        start = time.perf_counter()
+        try:
+            worker.conn.send((fn, args))
+            finished = self._wait(worker, budget, cancel)
+            if finished:
+                status, payload = worker.conn.recv()
+        except (EOFError, OSError, BrokenPipeError) as e:
+            worker.kill()
+            self._discard()
+            self._record(operation, time.perf_counter() - start, False)
+            raise RuntimeError(f"solver worker exited unexpectedly: {e}") from e
+
+        elapsed = time.perf_counter() - start
+        if not finished:
+            worker.kill()
+            self._discard()
+            cancelled = cancel is not None and cancel.is_set()
+            self._record(operation, elapsed, not cancelled, cancelled)
+            if not cancelled:
+                logger.warning("operation %r exceeded its %.1fs budget; worker killed", operation, budget)
+            return TimedOutResult(operation, budget)
+
+        self._release(worker)
+        self._record(operation, elapsed, False)
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def metrics(self) -> dict:
+        """Per-operation run/timeout counts and the fraction of runs that hit the budget."""
+        with self._cond:
+            return {
+                op: {**m, "timeout_rate": m["timeouts"] / m["runs"] if m["runs"] else 0.0}
+                for op, m in self._metrics.items()
+            }
+
+    def restart(self) -> None:
+        """
+        Replace the idle workers with freshly started ones, so no SymPy or
+        parse cache carries over from earlier calls. Workers busy with a call
+        are left alone.
+        """
+        self.shutdown()
+        fresh = []
+        for _ in range(self._max_workers):
+            with self._cond:
+                if self._live >= self._max_workers:
+                    break
+                self._live += 1
+            try:
+                fresh.append(_Worker(self._ctx))
+            except Exception:
+                self._discard()
+                raise
+        with self._cond:
+            self._idle.extend(fresh)
+            self._cond.notify_all()
+
+    def _after_fork(self) -> None:
+        """In a forked child: forget the parent's workers, whose pipes the parent still uses."""
+        self._idle = []
+        self._live = 0
+        self._cond = threading.Condition()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+        for worker in idle:
+            worker.stop()
+
+
+_runner = BudgetRunner()
+atexit.register(_runner.shutdown)
+os.register_at_fork(after_in_child=lambda: _runner._after_fork())
+
+
+def get_time_budget(operation: str):
+    return TIME_BUDGETS.get((operation or "").lower())
+
+
+def set_time_budget(operation: str, seconds) -> None:
+    """Set the budget for an operation in seconds; None removes the limit."""
+    TIME_BUDGETS[operation.lower()] = seconds
+
+
+def run_with_budget(fn, args: tuple, operation: str, budget: float = None, cancel=None):
+    """
+    Call fn(*args) under the budget for operation (or an explicit budget).
+    Calls with no budget run inline. A budgeted call can be stopped early by
+    setting the threading.Event cancel.
+    """
+    if budget is None:
+        budget = get_time_budget(operation)
+    if budget is None:
+        return fn(*args)
+    return _runner.run(fn, args, operation, budget, cancel)
+
+
+def restart_workers() -> None:
+    """Start the shared budget workers afresh (see BudgetRunner.restart)."""
+    _runner.restart()
+
+
+def budget_metrics() -> dict:
+    return _runner.metrics()
@@ -2,36 +2,393 @@
 user_history.py
 ---------------
 Simple module to save and retrieve user queries.
-Stores history in a local text file (history.txt).
+History lives in an indexed SQLite store (history.db, see history_store.py);
+the older JSON-lines file (history.txt) is still available as a backend and
+is migrated into the store once. The migration runs on the writer thread when
+the shared writer is opened (start_history() does that at service startup),
+so no request waits for it; queued entries are written once it finishes.
+
+Writes are buffered: save_user_query only queues the entry, and a background
+thread appends queued entries in batches. A batch is written when it reaches
+a size limit or when the flush interval passes, whichever comes first.
+A batch the sink fails to write is logged and retried after the flush
+interval; after MAX_WRITE_ATTEMPTS failures it is dropped and counted.
 """
 
+import atexit
 import json
+import logging
+import os
+import threading
+import time
+from collections import deque
 from datetime import datetime
 
+from history_store import HISTORY_DB, HistoryStore, entry_steps
+
+logger = logging.getLogger(__name__)
+
 HISTORY_FILE = "history.txt"
+MAX_WRITE_ATTEMPTS = 3
+
+DURABILITY_POLICIES = ("none", "flush", "fsync")
+
+
+class JsonlHistoryFile:
+    """
+    JSON-lines history file, usable as a HistoryWriter sink.
+
+    Parameters:
+        path (str): File to append JSON lines to.
+        durability (str): After each batch: "none" leaves data in the process
+            buffer, "flush" hands it to the OS, "fsync" also forces it to disk.
+        max_bytes (int or None): Rotate the file before it grows past this size.
+        backup_count (int): Rotated files to keep (history.txt.1, .2, ...).
+    """
+
+    def __init__(self, path: str = HISTORY_FILE, durability: str = "flush",
+                 max_bytes: int = None, backup_count: int = 3):
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"durability must be one of {DURABILITY_POLICIES}")
+        self.path = path
+        self.durability = durability
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._size = 0
+
+    @staticmethod
+    def prepare(entry: dict) -> str:
+        return json.dumps(entry) + "\n"
+
+    def write_batch(self, batch: list, force: bool = False) -> None:
+        if self._file is None:
+            self._open()
+        if not self.max_bytes:
+            self._file.write("".join(batch))
+        else:
+            # Split the batch wherever the file would grow past max_bytes.
+            chunk, chunk_bytes = [], 0
+            for line in batch:
+                n = len(line.encode("utf-8"))
+                if self._size + chunk_bytes + n > self.max_bytes and (self._size or chunk):
+                    self._file.write("".join(chunk))
+                    self._rotate()
+                    self._open()
+                    chunk, chunk_bytes = [], 0
+                chunk.append(line)
+                chunk_bytes += n
+            self._file.write("".join(chunk))
+            self._size += chunk_bytes
+        if self.durability != "none" or force:
+            self._file.flush()
+        if self.durability == "fsync":
+            os.fsync(self._file.fileno())
+
+    def _open(self) -> None:
+        self._file = open(self.path, "a", encoding="utf-8")
+        try:
+            self._size = os.path.getsize(self.path)
+        except OSError:
+            self._size = 0
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.backup_count <= 0:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.1")
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _files(self) -> list:
+        """Rotated backups oldest first, then the live file."""
+        files = [f"{self.path}.{i}" for i in range(self.backup_count, 0, -1)]
+        return [f for f in files + [self.path] if os.path.exists(f)]
+
+    def iter_entries(self, start=None, end=None, subject: str = None, operation: str = None,
+                     newest_first: bool = False, limit: int = None):
+        """Stream matching entries. This backend has no index, so every call scans the files."""
+        start = start.isoformat() if isinstance(start, datetime) else start
+        end = end.isoformat() if isinstance(end, datetime) else end
+
+        def matches():
+            for path in self._files():
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        entry = json.loads(line.strip())
+                        ts = entry.get("timestamp")
+                        if (start is not None and ts < start) or (end is not None and ts >= end):
+                            continue
+                        if subject is not None or operation is not None:
+                            if not any((subject is None or s == subject) and (operation is None or o == operation)
+                                       for s, o in entry_steps(entry.get("parsed"))):
+                                continue
+                        yield entry
+
+        entries = matches()
+        if newest_first:
+            entries = reversed(list(entries))
+        for i, entry in enumerate(entries):
+            if limit is not None and i >= limit:
+                break
+            yield entry
+
+    def last(self, n: int, **filters) -> list:
+        return list(deque(self.iter_entries(**filters), maxlen=n))
+
+
+class HistoryWriter:
+    """
+    Background, batched writer in front of a history sink.
+
+    Parameters:
+        sink (HistoryStore or JsonlHistoryFile): Where batches are written.
+        max_batch (int): Queued entries that trigger an immediate write.
+        flush_interval (float): Seconds a queued entry may wait before it is written.
+        startup (callable or None): Called with the sink on the writer thread
+            before the first batch (e.g. a migration); the thread starts at once.
+    """
+
+    def __init__(self, sink, max_batch: int = 100, flush_interval: float = 1.0, startup=None):
+        self.sink = sink
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._startup = startup
+
+        self._pending = []
+        self._queued = 0         # entries ever queued
+        self._written = 0        # entries ever written out
+        self.dropped = 0         # entries given up on after MAX_WRITE_ATTEMPTS failed writes
+        self.failed_writes = 0   # write_batch calls that raised
+        self._in_flight = 0      # entries the writer thread has taken but not yet accounted for
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._started = startup is None
+        if startup is not None:
+            self._start_thread()
+
+    # ---------------------------------------------------------------- public
+
+    def write(self, entry: dict) -> None:
+        """Queue an entry; it is serialized now so later mutation can't change it."""
+        item = self.sink.prepare(entry)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("history writer is closed")
+            self._pending.append(item)
+            self._queued += 1
+            if self._thread is None or not self._thread.is_alive():
+                # a writer that died mid-batch lost that batch
+                self.dropped += self._in_flight
+                self._in_flight = 0
+                self._started = True
+                self._start_thread()
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every entry queued so far is written and flushed to the OS."""
+        with self._cond:
+            if self._thread is None:
+                return
+            target = self._queued
+            self._flush_requested = True
+            self._cond.notify_all()
+            while ((not self._started or self._written + self.dropped < target)
+                   and self._thread.is_alive()):
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Write everything still queued, then stop the background thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    # -------------------------------------------------------------- internal
+
+    def _start_thread(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        if not self._started:
+            try:
+                self._startup(self.sink)
+            except Exception:
+                logger.exception("history writer startup failed")
+            with self._cond:
+                self._started = True
+                self._cond.notify_all()
+
+        attempts = 0  # failed writes of the batch at the front of the queue
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                # after a failure, wait out the interval before retrying
+                while ((attempts or (len(self._pending) < self.max_batch and not self._flush_requested))
+                       and not self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                self._in_flight = len(batch)
+                force = self._flush_requested or self._closed
+                self._flush_requested = False
+                closing = self._closed
+
+            written = dropped = 0
+            try:
+                if batch:
+                    self.sink.write_batch(batch, force)
+                    written = len(batch)
+                elif force:
+                    self.sink.flush()
+                attempts = 0
+            except Exception:
+                attempts += 1
+                logger.exception("history write failed (attempt %d of %d)", attempts, MAX_WRITE_ATTEMPTS)
+                if attempts >= MAX_WRITE_ATTEMPTS:
+                    dropped, attempts = len(batch), 0
+                    if dropped:
+                        logger.error("dropped %d history entries", dropped)
+
+            with self._cond:
+                if batch and not written:
+                    self.failed_writes += 1
+                    if not dropped:
+                        self._pending[:0] = batch  # retried at the front of the queue
+                self._written += written
+                self.dropped += dropped
+                self._in_flight = 0
+                self._cond.notify_all()
+                if closing and not self._pending:
+                    break
+
+        try:
+            self.sink.close()
+        except Exception:
+            logger.exception("closing the history sink failed")
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _migrate_history_file(store) -> None:
+    """Seed the SQLite store once from an existing history.txt."""
+    if os.path.exists(HISTORY_FILE):
+        store.migrate_jsonl(HISTORY_FILE)
+
+
+def _get_writer() -> HistoryWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = HistoryWriter(HistoryStore(HISTORY_DB), startup=_migrate_history_file)
+        return _writer
+
+
+def start_history() -> None:
+    """Open the shared writer now, so the history.txt migration starts in the background."""
+    _get_writer()
+
+
+def _close_writer():
+    if _writer is not None:
+        _writer.close()
+
+
+atexit.register(_close_writer)
+
+
+def configure_history_writer(backend: str = "sqlite", path: str = None, max_batch: int = 100,
+                             flush_interval: float = 1.0, **sink_options) -> HistoryWriter:
+    """
+    Replace the shared writer; the old one is drained first.
+
+    Parameters:
+        backend (str): "sqlite" (HistoryStore) or "jsonl" (JsonlHistoryFile).
+        path (str or None): Database or file path; defaults to history.db / history.txt.
+        sink_options: Passed to the sink, e.g. durability, max_bytes, backup_count.
+    """
+    global _writer
+    if backend == "sqlite":
+        sink = HistoryStore(path or HISTORY_DB, **sink_options)
+    elif backend == "jsonl":
+        sink = JsonlHistoryFile(path or HISTORY_FILE, **sink_options)
+    else:
+        raise ValueError("backend must be 'sqlite' or 'jsonl'")
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+        _writer = HistoryWriter(sink, max_batch=max_batch, flush_interval=flush_interval)
+        return _writer
+
 
 def save_user_query(raw_input, parsed):
     """
-    Saves the user's raw input and parsed data to a history file.
+    Saves the user's raw input and parsed data to the history store.
+    The entry is queued and written by the background writer.
     """
     entry = {
         "timestamp": datetime.now().isoformat(),
         "raw_input": raw_input,
         "parsed": parsed
     }
-    with open(HISTORY_FILE, "a") as f:
-        f.write(json.dumps(entry) + "\n")
+    _get_writer().write(entry)
+
+
+def flush_history():
+    """Make sure every saved query has reached the history store."""
+    _get_writer().flush()
+
+
+def iter_user_history(start=None, end=None, subject=None, operation=None,
+                      newest_first=False, limit=None):
+    """
+    Stream saved queries, optionally filtered by timestamp range [start, end),
+    subject and operation (matching any step of a pipeline).
+    """
+    writer = _get_writer()
+    writer.flush()
+    return writer.sink.iter_entries(start=start, end=end, subject=subject, operation=operation,
+                                    newest_first=newest_first, limit=limit)
+
+
+def last_user_queries(n, **filters):
+    """The n most recent saved queries, oldest first."""
+    writer = _get_writer()
+    writer.flush()
+    return writer.sink.last(n, **filters)
+
 
 def load_user_history():
     """
-    Loads all saved user queries from the history file.
-    Returns a list of dictionaries.
-    """
-    history = []
-    try:
-        with open(HISTORY_FILE, "r") as f:
-            for line in f:
-                history.append(json.loads(line.strip()))
-    except FileNotFoundError:
-        pass  # No history file yet
-    return history
+    Loads all saved user queries from the history store.
+    Returns a list of dictionaries; prefer iter_user_history for large histories.
+    """
+    return list(iter_user_history())